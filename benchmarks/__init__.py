@@ -0,0 +1,11 @@
+"""
+Benchmarks for drf-spectacular. They are not part of the distribution and are run from the
+repository root, e.g. ``python -m benchmarks.json_renderer``.
+"""
+import os
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    django.setup()
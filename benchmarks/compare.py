@@ -0,0 +1,49 @@
+"""
+Compare two result files of benchmarks.generation. Exits with status 1 if any timing or
+memory measurement regressed by more than the threshold.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 1.1
+"""
+import argparse
+import json
+import sys
+
+
+def compare(baseline, current):
+    """ yield (name, baseline value, current value) for all measurements present in both """
+    for name, timing in current['timings'].items():
+        if name in baseline['timings']:
+            yield name, baseline['timings'][name]['min'], timing['min']
+    for name, peak in current['peak_memory'].items():
+        if name in baseline['peak_memory']:
+            yield f'memory:{name}', baseline['peak_memory'][name], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.1, help='tolerated ratio current/baseline')
+    args = parser.parse_args()
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.current) as fh:
+        current = json.load(fh)
+
+    if baseline['parameters'] != current['parameters']:
+        print('warning: results were measured with different parameters', file=sys.stderr)
+
+    regressed = False
+    print(f'{"measurement":<60} {"baseline":>12} {"current":>12} {"ratio":>7}')
+    for name, old, new in compare(baseline, current):
+        ratio = new / old if old else float('inf')
+        marker = ' !' if ratio > args.threshold else ''
+        regressed = regressed or bool(marker)
+        print(f'{name:<60} {old:>12.6g} {new:>12.6g} {ratio:>7.2f}{marker}')
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
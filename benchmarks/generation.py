@@ -0,0 +1,171 @@
+"""
+Measure schema generation, postprocessing hooks, validation and rendering on a synthetic
+API and report timings and peak memory as JSON.
+
+    python -m benchmarks.generation --viewsets 200 --depth 2 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from unittest import mock
+
+from benchmarks import setup_django
+
+
+def summarize(runs):
+    return {
+        'min': round(min(runs), 6),
+        'mean': round(statistics.mean(runs), 6),
+        'runs': [round(r, 6) for r in runs],
+    }
+
+
+def measure_peak_memory(func):
+    """ peak memory allocated by func in bytes (excluding memory held before the call) """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def timed_hook(hook, timings):
+    name = f'hook:{hook.__module__}.{hook.__qualname__}'
+
+    def wrapper(**kwargs):
+        start = time.perf_counter()
+        try:
+            return hook(**kwargs)
+        finally:
+            timings[name].append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def get_environment():
+    import django
+    import rest_framework
+
+    import drf_spectacular
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'django': django.__version__,
+        'djangorestframework': rest_framework.__version__,
+        'drf_spectacular': drf_spectacular.__version__,
+    }
+
+
+def run_measurements(generate, renderers, repeat, timings):
+    from drf_spectacular.validation import validate_schema
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        schema = generate()
+        timings['generation'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        validate_schema(schema)
+        timings['validation'].append(time.perf_counter() - start)
+
+        for name, renderer in renderers.items():
+            start = time.perf_counter()
+            renderer.render(schema, renderer_context={})
+            timings[f'render:{name}'].append(time.perf_counter() - start)
+
+
+def run(parameters, repeat, custom_settings):
+    from benchmarks.synthetic import build_urlpatterns
+    from drf_spectacular.drainage import GENERATOR_STATS
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import patched_settings, spectacular_settings
+
+    patterns = build_urlpatterns(**parameters)
+    api_version = 'v1' if parameters['use_versioning'] else None
+    renderers = {'yaml': OpenApiYamlRenderer(), 'json': OpenApiJsonRenderer()}
+    timings = defaultdict(list)
+
+    def generate():
+        generator = SchemaGenerator(patterns=patterns, api_version=api_version)
+        return generator.get_schema(request=None, public=True)
+
+    with patched_settings(custom_settings), GENERATOR_STATS.silence():
+        # hooks are wrapped after patching, as they may be overridden by custom_settings
+        hooks = [timed_hook(hook, timings) for hook in spectacular_settings.POSTPROCESSING_HOOKS]
+        with mock.patch.object(spectacular_settings, 'POSTPROCESSING_HOOKS', hooks):
+            run_measurements(generate, renderers, repeat, timings)
+            peak_memory = {'generation': measure_peak_memory(generate)}
+            schema = generate()
+
+        for name, renderer in renderers.items():
+            peak_memory[f'render:{name}'] = measure_peak_memory(
+                functools.partial(renderer.render, schema, renderer_context={})
+            )
+
+    return {
+        'environment': get_environment(),
+        'parameters': {**parameters, 'repeat': repeat, 'settings': custom_settings},
+        'schema': {
+            'paths': len(schema['paths']),
+            'operations': sum(len(methods) for methods in schema['paths'].values()),
+            'components': sum(len(c) for c in schema.get('components', {}).values()),
+        },
+        'timings': {name: summarize(runs) for name, runs in timings.items()},
+        'peak_memory': peak_memory,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--viewsets', type=int, default=50)
+    parser.add_argument('--fields', type=int, default=10)
+    parser.add_argument('--choice-fields', type=int, default=2)
+    parser.add_argument('--depth', type=int, default=1, help='nesting depth of serializers')
+    parser.add_argument('--no-filters', action='store_true')
+    parser.add_argument('--no-pagination', action='store_true')
+    parser.add_argument('--versioning', action='store_true')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--settings', type=json.loads, default={},
+        help='SPECTACULAR_SETTINGS overrides as JSON, e.g. \'{"GENERATION_WORKERS": 4}\''
+    )
+    parser.add_argument('--output', default=None, help='write results to file instead of stdout')
+    args = parser.parse_args()
+
+    setup_django()
+    results = run(
+        parameters={
+            'viewsets_count': args.viewsets,
+            'fields': args.fields,
+            'choice_fields': args.choice_fields,
+            'depth': args.depth,
+            'use_filters': not args.no_filters,
+            'use_pagination': not args.no_pagination,
+            'use_versioning': args.versioning,
+        },
+        repeat=args.repeat,
+        custom_settings=args.settings,
+    )
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output + '\n')
+    else:
+        sys.stdout.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare the JSON_RENDERER_BACKEND options of OpenApiJsonRenderer on a synthetic schema.
+
+    python -m benchmarks.json_renderer --paths 2000 --json
+"""
+import argparse
+import json
+import time
+
+from benchmarks import setup_django
+
+
+def build_schema(paths, properties):
+    """ synthetic schema resembling generated output with one component per path """
+    schema = {'openapi': '3.0.3', 'info': {'title': 'Benchmark', 'version': '1.0.0'}, 'paths': {}}
+    components = {}
+    for i in range(paths):
+        components[f'Model{i}'] = {
+            'type': 'object',
+            'properties': {
+                f'field{j}': {'type': 'string', 'maxLength': 100, 'description': f'Field {j} of model {i}'}
+                for j in range(properties)
+            },
+            'required': [f'field{j}' for j in range(0, properties, 2)],
+        }
+        schema['paths'][f'/api/model{i}/{{id}}/'] = {
+            'get': {
+                'operationId': f'model{i}_retrieve',
+                'parameters': [{'in': 'path', 'name': 'id', 'schema': {'type': 'integer'}, 'required': True}],
+                'tags': [f'model{i}'],
+                'responses': {
+                    '200': {
+                        'content': {'application/json': {'schema': {'$ref': f'#/components/schemas/Model{i}'}}},
+                        'description': '',
+                    }
+                },
+            }
+        }
+    schema['components'] = {'schemas': components}
+    return schema
+
+
+def measure(func, repeat):
+    """ best wall time of several runs in seconds """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(paths, properties, repeat):
+    from drf_spectacular.renderers import OpenApiJsonRenderer, get_json_backend
+    from drf_spectacular.settings import patched_settings
+
+    schema = build_schema(paths, properties)
+    results = []
+    for backend in ['json', 'orjson', 'ujson']:
+        if backend != 'json' and get_json_backend(backend) is None:
+            continue
+        for indent in [4, None]:
+            patches = {'JSON_RENDERER_BACKEND': backend, 'JSON_RENDERER_INDENT': indent}
+            with patched_settings(patches):
+                renderer = OpenApiJsonRenderer()
+                size = len(renderer.render(schema))
+                seconds = measure(lambda: renderer.render(schema), repeat)
+            results.append({
+                'backend': backend,
+                'mode': 'pretty' if indent else 'compact',
+                'seconds': round(seconds, 6),
+                'bytes': size,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paths', type=int, default=1000)
+    parser.add_argument('--properties', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='machine-readable output')
+    args = parser.parse_args()
+
+    setup_django()
+    results = run(args.paths, args.properties, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    baseline = {r['mode']: r['seconds'] for r in results if r['backend'] == 'json'}
+    print(f'{"backend":<8} {"mode":<8} {"seconds":>10} {"speedup":>8} {"bytes":>12}')
+    for r in results:
+        speedup = baseline[r['mode']] / r['seconds']
+        print(f'{r["backend"]:<8} {r["mode"]:<8} {r["seconds"]:>10.4f} {speedup:>7.1f}x {r["bytes"]:>12}')
+
+
+if __name__ == '__main__':
+    main()
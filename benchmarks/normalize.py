@@ -0,0 +1,91 @@
+"""
+Compare time and peak memory of normalize_result_object with a full copy of the schema,
+which is what the previous implementation did.
+
+    python -m benchmarks.normalize --paths 2000 --lazy-ratio 0.1
+"""
+import argparse
+import json
+import tracemalloc
+from collections import OrderedDict
+
+from benchmarks import setup_django
+from benchmarks.json_renderer import build_schema, measure
+
+
+def copy_result_object(result):
+    """ reference implementation rebuilding every container """
+    from django.utils.functional import Promise
+
+    if isinstance(result, dict):
+        return {k: copy_result_object(v) for k, v in result.items()}
+    if isinstance(result, (list, tuple)):
+        return [copy_result_object(v) for v in result]
+    if isinstance(result, Promise):
+        return str(result)
+    for base_type in [bool, int, float, str]:
+        if isinstance(result, base_type):
+            return base_type(result)
+    return result
+
+
+def add_coercible_nodes(schema, lazy_ratio):
+    """ replace a share of descriptions with lazy strings and required lists with tuples """
+    from django.utils.translation import gettext_lazy
+
+    step = max(1, round(1 / lazy_ratio)) if lazy_ratio else None
+    for i, component in enumerate(schema['components']['schemas'].values()):
+        if step and i % step == 0:
+            component['properties'] = OrderedDict(component['properties'])
+            component['required'] = tuple(component['required'])
+            for prop in component['properties'].values():
+                prop['description'] = gettext_lazy(prop['description'])
+    return schema
+
+
+def measure_peak_memory(func, schema):
+    tracemalloc.start()
+    try:
+        func(schema)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(paths, properties, lazy_ratio, repeat):
+    from drf_spectacular.plumbing import normalize_result_object
+
+    schema = add_coercible_nodes(build_schema(paths, properties), lazy_ratio)
+    assert normalize_result_object(schema) == copy_result_object(schema)
+    return [
+        {
+            'implementation': name,
+            'seconds': round(measure(lambda: func(schema), repeat), 6),
+            'peak_memory': measure_peak_memory(func, schema),
+        }
+        for name, func in [('copy', copy_result_object), ('normalize', normalize_result_object)]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, default=1000)
+    parser.add_argument('--properties', type=int, default=20)
+    parser.add_argument('--lazy-ratio', type=float, default=0.1, help='share of components needing coercion')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='machine-readable output')
+    args = parser.parse_args()
+
+    setup_django()
+    results = run(args.paths, args.properties, args.lazy_ratio, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{"implementation":<16} {"seconds":>10} {"peak memory":>14}')
+    for r in results:
+        print(f'{r["implementation"]:<16} {r["seconds"]:>10.4f} {r["peak_memory"]:>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Synthetic APIs of configurable size. Models are created dynamically, so build_urlpatterns()
+may only be called once per process and set of parameters.
+"""
+from django.db import models
+from django.urls import include, path, re_path
+from rest_framework import filters, pagination, routers, serializers, versioning, viewsets
+
+try:
+    from django_filters.rest_framework import DjangoFilterBackend
+except ImportError:  # pragma: no cover
+    DjangoFilterBackend = None
+
+FIELD_TYPES = [
+    (models.CharField, {'max_length': 100}),
+    (models.IntegerField, {}),
+    (models.DateTimeField, {}),
+    (models.DecimalField, {'max_digits': 10, 'decimal_places': 2}),
+    (models.BooleanField, {'default': False}),
+    (models.TextField, {'blank': True, 'help_text': 'free text'}),
+]
+
+
+def build_model(name, fields, choice_fields, child=None):
+    attrs = {
+        '__module__': __name__,
+        'Meta': type('Meta', (), {'app_label': 'benchmarks'}),
+    }
+    for i in range(fields):
+        field_class, kwargs = FIELD_TYPES[i % len(FIELD_TYPES)]
+        attrs[f'field_{i}'] = field_class(**kwargs)
+    for i in range(choice_fields):
+        # distinct choice sets produce distinct enum components
+        choices = [(f'{name.lower()}_{i}_{c}', f'Choice {c}') for c in range(5)]
+        attrs[f'choice_{i}'] = models.CharField(max_length=50, choices=choices)
+    if child is not None:
+        attrs['child'] = models.ForeignKey(child, on_delete=models.CASCADE, related_name='+')
+    return type(name, (models.Model,), attrs)
+
+
+def build_serializer(model, child_serializer=None):
+    attrs = {
+        'Meta': type('Meta', (), {'model': model, 'fields': '__all__'}),
+    }
+    if child_serializer is not None:
+        attrs['child'] = child_serializer()
+    return type(f'{model.__name__}Serializer', (serializers.ModelSerializer,), attrs)
+
+
+def build_urlpatterns(
+    viewsets_count=50,
+    fields=10,
+    choice_fields=2,
+    depth=1,
+    use_filters=True,
+    use_pagination=True,
+    use_versioning=False,
+):
+    """
+    Build urlpatterns with viewsets_count ModelViewSets. Each viewset serializes a model with
+    the given number of regular and choice fields, which nests a chain of depth models.
+    """
+    router = routers.SimpleRouter()
+
+    for i in range(viewsets_count):
+        model, serializer = None, None
+        for level in reversed(range(depth + 1)):
+            model = build_model(f'Model{i}Level{level}', fields, choice_fields, child=model)
+            serializer = build_serializer(model, serializer)
+
+        attrs = {
+            'queryset': model.objects.all(),
+            'serializer_class': serializer,
+            'filter_backends': [filters.SearchFilter, filters.OrderingFilter],
+            'search_fields': ['field_0'],
+            'ordering_fields': ['field_0', 'field_1'],
+            'pagination_class': pagination.PageNumberPagination if use_pagination else None,
+        }
+        if use_filters and DjangoFilterBackend is not None:
+            attrs['filter_backends'] = [DjangoFilterBackend] + attrs['filter_backends']
+            attrs['filterset_fields'] = [f'field_{f}' for f in range(min(fields, 3))]
+        if not use_filters:
+            attrs['filter_backends'] = []
+        if use_versioning:
+            attrs['versioning_class'] = versioning.URLPathVersioning
+
+        viewset = type(f'Model{i}ViewSet', (viewsets.ModelViewSet,), attrs)
+        router.register(f'model{i}', viewset, basename=f'model{i}')
+
+    if use_versioning:
+        return [re_path(r'^(?P<version>(v1|v2))/', include(router.urls))]
+    return [path('', include(router.urls))]
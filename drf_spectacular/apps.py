@@ -6,4 +6,5 @@ class SpectacularConfig(AppConfig):
     verbose_name = "drf-spectacular"
 
     def ready(self):
+        import drf_spectacular.caching  # noqa: F401
         import drf_spectacular.checks  # noqa: F401
@@ -0,0 +1,69 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+from django.core.cache import BaseCache, caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from drf_spectacular.settings import spectacular_settings
+
+
+def get_schema_cache() -> Optional[BaseCache]:
+    """ return the Django cache configured via SERVE_CACHE or None if caching is disabled """
+    if not spectacular_settings.SERVE_CACHE:
+        return None
+    return caches[spectacular_settings.SERVE_CACHE]
+
+
+def _get_generation_key() -> str:
+    return f'{spectacular_settings.SERVE_CACHE_KEY_PREFIX}:generation'
+
+
+def _get_generation(schema_cache: BaseCache) -> int:
+    generation = schema_cache.get(_get_generation_key())
+    if generation is None:
+        # add() is atomic on shared backends. another worker may have won the race.
+        schema_cache.add(_get_generation_key(), 0, timeout=None)
+        generation = schema_cache.get(_get_generation_key(), 0)
+    return generation
+
+
+def _key_default(obj: Any) -> str:
+    # classes and functions (e.g. imported hooks in custom_settings) must yield the
+    # same key in every worker, which is not the case for the default repr().
+    if hasattr(obj, '__module__') and hasattr(obj, '__qualname__'):
+        return f'{obj.__module__}.{obj.__qualname__}'
+    return repr(obj)
+
+
+def build_schema_cache_key(schema_cache: BaseCache, **parts: Any) -> str:
+    """
+    Build a cache key from all parameters that influence the rendered schema. The key
+    is prefixed with a generation counter that is shared via the cache itself, so that
+    invalidation affects all workers using the same backend.
+    """
+    digest = hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=_key_default).encode()
+    ).hexdigest()
+    return f'{spectacular_settings.SERVE_CACHE_KEY_PREFIX}:{_get_generation(schema_cache)}:{digest}'
+
+
+def invalidate_schema_cache() -> None:
+    """
+    Invalidate all cached schemas. Entries are not deleted individually, but become
+    unreachable by advancing the generation counter, which the backend will evict.
+    """
+    schema_cache = get_schema_cache()
+    if schema_cache is None:
+        return
+    try:
+        schema_cache.incr(_get_generation_key())
+    except ValueError:
+        schema_cache.set(_get_generation_key(), 1, timeout=None)
+
+
+@receiver(setting_changed)
+def _invalidate_on_setting_changed(*, setting, **kwargs):
+    if setting == 'SPECTACULAR_SETTINGS':
+        invalidate_schema_cache()
@@ -0,0 +1,278 @@
+"""
+Structural diff of two generated schemas. Changes to operations, parameters and components
+are classified as breaking or non-breaking for API clients. The classification is conservative,
+i.e. changes that break either requests or responses are considered breaking.
+
+    for change in diff_schemas(old_schema, new_schema):
+        print(change)
+"""
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Set, Tuple
+
+BREAKING = 'breaking'
+NON_BREAKING = 'non-breaking'
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+# keywords that change the accepted or emitted values
+SCHEMA_CONSTRAINTS = (
+    'format', 'nullable', 'readOnly', 'writeOnly', 'pattern', 'multipleOf', 'maximum', 'minimum',
+    'exclusiveMaximum', 'exclusiveMinimum', 'maxLength', 'minLength', 'maxItems', 'minItems',
+    'uniqueItems', 'maxProperties', 'minProperties', 'const',
+)
+SCHEMA_COMPOSITIONS = ('allOf', 'oneOf', 'anyOf')
+
+
+class SchemaChange(NamedTuple):
+    severity: str
+    location: str
+    message: str
+
+    @property
+    def is_breaking(self) -> bool:
+        return self.severity == BREAKING
+
+    def __str__(self) -> str:
+        return f'{self.severity.upper()}: {self.location}: {self.message}'
+
+
+class RefResolver:
+    """ lazily resolves local ``$ref`` pointers of a schema and memoizes the results """
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self._cache: Dict[str, Any] = {}
+
+    def resolve(self, ref: str) -> Any:
+        if ref not in self._cache:
+            obj: Any = self.schema
+            if ref.startswith('#/'):
+                for part in ref[2:].split('/'):
+                    obj = obj.get(part.replace('~1', '/').replace('~0', '~')) if isinstance(obj, dict) else None
+            else:
+                obj = None  # external references are not supported
+            self._cache[ref] = obj
+        return self._cache[ref]
+
+    def deref(self, obj: Any) -> Any:
+        if isinstance(obj, dict) and '$ref' in obj:
+            return self.resolve(obj['$ref'])
+        return obj
+
+
+class SchemaDiff:
+    """
+    Iterable of ``SchemaChange`` between two schemas. Every part of both schemas is visited
+    at most once. Components are compared once in their own section and are not descended
+    into again where both schemas reference the same component.
+    """
+    def __init__(self, old: Dict[str, Any], new: Dict[str, Any]):
+        self.old = old
+        self.new = new
+        self.old_refs = RefResolver(old)
+        self.new_refs = RefResolver(new)
+        self._compared_refs: Set[Tuple[str, str]] = set()
+
+    def __iter__(self) -> Iterator[SchemaChange]:
+        yield from self.diff_paths()
+        yield from self.diff_components()
+
+    def diff_paths(self) -> Iterator[SchemaChange]:
+        old_paths = self.old.get('paths') or {}
+        new_paths = self.new.get('paths') or {}
+        for path, old_item in old_paths.items():
+            new_item = new_paths.get(path)
+            if new_item is None:
+                yield SchemaChange(BREAKING, path, 'path removed')
+                continue
+            for method in HTTP_METHODS:
+                old_operation, new_operation = old_item.get(method), new_item.get(method)
+                location = f'{method.upper()} {path}'
+                if old_operation is None and new_operation is not None:
+                    yield SchemaChange(NON_BREAKING, location, 'operation added')
+                elif old_operation is not None and new_operation is None:
+                    yield SchemaChange(BREAKING, location, 'operation removed')
+                elif old_operation is not None:
+                    yield from self.diff_operation(location, old_operation, new_operation)
+        for path in new_paths:
+            if path not in old_paths:
+                yield SchemaChange(NON_BREAKING, path, 'path added')
+
+    def diff_operation(self, location: str, old: Dict[str, Any], new: Dict[str, Any]) -> Iterator[SchemaChange]:
+        if old.get('operationId') != new.get('operationId'):
+            yield SchemaChange(
+                BREAKING, location, f'operationId changed from "{old.get("operationId")}" to "{new.get("operationId")}"'
+            )
+        if not old.get('deprecated') and new.get('deprecated'):
+            yield SchemaChange(NON_BREAKING, location, 'operation deprecated')
+        if old.get('security') != new.get('security'):
+            yield SchemaChange(BREAKING, location, 'security requirements changed')
+        yield from self.diff_parameters(location, old.get('parameters') or [], new.get('parameters') or [])
+        yield from self.diff_request_body(location, old.get('requestBody'), new.get('requestBody'))
+        yield from self.diff_responses(location, old.get('responses') or {}, new.get('responses') or {})
+
+    def diff_parameters(self, location: str, old: list, new: list) -> Iterator[SchemaChange]:
+        old_parameters = {(p['in'], p['name']): p for p in map(self.old_refs.deref, old) if p}
+        new_parameters = {(p['in'], p['name']): p for p in map(self.new_refs.deref, new) if p}
+        for key, old_parameter in old_parameters.items():
+            parameter_location = f'{location} > {key[0]} parameter "{key[1]}"'
+            new_parameter = new_parameters.get(key)
+            if new_parameter is None:
+                yield SchemaChange(BREAKING, parameter_location, 'parameter removed')
+                continue
+            if not old_parameter.get('required') and new_parameter.get('required'):
+                yield SchemaChange(BREAKING, parameter_location, 'parameter became required')
+            elif old_parameter.get('required') and not new_parameter.get('required'):
+                yield SchemaChange(NON_BREAKING, parameter_location, 'parameter became optional')
+            yield from self.diff_schema(parameter_location, old_parameter.get('schema'), new_parameter.get('schema'))
+        for key, new_parameter in new_parameters.items():
+            if key not in old_parameters:
+                severity = BREAKING if new_parameter.get('required') else NON_BREAKING
+                required = 'required' if new_parameter.get('required') else 'optional'
+                yield SchemaChange(
+                    severity, f'{location} > {key[0]} parameter "{key[1]}"', f'{required} parameter added'
+                )
+
+    def diff_request_body(self, location: str, old: Any, new: Any) -> Iterator[SchemaChange]:
+        old, new = self.old_refs.deref(old), self.new_refs.deref(new)
+        location = f'{location} > request body'
+        if old is None and new is None:
+            return
+        elif old is None:
+            if new.get('required'):
+                yield SchemaChange(BREAKING, location, 'required request body added')
+            else:
+                yield SchemaChange(NON_BREAKING, location, 'optional request body added')
+        elif new is None:
+            yield SchemaChange(BREAKING, location, 'request body removed')
+        else:
+            if not old.get('required') and new.get('required'):
+                yield SchemaChange(BREAKING, location, 'request body became required')
+            yield from self.diff_content(location, old.get('content') or {}, new.get('content') or {})
+
+    def diff_responses(self, location: str, old: Dict[str, Any], new: Dict[str, Any]) -> Iterator[SchemaChange]:
+        for status_code, old_response in old.items():
+            response_location = f'{location} > response {status_code}'
+            new_response = new.get(status_code)
+            if new_response is None:
+                yield SchemaChange(BREAKING, response_location, 'response removed')
+                continue
+            old_response, new_response = self.old_refs.deref(old_response), self.new_refs.deref(new_response)
+            if old_response is not None and new_response is not None:
+                yield from self.diff_content(
+                    response_location, old_response.get('content') or {}, new_response.get('content') or {}
+                )
+        for status_code in new:
+            if status_code not in old:
+                yield SchemaChange(NON_BREAKING, f'{location} > response {status_code}', 'response added')
+
+    def diff_content(self, location: str, old: Dict[str, Any], new: Dict[str, Any]) -> Iterator[SchemaChange]:
+        for media_type, old_media in old.items():
+            if media_type not in new:
+                yield SchemaChange(BREAKING, location, f'media type "{media_type}" removed')
+            else:
+                yield from self.diff_schema(
+                    f'{location} > {media_type}', old_media.get('schema'), new[media_type].get('schema')
+                )
+        for media_type in new:
+            if media_type not in old:
+                yield SchemaChange(NON_BREAKING, location, f'media type "{media_type}" added')
+
+    def diff_schema(self, location: str, old: Any, new: Any) -> Iterator[SchemaChange]:
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            if (old is None) != (new is None):
+                yield SchemaChange(BREAKING, location, 'schema changed')
+            return
+        if '$ref' in old and '$ref' in new:
+            if old['$ref'] == new['$ref']:
+                return  # compared in the components section
+            if (old['$ref'], new['$ref']) in self._compared_refs:
+                return
+            self._compared_refs.add((old['$ref'], new['$ref']))
+        old, new = self.old_refs.deref(old), self.new_refs.deref(new)
+        if old is None or new is None:
+            return  # dangling reference
+
+        if old.get('type') != new.get('type'):
+            yield SchemaChange(BREAKING, location, f'type changed from "{old.get("type")}" to "{new.get("type")}"')
+        for keyword in SCHEMA_CONSTRAINTS:
+            if old.get(keyword) != new.get(keyword):
+                yield SchemaChange(
+                    BREAKING, location, f'{keyword} changed from {old.get(keyword)!r} to {new.get(keyword)!r}'
+                )
+        yield from self.diff_enum(location, old.get('enum'), new.get('enum'))
+        yield from self.diff_properties(location, old, new)
+        if 'items' in old or 'items' in new:
+            yield from self.diff_schema(f'{location} > []', old.get('items'), new.get('items'))
+        if isinstance(old.get('additionalProperties'), dict) or isinstance(new.get('additionalProperties'), dict):
+            yield from self.diff_schema(
+                f'{location} > {{}}', old.get('additionalProperties'), new.get('additionalProperties')
+            )
+        for keyword in SCHEMA_COMPOSITIONS:
+            old_subschemas, new_subschemas = old.get(keyword) or [], new.get(keyword) or []
+            if len(old_subschemas) != len(new_subschemas):
+                yield SchemaChange(BREAKING, location, f'{keyword} changed')
+                continue
+            for i, (old_subschema, new_subschema) in enumerate(zip(old_subschemas, new_subschemas)):
+                yield from self.diff_schema(f'{location} > {keyword}[{i}]', old_subschema, new_subschema)
+
+    def diff_enum(self, location: str, old: Optional[list], new: Optional[list]) -> Iterator[SchemaChange]:
+        if old is None and new is None:
+            return
+        elif old is None or new is None:
+            yield SchemaChange(BREAKING, location, 'enum removed' if new is None else 'enum added')
+            return
+        new_values = set(map(repr, new))
+        removed = [value for value in old if repr(value) not in new_values]
+        if removed:
+            yield SchemaChange(BREAKING, location, f'enum values removed: {removed!r}')
+        if len(old) - len(removed) != len(new):
+            yield SchemaChange(NON_BREAKING, location, 'enum values added')
+
+    def diff_properties(self, location: str, old: Dict[str, Any], new: Dict[str, Any]) -> Iterator[SchemaChange]:
+        old_properties, new_properties = old.get('properties') or {}, new.get('properties') or {}
+        old_required, new_required = set(old.get('required') or []), set(new.get('required') or [])
+        for name, old_property in old_properties.items():
+            property_location = f'{location} > {name}'
+            if name not in new_properties:
+                yield SchemaChange(BREAKING, property_location, 'property removed')
+                continue
+            if name in new_required and name not in old_required:
+                yield SchemaChange(BREAKING, property_location, 'property became required')
+            elif name in old_required and name not in new_required:
+                yield SchemaChange(BREAKING, property_location, 'property is no longer required')
+            yield from self.diff_schema(property_location, old_property, new_properties[name])
+        for name in new_properties:
+            if name not in old_properties:
+                if name in new_required:
+                    yield SchemaChange(BREAKING, f'{location} > {name}', 'required property added')
+                else:
+                    yield SchemaChange(NON_BREAKING, f'{location} > {name}', 'optional property added')
+
+    def diff_components(self) -> Iterator[SchemaChange]:
+        old_components = self.old.get('components') or {}
+        new_components = self.new.get('components') or {}
+
+        old_schemas, new_schemas = old_components.get('schemas') or {}, new_components.get('schemas') or {}
+        for name, old_schema in old_schemas.items():
+            if name not in new_schemas:
+                yield SchemaChange(BREAKING, f'component "{name}"', 'component removed')
+            else:
+                yield from self.diff_schema(f'component "{name}"', old_schema, new_schemas[name])
+        for name in new_schemas:
+            if name not in old_schemas:
+                yield SchemaChange(NON_BREAKING, f'component "{name}"', 'component added')
+
+        old_schemes = old_components.get('securitySchemes') or {}
+        new_schemes = new_components.get('securitySchemes') or {}
+        for name, old_scheme in old_schemes.items():
+            if name not in new_schemes:
+                yield SchemaChange(BREAKING, f'security scheme "{name}"', 'security scheme removed')
+            elif old_scheme != new_schemes[name]:
+                yield SchemaChange(BREAKING, f'security scheme "{name}"', 'security scheme changed')
+        for name in new_schemes:
+            if name not in old_schemes:
+                yield SchemaChange(NON_BREAKING, f'security scheme "{name}"', 'security scheme added')
+
+
+def diff_schemas(old: Dict[str, Any], new: Dict[str, Any]) -> Iterator[SchemaChange]:
+    """ lazily yield the changes from ``old`` to ``new`` schema (e.g. results of ``get_schema``) """
+    return iter(SchemaDiff(old, new))
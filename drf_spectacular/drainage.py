@@ -1,9 +1,12 @@
 import contextlib
 import functools
+import heapq
 import inspect
+import json
 import sys
+import time
 from collections import defaultdict
-from typing import Any, Callable, DefaultDict, List, Optional, Tuple, TypeVar
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple, TypeVar
 
 if sys.version_info >= (3, 8):
     from typing import (  # type: ignore[attr-defined] # noqa: F401
@@ -89,6 +92,14 @@ class GeneratorStats:
             print(msg, file=sys.stderr)
         cache[msg] += 1
 
+    def merge(self, warn_cache: Dict[str, int], error_cache: Dict[str, int]) -> None:
+        """ merge messages collected elsewhere (e.g. in a worker process) and emit new ones """
+        for msg_cache, cache in [(warn_cache, self._warn_cache), (error_cache, self._error_cache)]:
+            for msg, count in msg_cache.items():
+                if not self.silent and msg not in cache:
+                    print(msg, file=sys.stderr)
+                cache[msg] += count
+
     def emit_summary(self) -> None:
         if not self.silent and (self._warn_cache or self._error_cache):
             print(
@@ -101,6 +112,164 @@ class GeneratorStats:
 
 GENERATOR_STATS = GeneratorStats()
 
+_DependencyType = Tuple[str, str]
+_ComponentKeyType = Tuple[str, str]
+_DependencyFrame = Tuple[Set[_DependencyType], Set[_ComponentKeyType]]
+
+
+def get_dependency(obj: Any) -> _DependencyType:
+    """ (module, qualname) of a class or function or of the class of an instance """
+    if not (inspect.isclass(obj) or inspect.isfunction(obj)):
+        obj = obj.__class__
+    return obj.__module__, obj.__qualname__
+
+
+class DependencyRecorder:
+    """
+    Records which classes (views, serializers, extensions, ...) and which components were
+    involved in generating a part of the schema. Recording only happens inside of record()
+    and is otherwise a no-op. Dependencies of components are remembered, so that reusing a
+    component also carries over the dependencies that were recorded while building it.
+    """
+    def __init__(self) -> None:
+        self._frames: List[_DependencyFrame] = []
+        self.component_dependencies: Dict[_ComponentKeyType, _DependencyFrame] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self._frames)
+
+    @contextlib.contextmanager
+    def record(self):
+        frame: _DependencyFrame = (set(), set())
+        self._frames.append(frame)
+        try:
+            yield frame
+        finally:
+            self._frames.pop()
+
+    @contextlib.contextmanager
+    def record_component(self, key: _ComponentKeyType, *objects: Any):
+        """ record dependencies of a component built inside this context on top of given objects """
+        if not self._frames:
+            yield
+            return
+        with self.record() as (dependencies, components):
+            for obj in objects:
+                self.add_object(obj)
+            yield
+        self.component_dependencies[key] = (dependencies, components)
+
+    def add_object(self, obj: Any) -> None:
+        if self._frames:
+            self._add_to_frames({get_dependency(obj)}, set())
+
+    def add_component(self, key: _ComponentKeyType) -> None:
+        if self._frames:
+            dependencies, components = self.component_dependencies.get(key, (set(), set()))
+            self._add_to_frames(dependencies, components | {key})
+
+    def _add_to_frames(self, dependencies, components) -> None:
+        for frame_dependencies, frame_components in self._frames:
+            frame_dependencies.update(dependencies)
+            frame_components.update(components)
+
+    def reset(self) -> None:
+        self.component_dependencies.clear()
+
+
+DEPENDENCY_RECORDER = DependencyRecorder()
+
+
+class GenerationProfiler:
+    """
+    Records wall time and call counts of generation phases, view classes, hooks and
+    serializers, as well as the slowest individual operations and serializers. Timing
+    only happens when enabled and is otherwise a no-op. Times of serializers include
+    their nested serializers.
+    """
+    def __init__(self, slowest: int = 10) -> None:
+        self.enabled = False
+        self.slowest = slowest
+        self.timings: Dict[Tuple[str, str], List[float]] = {}
+        self._slowest: DefaultDict[str, List[Tuple[float, str]]] = defaultdict(list)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self._slowest.clear()
+
+    @contextlib.contextmanager
+    def timer(self, category: str, name: str, slowest: Optional[Tuple[str, str]] = None):
+        """
+        time the enclosed block under category and name. the individual duration is
+        additionally ranked under the (category, name) given as slowest.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, name, time.perf_counter() - start, slowest)
+
+    def add(self, category: str, name: str, duration: float, slowest: Optional[Tuple[str, str]] = None) -> None:
+        entry = self.timings.setdefault((category, name), [0.0, 0])
+        entry[0] += duration
+        entry[1] += 1
+        if slowest:
+            self._add_slowest(*slowest, duration)
+
+    def _add_slowest(self, category: str, name: str, duration: float) -> None:
+        heap = self._slowest[category]
+        if len(heap) < self.slowest:
+            heapq.heappush(heap, (duration, name))
+        else:
+            heapq.heappushpop(heap, (duration, name))
+
+    def merge(self, timings: Dict[Tuple[str, str], List[float]], slowest: Dict[str, List[Tuple[float, str]]]) -> None:
+        """ merge measurements taken elsewhere (e.g. in a worker process) """
+        for key, (duration, count) in timings.items():
+            entry = self.timings.setdefault(key, [0.0, 0])
+            entry[0] += duration
+            entry[1] += count
+        for category, items in slowest.items():
+            for duration, name in items:
+                self._add_slowest(category, name, duration)
+
+    def report(self) -> Dict[str, Any]:
+        timings: Dict[str, List[Dict[str, Any]]] = {}
+        for (category, name), (duration, count) in sorted(self.timings.items(), key=lambda i: -i[1][0]):
+            timings.setdefault(category, []).append({'name': name, 'time': duration, 'count': count})
+        slowest = {
+            category: [{'name': name, 'time': duration} for duration, name in sorted(heap, reverse=True)]
+            for category, heap in self._slowest.items()
+        }
+        return {'timings': timings, 'slowest': slowest}
+
+    def format_report(self, format: str = 'table') -> str:
+        report = self.report()
+        if format == 'json':
+            return json.dumps(report, indent=2)
+
+        lines = []
+        for title, sections, with_count in [('Time', report['timings'], True), ('Slowest', report['slowest'], False)]:
+            for category, items in sections.items():
+                lines.append(f'\n{title} per {category}:' if with_count else f'\n{title} {category}s:')
+                for item in items:
+                    count = f'{item["count"]:>8}' if with_count else ''
+                    lines.append(f'  {item["time"]:>10.4f}s{count}  {item["name"]}')
+        return '\n'.join(lines).lstrip('\n') + '\n'
+
+
+GENERATION_PROFILER = GenerationProfiler()
+
 
 def warn(msg: str, delayed: Any = None) -> None:
     if delayed:
@@ -131,6 +300,7 @@ def add_trace_message(obj):
     """
     sourcefile, lineno = _get_source_location(obj)
     GENERATOR_STATS._traces.append((sourcefile, lineno, obj.__name__))
+    DEPENDENCY_RECORDER.add_object(obj)
     yield
     GENERATOR_STATS._traces.pop()
 
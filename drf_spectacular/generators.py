@@ -1,5 +1,12 @@
+import copy
+import functools
+import itertools
+import multiprocessing
 import os
+import pickle
 import re
+import types
+from typing import Any, Dict, List, Tuple
 
 from django.urls import URLPattern, URLResolver
 from rest_framework import views, viewsets
@@ -8,20 +15,128 @@ from rest_framework.schemas.generators import EndpointEnumerator as BaseEndpoint
 from rest_framework.settings import api_settings
 
 from drf_spectacular.drainage import (
-    add_trace_message, error, get_override, reset_generator_stats, warn,
+    DEPENDENCY_RECORDER, GENERATION_PROFILER, GENERATOR_STATS, add_trace_message, error,
+    get_dependency, get_override, reset_generator_stats, set_override, warn,
 )
 from drf_spectacular.extensions import OpenApiViewExtension
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.plumbing import (
-    ComponentRegistry, alpha_operation_sorter, build_root_object, camelize_operation, get_class,
+    ComponentIdentity, ComponentRegistry, ResolvedComponent, alpha_operation_sorter,
+    build_root_object, camelize_operation, defer_translations, get_class, get_component_identity,
     is_versioning_supported, modify_for_versioning, normalize_result_object,
-    operation_matches_version, process_webhooks, sanitize_result_object,
+    operation_matches_version, process_webhooks, resolve_translations, sanitize_result_object,
 )
+from drf_spectacular.reachability import ReferenceIndex
 from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.traversal import is_visitor_hook, run_visitor_hooks
+
+# handover of generation state to forked workers. must be set before the pool is created.
+_PARALLEL_STATE = None
+
+# schemas can be served in slices of operations sharing a tag or their first path segment
+SLICE_BY_TAG = 'tag'
+SLICE_BY_PATH = 'path'
+# slice of endpoints without tags or path segments
+DEFAULT_SLICE = 'default'
+
+
+class _UnpicklableIdentity(ComponentIdentity):
+    """
+    stand-in for component identities that cannot be transferred from a worker. objects
+    created before the fork share their id() with the parent, which makes them comparable.
+    """
+    def __init__(self, obj):
+        super().__init__(id(obj))
+        self.obj_repr = repr(obj)
+        if get_override(obj, 'suppress_collision_warning', False):
+            set_override(self, 'suppress_collision_warning', True)
+
+    def __repr__(self):
+        return self.obj_repr
+
+
+def _parse_endpoints_worker(indices):
+    generator, endpoints, path_prefix, input_request, public = _PARALLEL_STATE  # type: ignore
+    generator.registry = ComponentRegistry()
+    # messages are transferred to the parent, which emits them in order
+    reset_generator_stats()
+    GENERATOR_STATS.silent = True
+    # measurements are transferred to the parent as well
+    GENERATION_PROFILER.reset()
+
+    operations = [
+        generator._parse_endpoint(*endpoints[i], path_prefix, input_request, public) for i in indices
+    ]
+    components = []
+    for component in generator.registry._components.values():
+        identity = get_component_identity(component.object)
+        try:
+            pickle.dumps(identity)
+        except Exception:
+            identity = _UnpicklableIdentity(identity)
+        components.append((component.name, component.type, component.schema, identity))
+
+    try:
+        return pickle.dumps((
+            operations,
+            components,
+            dict(GENERATOR_STATS._warn_cache),
+            dict(GENERATOR_STATS._error_cache),
+            (GENERATION_PROFILER.timings, dict(GENERATION_PROFILER._slowest)),
+        ))
+    except Exception:
+        return None  # signal the parent to fall back to serial generation
+
+
+def _copy_component(component):
+    return ResolvedComponent(
+        name=component.name,
+        type=component.type,
+        schema=copy.deepcopy(component.schema),
+        object=component.object,
+    )
+
+
+def _get_callable_name(obj):
+    if isinstance(obj, functools.partial):
+        obj = obj.func
+    return f'{getattr(obj, "__module__", "")}.{getattr(obj, "__qualname__", repr(obj))}'
+
+
+def _get_dependency_name(obj):
+    if isinstance(obj, str):
+        return obj
+    elif isinstance(obj, types.ModuleType):
+        return obj.__name__
+    else:
+        return '.'.join(get_dependency(obj))
 
 
 class EndpointEnumerator(BaseEndpointEnumerator):
+    # enumerated endpoints per enumerator class and urlpatterns object (see ENUMERATION_CACHE).
+    # the entry references the patterns, so their id() cannot be reused while it is cached.
+    _endpoint_cache: Dict[Tuple[type, int], Tuple[Any, Any, List[Any]]] = {}
+    _endpoint_cache_size = 32
+
+    @classmethod
+    def clear_endpoint_cache(cls):
+        cls._endpoint_cache.clear()
+
     def get_api_endpoints(self, patterns=None, prefix=''):
+        if not spectacular_settings.ENUMERATION_CACHE or patterns is not None or prefix:
+            return self._enumerate_endpoints(patterns, prefix)
+
+        config = (tuple(spectacular_settings.PREPROCESSING_HOOKS), spectacular_settings.SORT_OPERATIONS)
+        key = (type(self), id(self.patterns))
+        cached = self._endpoint_cache.get(key)
+        if cached is None or cached[0] is not self.patterns or cached[1] != config:
+            if len(self._endpoint_cache) >= self._endpoint_cache_size:
+                del self._endpoint_cache[next(iter(self._endpoint_cache))]
+            cached = (self.patterns, config, self._enumerate_endpoints(patterns, prefix))
+            self._endpoint_cache[key] = cached
+        return list(cached[2])
+
+    def _enumerate_endpoints(self, patterns, prefix):
         api_endpoints = self._get_api_endpoints(patterns, prefix)
 
         for hook in spectacular_settings.PREPROCESSING_HOOKS:
@@ -105,7 +220,15 @@ class SchemaGenerator(BaseSchemaGenerator):
     def __init__(self, *args, **kwargs):
         self.registry = ComponentRegistry()
         self.api_version = kwargs.pop('api_version', None)
+        self.incremental = kwargs.pop('incremental', False)
+        self.slice_by = kwargs.pop('slice_by', SLICE_BY_TAG)
+        self.slice_name = kwargs.pop('slice_name', None)
         self.inspector = None
+        # view class per (path, method) of the last generated schema
+        self.operation_views = {}
+        self._view_endpoints = None
+        self._incremental_state = None
+        self._changed = None
         super().__init__(*args, **kwargs)
 
     def coerce_path(self, path, method, view):
@@ -184,8 +307,9 @@ class SchemaGenerator(BaseSchemaGenerator):
 
     def _initialise_endpoints(self):
         if self.endpoints is None:
-            self.inspector = self.endpoint_inspector_cls(self.patterns, self.urlconf)
-            self.endpoints = self.inspector.get_api_endpoints()
+            with GENERATION_PROFILER.timer('phase', 'enumeration'):
+                self.inspector = self.endpoint_inspector_cls(self.patterns, self.urlconf)
+                self.endpoints = self.inspector.get_api_endpoints()
 
     def _get_paths_and_endpoints(self):
         """
@@ -193,7 +317,8 @@ class SchemaGenerator(BaseSchemaGenerator):
         """
         view_endpoints = []
         for path, path_regex, method, callback in self.endpoints:
-            view = self.create_view(callback, method)
+            with GENERATION_PROFILER.timer('phase', 'create_view'):
+                view = self.create_view(callback, method)
             path = self.coerce_path(path, method, view)
             view_endpoints.append((path, path_regex, method, view))
 
@@ -203,8 +328,36 @@ class SchemaGenerator(BaseSchemaGenerator):
         """ Iterate endpoints generating per method path operations. """
         result = {}
         self._initialise_endpoints()
-        endpoints = self._get_paths_and_endpoints()
+        if self._view_endpoints is None:
+            endpoints = self._get_paths_and_endpoints()
+        else:
+            endpoints = self._view_endpoints
+        path_prefix = self._get_path_prefix(endpoints)
+
+        operations = None
+        workers = spectacular_settings.GENERATION_WORKERS
+        if self.incremental:
+            operations = self._parse_incremental(endpoints, path_prefix, input_request, public)
+        elif workers and workers > 1 and len(endpoints) > 1:
+            operations = self._parse_parallel(endpoints, path_prefix, input_request, public, workers)
+        if operations is None:
+            operations = [
+                self._parse_endpoint(path, path_regex, method, view, path_prefix, input_request, public)
+                for path, path_regex, method, view in endpoints
+            ]
+
+        self.operation_views = {}
+        for (_, _, _, view), path_method_operation in zip(endpoints, operations):
+            if path_method_operation is None:
+                continue
+            path, method, operation = path_method_operation
+            result.setdefault(path, {})
+            result[path][method.lower()] = operation
+            self.operation_views[path, method.lower()] = view.__class__
+
+        return result
 
+    def _get_path_prefix(self, endpoints):
         if spectacular_settings.SCHEMA_PATH_PREFIX is None:
             # estimate common path prefix if none was given. only use it if we encountered more
             # than one view to prevent emission of erroneous and unnecessary fallback names.
@@ -218,48 +371,87 @@ class SchemaGenerator(BaseSchemaGenerator):
             path_prefix = spectacular_settings.SCHEMA_PATH_PREFIX
         if not path_prefix.startswith('^'):
             path_prefix = '^' + path_prefix  # make sure regex only matches from the start
+        return path_prefix
 
-        for path, path_regex, method, view in endpoints:
+    def _prepare_endpoint(self, path, method, view, input_request, public):
+        """
+        Attach the mock request to the view and apply permission and version filtering.
+        Returns the (versioned) path or None if the endpoint is skipped.
+        """
+        with GENERATION_PROFILER.timer('phase', 'mock_request'):
+            view.request = spectacular_settings.GET_MOCK_REQUEST(method, path, view, input_request)
+
+        if not (public or self.has_view_permissions(path, method, view)):
+            return None
+
+        if view.versioning_class and not is_versioning_supported(view.versioning_class):
+            warn(
+                f'using unsupported versioning class "{view.versioning_class}". view will be '
+                f'processed as unversioned view.'
+            )
+        elif view.versioning_class:
+            version = (
+                self.api_version  # explicit version from CLI, SpecView or SpecView request
+                or view.versioning_class.default_version  # fallback
+            )
+            if not version:
+                return None
+            path = modify_for_versioning(self.inspector.patterns, method, path, view, version)
+            if not operation_matches_version(view, version):
+                return None
+
+        assert isinstance(view.schema, AutoSchema), (
+            f'Incompatible AutoSchema used on View {view.__class__}. Is DRF\'s '
+            f'DEFAULT_SCHEMA_CLASS pointing to "drf_spectacular.openapi.AutoSchema" '
+            f'or any other drf-spectacular compatible AutoSchema?'
+        )
+        return path
+
+    def _get_endpoint_slices(self, path, path_regex, method, view, path_prefix):
+        """
+        Names of the slices an endpoint belongs to, without generating its operation. That
+        is either its tags or the first path segment after the path prefix. Endpoints without
+        any are part of the "default" slice.
+        """
+        schema = view.schema
+        schema.initialise_operation(path, path_regex, path_prefix, method, self.registry)
+        with add_trace_message(getattr(view, '__class__', view)):
+            if schema.is_excluded():
+                return []
+            if self.slice_by == SLICE_BY_PATH:
+                segment = schema.get_path_segment()
+                names = [segment] if segment else []
+            else:
+                names = schema.get_tags()
+        return names or [DEFAULT_SLICE]
+
+    def _parse_endpoint(self, path, path_regex, method, view, path_prefix, input_request, public):
+        """ Generate the operation for a single endpoint. Returns None if endpoint is skipped. """
+        view_name = _get_callable_name(view.__class__)
+        with GENERATION_PROFILER.timer('view', view_name, slowest=('operation', f'{method} {path} ({view_name})')):
             # emit queued up warnings/error that happened prior to generation (decoration)
             for w in get_override(view, 'warnings', []):
                 warn(w)
             for e in get_override(view, 'errors', []):
                 error(e)
 
-            view.request = spectacular_settings.GET_MOCK_REQUEST(method, path, view, input_request)
+            path = self._prepare_endpoint(path, method, view, input_request, public)
+            if path is None:
+                return None
 
-            if not (public or self.has_view_permissions(path, method, view)):
-                continue
+            if self.slice_name is not None:
+                if self.slice_name not in self._get_endpoint_slices(path, path_regex, method, view, path_prefix):
+                    return None
 
-            if view.versioning_class and not is_versioning_supported(view.versioning_class):
-                warn(
-                    f'using unsupported versioning class "{view.versioning_class}". view will be '
-                    f'processed as unversioned view.'
-                )
-            elif view.versioning_class:
-                version = (
-                    self.api_version  # explicit version from CLI, SpecView or SpecView request
-                    or view.versioning_class.default_version  # fallback
-                )
-                if not version:
-                    continue
-                path = modify_for_versioning(self.inspector.patterns, method, path, view, version)
-                if not operation_matches_version(view, version):
-                    continue
-
-            assert isinstance(view.schema, AutoSchema), (
-                f'Incompatible AutoSchema used on View {view.__class__}. Is DRF\'s '
-                f'DEFAULT_SCHEMA_CLASS pointing to "drf_spectacular.openapi.AutoSchema" '
-                f'or any other drf-spectacular compatible AutoSchema?'
-            )
             with add_trace_message(getattr(view, '__class__', view)):
-                operation = view.schema.get_operation(
-                    path, path_regex, path_prefix, method, self.registry
-                )
+                with GENERATION_PROFILER.timer('phase', 'get_operation'):
+                    operation = view.schema.get_operation(
+                        path, path_regex, path_prefix, method, self.registry
+                    )
 
             # operation was manually removed via @extend_schema
             if not operation:
-                continue
+                return None
 
             if spectacular_settings.SCHEMA_PATH_PREFIX_TRIM:
                 path = re.sub(pattern=path_prefix, repl='', string=path, flags=re.IGNORECASE)
@@ -273,21 +465,253 @@ class SchemaGenerator(BaseSchemaGenerator):
             if spectacular_settings.CAMELIZE_NAMES:
                 path, operation = camelize_operation(path, operation)
 
-            result.setdefault(path, {})
-            result[path][method.lower()] = operation
+            return path, method, operation
 
+    def _parse_parallel(self, endpoints, path_prefix, input_request, public, workers):
+        """
+        Generate operations in forked worker processes. Each worker processes contiguous
+        chunks of endpoints with its own registry. Results are merged in endpoint order, so
+        that the first occurrence of a component wins and collisions are detected just like
+        in the serial case. Returns None if the parallel run is not possible, in which case
+        the caller falls back to serial processing.
+        """
+        global _PARALLEL_STATE
+
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            warn('GENERATION_WORKERS requires the "fork" start method. falling back to serial generation.')
+            return None
+
+        chunk_size = max(1, len(endpoints) // (workers * 4))
+        chunks = [
+            range(start, min(start + chunk_size, len(endpoints)))
+            for start in range(0, len(endpoints), chunk_size)
+        ]
+        _PARALLEL_STATE = (self, endpoints, path_prefix, input_request, public)
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                payloads = pool.map(_parse_endpoints_worker, chunks)
+        finally:
+            _PARALLEL_STATE = None
+
+        if any(payload is None for payload in payloads):
+            return None
+
+        operations = []
+        for payload in payloads:
+            chunk_operations, components, warn_cache, error_cache, measurements = pickle.loads(payload)
+            GENERATOR_STATS.merge(warn_cache, error_cache)
+            GENERATION_PROFILER.merge(*measurements)
+            for name, type, schema, identity in components:
+                self.registry.register_on_missing(
+                    ResolvedComponent(name=name, type=type, schema=schema, object=identity)
+                )
+            operations.extend(chunk_operations)
+        return operations
+
+    def _parse_incremental(self, endpoints, path_prefix, input_request, public):
+        """
+        Generate operations while recording which classes and components they depend on.
+        When called through regenerate_schema(), only operations and components depending
+        on a changed module or class are generated again. Everything else is reused from
+        the previous run.
+        """
+        context = (public, self.api_version or getattr(input_request, 'version', None))
+        previous = self._incremental_state
+        if previous is None or self._changed is None or previous['context'] != context:
+            previous = {'endpoints': {}, 'components': {}}
+        changed = self._changed or set()
+
+        def is_affected(dependencies):
+            return any(
+                module in changed or f'{module}.{qualname}' in changed
+                for module, qualname in dependencies
+            )
+
+        DEPENDENCY_RECORDER.reset()
+        for key, (component, dependencies, components) in previous['components'].items():
+            if not is_affected(dependencies):
+                self.registry.register_on_missing(_copy_component(component))
+                DEPENDENCY_RECORDER.component_dependencies[key] = (dependencies, components)
+
+        operations = []
+        endpoint_records = {}
+        for path, path_regex, method, view in endpoints:
+            endpoint_key = (path, path_regex, method, get_dependency(view))
+            record = previous['endpoints'].get(endpoint_key)
+            if record is None or is_affected(record[1]):
+                with DEPENDENCY_RECORDER.record() as (dependencies, components):
+                    operation = self._parse_endpoint(
+                        path, path_regex, method, view, path_prefix, input_request, public
+                    )
+                # components that were not built in a scope of their own (e.g. auth schemes)
+                # conservatively depend on everything the endpoint depended on.
+                for component_key in components:
+                    DEPENDENCY_RECORDER.component_dependencies.setdefault(
+                        component_key, (dependencies, components)
+                    )
+                record = (copy.deepcopy(operation), dependencies, components)
+            else:
+                operation = copy.deepcopy(record[0])
+            endpoint_records[endpoint_key] = record
+            operations.append(operation)
+
+        # drop reused components that are no longer referenced by any endpoint
+        referenced = set().union(*(components for _, _, components in endpoint_records.values()))
+        for key in list(self.registry._components):
+            if key not in referenced:
+                del self.registry[key]
+
+        self._incremental_state = {
+            'context': context,
+            'endpoints': endpoint_records,
+            'components': {
+                key: (
+                    _copy_component(component),
+                    *DEPENDENCY_RECORDER.component_dependencies.get(key, (set(), set()))
+                )
+                for key, component in self.registry._components.items()
+            },
+        }
+        return operations
+
+    def regenerate_schema(self, changed, request=None, public=False):
+        """
+        Generate the schema again after the given modules or classes changed. Those may be
+        given as objects or dotted paths. Requires the generator to be created with
+        ``incremental=True``. Warnings and errors are only emitted for the parts that are
+        generated again. The first call without a previous run generates the full schema.
+        """
+        assert self.incremental, 'regenerate_schema() requires a generator with incremental=True'
+        self._changed = {_get_dependency_name(obj) for obj in changed}
+        # re-enumerate to pick up reloaded view classes and changed routes
+        self.endpoints = None
+        EndpointEnumerator.clear_endpoint_cache()
+        self.registry = ComponentRegistry()
+        try:
+            return self.get_schema(request=request, public=public)
+        finally:
+            self._changed = None
+
+    def get_slices(self, request=None, public=False):
+        """
+        Sorted names of the slices of the schema, i.e. the values for ``slice_name``. This
+        only inspects the endpoints and does not generate any operations.
+        """
+        self._initialise_endpoints()
+        if self._view_endpoints is None:
+            self._view_endpoints = self._get_paths_and_endpoints()
+        path_prefix = self._get_path_prefix(self._view_endpoints)
+
+        slices = set()
+        for path, path_regex, method, view in self._view_endpoints:
+            path = self._prepare_endpoint(path, method, view, request, public)
+            if path is not None:
+                slices.update(self._get_endpoint_slices(path, path_regex, method, view, path_prefix))
+        return sorted(slices)
+
+    def get_api_versions(self):
+        """ versions allowed by the supported versioning classes of all endpoints in order """
+        self._initialise_endpoints()
+        if self._view_endpoints is None:
+            self._view_endpoints = self._get_paths_and_endpoints()
+        versions = {}
+        for _, _, _, view in self._view_endpoints:
+            versioning_class = getattr(view, 'versioning_class', None)
+            if not versioning_class or not is_versioning_supported(versioning_class):
+                continue
+            for version in [versioning_class.default_version, *(versioning_class.allowed_versions or [])]:
+                if version:
+                    versions[version] = None
+        return list(versions)
+
+    def get_schemas(self, versions=None, request=None, public=False):
+        """
+        Generate schemas for several API versions in one sweep. Endpoints are enumerated and
+        views are created only once for all versions. Components are generated per version,
+        as serializers may depend on the requested version. Each version gets a fresh
+        registry, so nothing memoized is shared between versions. Returns a dict mapping
+        each version to its schema. versions defaults to get_api_versions().
+        """
+        api_version = self.api_version
+        try:
+            if versions is None:
+                versions = self.get_api_versions()
+            else:
+                self._initialise_endpoints()
+                self._view_endpoints = self._get_paths_and_endpoints()
+
+            schemas = {}
+            stats = []
+            for version in versions:
+                self.registry = ComponentRegistry()
+                self.api_version = version
+                schemas[version] = self.get_schema(request=request, public=public)
+                # get_schema() resets the stats. collect them to cover the whole sweep.
+                stats.append((dict(GENERATOR_STATS._warn_cache), dict(GENERATOR_STATS._error_cache)))
+
+            reset_generator_stats()
+            with GENERATOR_STATS.silence():
+                for warn_cache, error_cache in stats:
+                    GENERATOR_STATS.merge(warn_cache, error_cache)
+            return schemas
+        finally:
+            self.api_version = api_version
+            self._view_endpoints = None
+
+    def get_translated_schemas(self, languages, request=None, public=False):
+        """
+        Generate schemas for several languages with a single introspection pass. The schema
+        is generated once with translation markers in place of lazy strings, which are then
+        replaced for each language. Returns a dict mapping each language to its schema.
+        """
+        with defer_translations() as translations:
+            schema = self.get_schema(request=request, public=public)
+        with GENERATION_PROFILER.timer('phase', 'translation'):
+            return {language: resolve_translations(schema, language, translations) for language in languages}
+
+    def _run_postprocessing_hooks(self, result, request, public):
+        """ run hooks in order. consecutive visitor hooks share their schema traversals. """
+        def hook_timer(hook):
+            return GENERATION_PROFILER.timer('hook', _get_callable_name(hook))
+
+        hooks = spectacular_settings.POSTPROCESSING_HOOKS
+        for visitor_hooks, group in itertools.groupby(hooks, key=is_visitor_hook):
+            if visitor_hooks:
+                run_visitor_hooks(list(group), result, hook_timer, generator=self, request=request, public=public)
+                continue
+            for hook in group:
+                with hook_timer(hook):
+                    result = hook(result=result, generator=self, request=request, public=public)
         return result
 
     def get_schema(self, request=None, public=False):
         """ Generate a OpenAPI schema. """
         reset_generator_stats()
+        paths = self.parse(request, public)
+        with GENERATION_PROFILER.timer('phase', 'registry_build'):
+            components = self.registry.build(spectacular_settings.APPEND_COMPONENTS)
+        with GENERATION_PROFILER.timer('phase', 'webhooks'):
+            webhooks = process_webhooks(spectacular_settings.WEBHOOKS, self.registry)
         result = build_root_object(
-            paths=self.parse(request, public),
-            components=self.registry.build(spectacular_settings.APPEND_COMPONENTS),
-            webhooks=process_webhooks(spectacular_settings.WEBHOOKS, self.registry),
+            paths=paths,
+            components=components,
+            webhooks=webhooks,
             version=self.api_version or getattr(request, 'version', None),
         )
-        for hook in spectacular_settings.POSTPROCESSING_HOOKS:
-            result = hook(result=result, generator=self, request=request, public=public)
-
-        return sanitize_result_object(normalize_result_object(result))
+        result = self._run_postprocessing_hooks(result, request, public)
+
+        if self.slice_name is not None:
+            # the registry contains components of every endpoint that was inspected
+            with GENERATION_PROFILER.timer('phase', 'slicing'):
+                result['components'] = ReferenceIndex(result).prune_components(result['components'])
+                if result.get('tags'):
+                    used_tags = {
+                        tag for path_item in result['paths'].values()
+                        for operation in path_item.values() for tag in operation.get('tags', [])
+                    }
+                    result['tags'] = [tag for tag in result['tags'] if tag['name'] in used_tags]
+
+        with GENERATION_PROFILER.timer('phase', 'normalize'):
+            result = normalize_result_object(result)
+        with GENERATION_PROFILER.timer('phase', 'sanitize'):
+            return sanitize_result_object(result)
@@ -8,9 +8,12 @@ from drf_spectacular.drainage import warn
 from drf_spectacular.plumbing import (
     ResolvedComponent, list_hash, load_enum_name_overrides, safe_ref,
 )
+from drf_spectacular.reachability import ReferenceIndex
 from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.traversal import SchemaVisitor, visitor_hook
 
 
+@visitor_hook(phases=2, post_walk=True)
 def postprocess_schema_enums(result, generator, **kwargs):
     """
     simple replacement of Enum/Choices that globally share the same name and have
@@ -18,23 +21,18 @@ def postprocess_schema_enums(result, generator, **kwargs):
     every occurrence. only takes effect when replacement is guaranteed to be correct.
     """
 
-    def iter_prop_containers(schema, component_name=None):
-        if not component_name:
-            for component_name, schema in schema.items():
-                if spectacular_settings.COMPONENT_SPLIT_PATCH:
-                    component_name = re.sub('^Patched(.+)', r'\1', component_name)
-                if spectacular_settings.COMPONENT_SPLIT_REQUEST:
-                    component_name = re.sub('(.+)Request$', r'\1', component_name)
-                yield from iter_prop_containers(schema, component_name)
-        elif isinstance(schema, list):
-            for item in schema:
-                yield from iter_prop_containers(item, component_name)
-        elif isinstance(schema, dict):
-            if schema.get('properties'):
-                yield component_name, schema['properties']
-            yield from iter_prop_containers(schema.get('oneOf', []), component_name)
-            yield from iter_prop_containers(schema.get('allOf', []), component_name)
-            yield from iter_prop_containers(schema.get('anyOf', []), component_name)
+    def get_component_name(path):
+        """ name of the component if path leads to a component or its (nested) compositions """
+        if len(path) < 3 or len(path) % 2 == 0 or path[0] != 'components' or path[1] != 'schemas':
+            return None
+        if any(path[i] not in ('oneOf', 'allOf', 'anyOf') for i in range(3, len(path), 2)):
+            return None
+        component_name = path[2]
+        if spectacular_settings.COMPONENT_SPLIT_PATCH:
+            component_name = re.sub('^Patched(.+)', r'\1', component_name)
+        if spectacular_settings.COMPONENT_SPLIT_REQUEST:
+            component_name = re.sub('(.+)Request$', r'\1', component_name)
+        return component_name
 
     def create_enum_component(name, schema):
         component = ResolvedComponent(
@@ -56,15 +54,16 @@ def postprocess_schema_enums(result, generator, **kwargs):
             # remove blank/null entry for hashing. will be reconstructed in the last step
             return list_hash([(i, i) for i in schema['enum'] if i not in ('', None)])
 
-    schemas = result.get('components', {}).get('schemas', {})
-
     overrides = load_enum_name_overrides()
 
     prop_hash_mapping = defaultdict(set)
     hash_name_mapping = defaultdict(set)
-    # collect all enums, their names and choice sets
-    for component_name, props in iter_prop_containers(schemas):
-        for prop_name, prop_schema in props.items():
+
+    def collect_enums(node, key, path):
+        component_name = get_component_name(path)
+        if not component_name or not node['properties']:
+            return
+        for prop_name, prop_schema in node['properties'].items():
             if prop_schema.get('type') == 'array':
                 prop_schema = prop_schema.get('items', {})
             if 'enum' not in prop_schema:
@@ -74,6 +73,9 @@ def postprocess_schema_enums(result, generator, **kwargs):
             prop_hash_mapping[prop_name].add(prop_enum_cleaned_hash)
             hash_name_mapping[prop_enum_cleaned_hash].add((component_name, prop_name))
 
+    # collect all enums, their names and choice sets
+    yield [SchemaVisitor('properties', visit=collect_enums)]
+
     # get the suffix to be used for enums from settings
     enum_suffix = spectacular_settings.ENUM_SUFFIX
 
@@ -111,9 +113,10 @@ def postprocess_schema_enums(result, generator, **kwargs):
                 enum_name_mapping[prop_hash] = enum_name
             enum_name_mapping[(prop_hash, prop_name)] = enum_name
 
-    # replace all enum occurrences with a enum schema component. cut out the
-    # enum, replace it with a reference and add a corresponding component.
-    for _, props in iter_prop_containers(schemas):
+    def replace_enums(node, key, path):
+        if not get_component_name(path) or not node['properties']:
+            return
+        props = node['properties']
         for prop_name, prop_schema in props.items():
             is_array = prop_schema.get('type') == 'array'
             if is_array:
@@ -167,33 +170,267 @@ def postprocess_schema_enums(result, generator, **kwargs):
             else:
                 props[prop_name] = safe_ref(prop_schema)
 
+    # replace all enum occurrences with a enum schema component. cut out the enum, replace it
+    # with a reference and add a corresponding component. also remove remaining ids that were
+    # not part of this hook (operation parameters mainly).
+    enum_id_nodes = []
+    yield [
+        SchemaVisitor('properties', visit=replace_enums),
+        SchemaVisitor('x-spec-enum-id', visit=lambda node, key, path: enum_id_nodes.append(node)),
+    ]
+    _remove_enum_ids(enum_id_nodes)
+
     # sort again with additional components
     result['components'] = generator.registry.build(spectacular_settings.APPEND_COMPONENTS)
 
-    # remove remaining ids that were not part of this hook (operation parameters mainly)
-    postprocess_schema_enum_id_removal(result, generator)
 
-    return result
+def _remove_enum_ids(nodes):
+    # ids are removed after the traversal, as nodes may be shared and their ids
+    # still be required by visitors that come across them later on.
+    for node in nodes:
+        node.pop('x-spec-enum-id', None)
 
 
+@visitor_hook(post_walk=True)
 def postprocess_schema_enum_id_removal(result, generator, **kwargs):
     """
-    Iterative modifying approach to scanning the whole schema and removing the
-    temporary helper ids that allowed us to distinguish similar enums.
+    Scan the whole schema and remove the temporary helper ids that allowed
+    us to distinguish similar enums.
+    """
+    enum_id_nodes = []
+    yield [SchemaVisitor('x-spec-enum-id', visit=lambda node, key, path: enum_id_nodes.append(node))]
+    _remove_enum_ids(enum_id_nodes)
+
+
+# keywords of schema objects containing subschemas, by their structure
+_SUBSCHEMA_KEYWORDS = ('items', 'additionalProperties', 'not', 'if', 'then', 'else', 'contains', 'propertyNames')
+_SUBSCHEMA_LIST_KEYWORDS = ('allOf', 'oneOf', 'anyOf', 'prefixItems')
+_SUBSCHEMA_DICT_KEYWORDS = ('properties', 'patternProperties')
+
+
+def _iter_subschemas(schema):
+    """ yield (hint, subschema) of a schema object. hint is the property name if available """
+    for key in _SUBSCHEMA_KEYWORDS:
+        if isinstance(schema.get(key), dict):
+            yield None, schema[key]
+    for key in _SUBSCHEMA_LIST_KEYWORDS:
+        for item in schema.get(key) or []:
+            if isinstance(item, dict):
+                yield None, item
+    for key in _SUBSCHEMA_DICT_KEYWORDS:
+        for name, item in (schema.get(key) or {}).items():
+            if isinstance(item, dict):
+                yield name, item
+
+
+def _is_same_shallow(a, b):
+    if isinstance(a, dict):
+        return a is b or (len(a) == len(b) and all(a[k] is v for k, v in b.items()))
+    return a is b or (len(a) == len(b) and all(x is y for x, y in zip(a, b)))
+
+
+def postprocess_schema_deduplication(result, generator, **kwargs):
+    """
+    Replace inline schemas that occur repeatedly (e.g. error bodies, pagination wrappers or
+    parameter schemas) with a reference to a common component. Inline schemas equal to an
+    existing component are replaced with a reference to that component. Only schemas of at
+    least DEDUPLICATION_MIN_SIZE keys and items are considered. Subtrees are hashed
+    bottom-up once, so the cost is proportional to the schema size.
     """
-    def clean(sub_result):
-        if isinstance(sub_result, dict):
-            for key in list(sub_result):
-                if key == 'x-spec-enum-id':
-                    del sub_result['x-spec-enum-id']
+    min_count = spectacular_settings.DEDUPLICATION_MIN_COUNT
+    min_size = spectacular_settings.DEDUPLICATION_MIN_SIZE
+    components = result.get('components') or {}
+    component_schemas = components.get('schemas', {})
+
+    hashes = {}  # id of node -> (hash, size)
+
+    def digest(node):
+        if id(node) not in hashes:
+            if isinstance(node, dict):
+                items = sorted(node.items())
+                size = len(node)
+            else:
+                items = enumerate(node)
+                size = len(node)
+            parts = []
+            for key, value in items:
+                if isinstance(value, (dict, list, tuple)):
+                    value_hash, value_size = digest(value)
+                    parts.append([key, ['#', value_hash]])
+                    size += value_size
                 else:
-                    clean(sub_result[key])
-        elif isinstance(sub_result, (list, tuple)):
-            for item in sub_result:
-                clean(item)
+                    parts.append([key, value])
+            hashes[id(node)] = (list_hash([type(node) is dict, parts]), size)
+        return hashes[id(node)]
+
+    # schemas in slots outside of component schemas
+    slot_schemas = []
+
+    def collect_slots(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in ('example', 'examples') or (isinstance(key, str) and key.startswith('x-')):
+                    continue
+                if key == 'schema' and isinstance(value, dict):
+                    slot_schemas.append(value)
+                else:
+                    collect_slots(value)
+        elif isinstance(node, (list, tuple)):
+            for item in node:
+                collect_slots(item)
+
+    for key, value in result.items():
+        if key != 'components':
+            collect_slots(value)
+    for key, value in components.items():
+        if key != 'schemas':
+            collect_slots(value)
+
+    roots = [(schema, True) for schema in component_schemas.values()]
+    roots += [(schema, False) for schema in slot_schemas]
+
+    # naive occurrence counts of all subschemas
+    naive_counts = defaultdict(int)
+
+    def count_naive(schema, is_root):
+        schema_hash, _ = digest(schema)
+        if not is_root:
+            naive_counts[schema_hash] += 1
+        for _, subschema in _iter_subschemas(schema):
+            count_naive(subschema, False)
+
+    for schema, is_root in roots:
+        count_naive(schema, is_root)
+
+    existing = {digest(schema)[0]: name for name, schema in component_schemas.items()}
+    candidates = {
+        schema_hash for schema_hash, size in hashes.values()
+        if size >= min_size and (naive_counts[schema_hash] >= min_count or schema_hash in existing)
+    }
+
+    # schemas within a replaced schema only occur once more (in the component). iterate
+    # until the set of replaced schemas is consistent with the resulting counts.
+    targets = set(candidates)
+    for _ in range(10):
+        counts = defaultdict(int)
+        expanded = set()
+
+        def count(schema, is_root):
+            schema_hash, _ = digest(schema)
+            if not is_root and schema_hash in candidates:
+                counts[schema_hash] += 1
+                if schema_hash in targets:
+                    if schema_hash in expanded:
+                        return
+                    expanded.add(schema_hash)
+            for _, subschema in _iter_subschemas(schema):
+                count(subschema, False)
+
+        for schema, is_root in roots:
+            count(schema, is_root)
+        new_targets = {h for h in candidates if counts[h] >= min_count or h in existing}
+        if new_targets == targets:
+            break
+        targets = new_targets
+
+    if not targets:
+        return result
+
+    registry = generator.registry._components
+    names = dict(existing)
+    new_schemas = {}
+    taken_names = set(component_schemas) | {name for name, type in registry if type == ResolvedComponent.SCHEMA}
+
+    def get_reference(schema, hint):
+        schema_hash, _ = digest(schema)
+        if schema_hash not in names:
+            name = f'{camelize(hint or "inline")}{schema_hash[:6].capitalize()}'
+            if name in taken_names:
+                name = f'{camelize(hint or "inline")}{schema_hash.capitalize()}'
+            taken_names.add(name)
+            names[schema_hash] = name
+            new_schemas[name] = rewrite(schema, is_root=True)
+            generator.registry.register_on_missing(ResolvedComponent(
+                name=name, type=ResolvedComponent.SCHEMA, schema=new_schemas[name], object=schema_hash,
+            ))
+        return {'$ref': f'#/components/schemas/{names[schema_hash]}'}
+
+    def rewrite(schema, is_root=False, hint=None):
+        """ return schema with replaced subschemas. nodes are copied on change, as they may be shared """
+        if not is_root and digest(schema)[0] in targets:
+            return get_reference(schema, hint)
+        changes = {}
+        for key in _SUBSCHEMA_KEYWORDS:
+            if isinstance(schema.get(key), dict):
+                changes[key] = rewrite(schema[key])
+        for key in _SUBSCHEMA_LIST_KEYWORDS:
+            if schema.get(key):
+                changes[key] = [rewrite(i) if isinstance(i, dict) else i for i in schema[key]]
+        for key in _SUBSCHEMA_DICT_KEYWORDS:
+            if schema.get(key):
+                changes[key] = {
+                    name: rewrite(item, hint=name) if isinstance(item, dict) else item
+                    for name, item in schema[key].items()
+                }
+        changes = {
+            key: value for key, value in changes.items()
+            if not (value is schema[key] if key in _SUBSCHEMA_KEYWORDS else _is_same_shallow(value, schema[key]))
+        }
+        return {**schema, **changes} if changes else schema
+
+    def replace_slots(node):
+        """ return node with rewritten schema slots. containers are copied on change, as they may be shared """
+        if isinstance(node, dict):
+            changes = {}
+            for key, value in node.items():
+                if key in ('example', 'examples') or (isinstance(key, str) and key.startswith('x-')):
+                    continue
+                if key == 'schema' and isinstance(value, dict):
+                    replacement = rewrite(value, hint=node.get('name') if 'in' in node else None)
+                else:
+                    replacement = replace_slots(value)
+                if replacement is not value:
+                    changes[key] = replacement
+            return {**node, **changes} if changes else node
+        elif isinstance(node, (list, tuple)):
+            items = [replace_slots(item) for item in node]
+            return items if not _is_same_shallow(items, node) else node
+        return node
+
+    rewritten_schemas = {}
+    for name, schema in component_schemas.items():
+        rewritten_schemas[name] = rewrite(schema, is_root=True)
+        # keep registry consistent for hooks that rebuild the components from it
+        if rewritten_schemas[name] is not schema and (name, ResolvedComponent.SCHEMA) in registry:
+            registry[name, ResolvedComponent.SCHEMA].schema = rewritten_schemas[name]
+
+    for key, value in list(result.items()):
+        if key != 'components':
+            result[key] = replace_slots(value)
+    components = {key: replace_slots(value) for key, value in components.items() if key != 'schemas'}
+    components['schemas'] = dict(sorted({**rewritten_schemas, **new_schemas}.items()))
+    result['components'] = dict(sorted(components.items()))
+    return result
+
+
+def postprocess_schema_prune_components(result, generator, **kwargs):
+    """
+    Remove components that are not reachable via ``$ref`` from any operation, webhook or
+    other part of the schema. Those are left behind by operations that were removed, e.g.
+    by a preceding hook. A warning is emitted for every removed component.
+    """
+    index = ReferenceIndex(result)
+    unreachable = index.get_unreachable_components()
+    if not unreachable:
+        return result
 
-    clean(result)
+    for component_type, name in unreachable:
+        warn(f'{component_type} component "{name}" is not used by any operation and was removed.')
+        # keep registry consistent for hooks that rebuild the components from it
+        if (name, component_type) in generator.registry._components:
+            del generator.registry[name, component_type]
 
+    result['components'] = index.prune_components(result['components'])
     return result
 
 
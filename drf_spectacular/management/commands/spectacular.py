@@ -1,13 +1,16 @@
 from textwrap import dedent
 
+import yaml
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import translation
 from django.utils.module_loading import import_string
 
-from drf_spectacular.drainage import GENERATOR_STATS
+from drf_spectacular.diff import BREAKING, NON_BREAKING, diff_schemas
+from drf_spectacular.drainage import GENERATION_PROFILER, GENERATOR_STATS
+from drf_spectacular.plumbing import defer_translations, resolve_translations
 from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
 from drf_spectacular.settings import patched_settings, spectacular_settings
-from drf_spectacular.validation import validate_schema
+from drf_spectacular.validation import validate_schema, validate_schema_components
 
 
 class SchemaGenerationError(CommandError):
@@ -37,13 +40,42 @@ class Command(BaseCommand):
         parser.add_argument('--generator-class', dest="generator_class", default=None, type=str)
         parser.add_argument('--file', dest="file", default=None, type=str)
         parser.add_argument('--fail-on-warn', dest="fail_on_warn", default=False, action='store_true')
-        parser.add_argument('--validate', dest="validate", default=False, action='store_true')
+        parser.add_argument(
+            '--validate', dest="validate", nargs='?', const='document', default=None,
+            choices=['document', 'components'],
+            help='validate the schema. "components" validates each component and operation on its own '
+                 'and reports errors with the responsible serializer or view',
+        )
         parser.add_argument('--api-version', dest="api_version", default=None, type=str)
+        parser.add_argument(
+            '--all-versions', dest="all_versions", default=False, action='store_true',
+            help='generate a schema for each API version in one pass. requires --file with a "{version}" placeholder',
+        )
         parser.add_argument('--lang', dest="lang", default=None, type=str)
+        parser.add_argument(
+            '--languages', dest="languages", default=None, type=lambda value: value.split(','),
+            help='comma separated languages to generate in one pass. requires --file with a "{lang}" placeholder',
+        )
         parser.add_argument('--color', dest="color", default=False, action='store_true')
         parser.add_argument('--custom-settings', dest="custom_settings", default=None, type=str)
+        parser.add_argument(
+            '--diff', dest="diff", default=None, type=str,
+            help='compare against a previously generated schema file and report breaking and non-breaking '
+                 'changes instead of printing the schema. the schema is still written to --file',
+        )
+        parser.add_argument(
+            '--profile', dest="profile", nargs='?', const='table', default=None, choices=['table', 'json'],
+            help='report time spent per generation phase, view, hook and serializer on stderr',
+        )
 
     def handle(self, *args, **options):
+        if options['all_versions'] and '{version}' not in (options['file'] or ''):
+            raise CommandError('--all-versions requires --file with a "{version}" placeholder')
+        if options['languages'] and '{lang}' not in (options['file'] or ''):
+            raise CommandError('--languages requires --file with a "{lang}" placeholder')
+        if options['diff'] and (options['all_versions'] or options['languages']):
+            raise CommandError('--diff cannot be combined with --all-versions or --languages')
+
         if options['generator_class']:
             generator_class = import_string(options['generator_class'])
         else:
@@ -64,31 +96,101 @@ class Command(BaseCommand):
         else:
             custom_settings = None
 
-        with patched_settings(custom_settings):
-            if options['lang']:
-                with translation.override(options['lang']):
-                    schema = generator.get_schema(request=None, public=True)
-            else:
-                schema = generator.get_schema(request=None, public=True)
+        if options['profile']:
+            GENERATION_PROFILER.reset()
+            GENERATION_PROFILER.enable()
+
+        try:
+            with patched_settings(custom_settings):
+                if options['lang']:
+                    with translation.override(options['lang']):
+                        schemas = self.generate(generator, options)
+                else:
+                    schemas = self.generate(generator, options)
+        finally:
+            GENERATION_PROFILER.disable()
 
         GENERATOR_STATS.emit_summary()
 
+        if options['profile']:
+            self.stderr.write(GENERATION_PROFILER.format_report(options['profile']), ending='')
+
         if options['fail_on_warn'] and GENERATOR_STATS:
             raise SchemaGenerationError('Failing as requested due to warnings')
-        if options['validate']:
-            try:
-                validate_schema(schema)
-            except Exception as e:
-                raise SchemaValidationError(e)
+        if options['validate'] == 'components':
+            for schema in schemas.values():
+                errors = validate_schema_components(schema, generator)
+                if errors:
+                    raise SchemaValidationError(f'Schema validation failed with {len(errors)} errors')
+        elif options['validate']:
+            for schema in schemas.values():
+                try:
+                    validate_schema(schema)
+                except Exception as e:
+                    raise SchemaValidationError(e)
+
+        if options['diff']:
+            self.write_diff(options['diff'], *schemas.values())
+            if not options['file']:
+                return
 
         renderer = self.get_renderer(options['format'])
-        output = renderer.render(schema, renderer_context={})
+        for (version, lang), schema in schemas.items():
+            if options['file']:
+                file = options['file'].replace('{version}', str(version)).replace('{lang}', str(lang))
+            else:
+                file = None
+            self.write_schema(renderer, schema, file)
+
+    def generate(self, generator, options):
+        """ generate schemas keyed by their version and language """
+        if not options['languages']:
+            return {
+                (version, options['lang']): schema
+                for version, schema in self.generate_versions(generator, options).items()
+            }
+        # introspection happens once for all languages. only the translations are resolved per language.
+        with defer_translations() as translations:
+            schemas = self.generate_versions(generator, options)
+        return {
+            (version, lang): resolve_translations(schema, lang, translations)
+            for version, schema in schemas.items() for lang in options['languages']
+        }
+
+    def generate_versions(self, generator, options):
+        if options['all_versions']:
+            return generator.get_schemas(request=None, public=True)
+        return {options['api_version']: generator.get_schema(request=None, public=True)}
+
+    def write_schema(self, renderer, schema, file):
+        if hasattr(renderer, 'render_stream'):
+            # write in chunks to avoid materializing huge schemas in memory
+            chunks = renderer.render_stream(schema, renderer_context={})
+        else:
+            chunks = [renderer.render(schema, renderer_context={})]
 
-        if options['file']:
-            with open(options['file'], 'wb') as f:
-                f.write(output)
+        if file:
+            with open(file, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
         else:
-            self.stdout.write(output.decode())
+            output = ''
+            for chunk in chunks:
+                output = chunk.decode()
+                self.stdout.write(output, ending='')
+            if not output.endswith('\n'):
+                self.stdout.write('')  # terminating newline
+
+    def write_diff(self, file, schema):
+        with open(file) as fh:
+            # JSON is a subset of YAML, so both formats can be compared.
+            old_schema = yaml.load(fh, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+        counts = {BREAKING: 0, NON_BREAKING: 0}
+        for change in diff_schemas(old_schema, schema):
+            counts[change.severity] += 1
+            self.stdout.write(str(change))
+        self.stdout.write(f'{counts[BREAKING]} breaking and {counts[NON_BREAKING]} non-breaking changes')
 
     def get_renderer(self, format):
         renderer_cls = {
@@ -23,7 +23,10 @@ from rest_framework.views import APIView
 import drf_spectacular.authentication  # noqa: F403, F401
 import drf_spectacular.serializers  # noqa: F403, F401
 from drf_spectacular.contrib import *  # noqa: F403, F401
-from drf_spectacular.drainage import add_trace_message, error, get_override, has_override, warn
+from drf_spectacular.drainage import (
+    DEPENDENCY_RECORDER, GENERATION_PROFILER, add_trace_message, error, get_override, has_override,
+    warn,
+)
 from drf_spectacular.extensions import (
     OpenApiAuthenticationExtension, OpenApiFilterExtension, OpenApiSerializerExtension,
     OpenApiSerializerFieldExtension,
@@ -33,13 +36,13 @@ from drf_spectacular.plumbing import (
     assert_basic_serializer, build_array_type, build_basic_type, build_choice_field,
     build_examples_list, build_generic_type, build_listed_example_value, build_media_type_object,
     build_mocked_view, build_object_type, build_parameter_type, build_serializer_context,
-    filter_supported_arguments, follow_field_source, follow_model_field_lookup, force_instance,
-    get_doc, get_list_serializer, get_manager, get_type_hints, get_view_model, is_basic_serializer,
-    is_basic_type, is_field, is_higher_order_type_hint, is_list_serializer,
-    is_list_serializer_customized, is_patched_serializer, is_serializer,
-    is_trivial_string_variation, modify_media_types_for_versioning, resolve_django_path_parameter,
-    resolve_regex_path_parameter, resolve_type_hint, safe_ref, sanitize_specification_extensions,
-    whitelisted,
+    build_title, filter_supported_arguments, follow_field_source, follow_model_field_lookup,
+    force_instance, get_doc, get_list_serializer, get_manager, get_serializer_signature,
+    get_type_hints, get_view_model, is_basic_serializer, is_basic_type, is_field,
+    is_higher_order_type_hint, is_list_serializer, is_list_serializer_customized,
+    is_patched_serializer, is_serializer, modify_media_types_for_versioning,
+    resolve_django_path_parameter, resolve_regex_path_parameter, resolve_type_hint, safe_ref,
+    sanitize_specification_extensions, whitelisted,
 )
 from drf_spectacular.settings import spectacular_settings
 from drf_spectacular.types import OpenApiTypes
@@ -58,20 +61,31 @@ class AutoSchema(ViewInspector):
         'delete': 'destroy',
     }
 
-    def get_operation(
+    def initialise_operation(
             self,
             path: str,
             path_regex: str,
             path_prefix: str,
             method: str,
             registry: ComponentRegistry
-    ) -> Optional[_SchemaType]:
+    ) -> None:
+        """ set up the state required to inspect the operation without generating it """
         self.registry = registry
         self.path = path
         self.path_regex = path_regex
         self.path_prefix = path_prefix
         self.method = method.upper()
 
+    def get_operation(
+            self,
+            path: str,
+            path_regex: str,
+            path_prefix: str,
+            method: str,
+            registry: ComponentRegistry
+    ) -> Optional[_SchemaType]:
+        self.initialise_operation(path, path_regex, path_prefix, method, registry)
+
         if self.is_excluded():
             return None
 
@@ -345,14 +359,14 @@ class AutoSchema(ViewInspector):
                 names, definitions = scheme.name, scheme.get_security_definition(self)  # type: ignore[assignment]
 
             for name, definition in zip(names, definitions):
-                self.registry.register_on_missing(
-                    ResolvedComponent(
-                        name=name,
-                        type=ResolvedComponent.SECURITY_SCHEMA,
-                        object=authenticator.__class__,
-                        schema=definition
-                    )
+                component = ResolvedComponent(
+                    name=name,
+                    type=ResolvedComponent.SECURITY_SCHEMA,
+                    object=authenticator.__class__,
+                    schema=definition
                 )
+                with DEPENDENCY_RECORDER.record_component(component.key, authenticator, scheme):
+                    self.registry.register_on_missing(component)
 
         if spectacular_settings.SECURITY:
             auths.extend(spectacular_settings.SECURITY)
@@ -378,6 +392,11 @@ class AutoSchema(ViewInspector):
         # use first non-parameter path part as tag
         return tokenized_path[:1]
 
+    def get_path_segment(self) -> Optional[str]:
+        """ first non-parameter path part after the path prefix """
+        tokenized_path = self._tokenize_path()
+        return tokenized_path[0] if tokenized_path else None
+
     def get_extensions(self) -> _SchemaType:
         return {}
 
@@ -767,7 +786,10 @@ class AutoSchema(ViewInspector):
                 schema = self._map_serializer_field(field.child, direction)
                 self._insert_field_validators(field.child, schema)
                 # remove automatically attached but redundant title
-                if is_trivial_string_variation(field.field_name, schema.get('title')):
+                title = build_title(schema.get('title'), field.field_name)
+                if title:
+                    schema['title'] = title
+                else:
                     schema.pop('title', None)
                 return append_meta(build_array_type(schema), meta)
 
@@ -1016,8 +1038,9 @@ class AutoSchema(ViewInspector):
             if isinstance(default, set):
                 default = list(default)
             meta['default'] = default
-        if field.label and not is_trivial_string_variation(field.label, field.field_name):
-            meta['title'] = str(field.label)
+        title = build_title(field.label, field.field_name)
+        if title:
+            meta['title'] = title
         if field.help_text:
             meta['description'] = str(field.help_text)
         return meta
@@ -1032,30 +1055,35 @@ class AutoSchema(ViewInspector):
         required = set()
         properties = {}
 
+        # Field schemas are reused for other components of the same serializer (e.g. Patched
+        # variants). Recording dependencies requires the actual mapping.
+        if DEPENDENCY_RECORDER.active or not self._is_serializer_field_memoizable(serializer):
+            signature = None
+        else:
+            signature = get_serializer_signature(serializer, ignore_partial=True)
+
         for field in serializer.fields.values():
             if isinstance(field, serializers.HiddenField):
                 continue
             if field.field_name in get_override(serializer, 'exclude_fields', []):
                 continue
 
-            schema = self._map_serializer_field(field, direction)
+            if signature is None or not self._is_field_schema_memoizable(field):
+                field_schema = self._map_basic_serializer_field(serializer, field, direction)
+            else:
+                field_schema = copy.deepcopy(self.registry.memoize(
+                    'field',
+                    (self.__class__, signature, field.field_name, field.__class__, direction),
+                    lambda: copy.deepcopy(self._map_basic_serializer_field(serializer, field, direction))
+                ))
             # skip field if there is no schema for the direction
-            if schema is None:
+            if field_schema is None:
                 continue
 
-            add_to_required = (
-                field.required
-                or (schema.get('readOnly') and not spectacular_settings.COMPONENT_NO_READ_ONLY_REQUIRED)
-            )
+            schema, add_to_required = field_schema
             if add_to_required:
                 required.add(field.field_name)
-
-            self._insert_field_validators(field, schema)
-
-            if field.field_name in get_override(serializer, 'deprecate_fields', []):
-                schema['deprecated'] = True
-
-            properties[field.field_name] = safe_ref(schema)
+            properties[field.field_name] = schema
 
         if is_patched_serializer(serializer, direction):
             required = []
@@ -1066,6 +1094,46 @@ class AutoSchema(ViewInspector):
             description=get_doc(serializer.__class__),
         )
 
+    def _is_serializer_field_memoizable(self, serializer) -> bool:
+        """
+        Fields of serializers customizing __init__ or get_fields may depend on partial or
+        the context, which are not part of the signature. Field schemas contain the names
+        of nested components, which customized naming may derive from the view.
+        """
+        if not self._is_serializer_naming_memoizable(serializer):
+            return False
+        for klass in type(serializer).__mro__:
+            if klass is object or klass.__module__.startswith('rest_framework'):
+                continue
+            if '__init__' in klass.__dict__ or 'get_fields' in klass.__dict__:
+                return False
+        return True
+
+    def _is_field_schema_memoizable(self, field) -> bool:
+        """ field extensions and nested serializer extensions may depend on the view or the method """
+        if OpenApiSerializerFieldExtension.get_match(field) is not None:
+            return False
+        if isinstance(field, serializers.BaseSerializer):
+            return self._is_serializer_naming_memoizable(field)
+        return True
+
+    def _map_basic_serializer_field(self, serializer, field, direction):
+        schema = self._map_serializer_field(field, direction)
+        if schema is None:
+            return None
+
+        add_to_required = (
+            field.required
+            or (schema.get('readOnly') and not spectacular_settings.COMPONENT_NO_READ_ONLY_REQUIRED)
+        )
+
+        self._insert_field_validators(field, schema)
+
+        if field.field_name in get_override(serializer, 'deprecate_fields', []):
+            schema['deprecated'] = True
+
+        return safe_ref(schema), add_to_required
+
     def _insert_field_validators(self, field, schema):
         schema_type = schema.get('type')
 
@@ -1622,6 +1690,39 @@ class AutoSchema(ViewInspector):
 
         return name
 
+    def _is_serializer_naming_memoizable(self, serializer) -> bool:
+        """
+        Default naming only depends on the serializer. Overridden naming methods and
+        serializer extensions may depend on the view, the method or the request as well.
+        """
+        cls = type(self)
+        if (
+            cls.get_serializer_name is not AutoSchema.get_serializer_name
+            or cls._get_serializer_name is not AutoSchema._get_serializer_name
+            or cls.get_serializer_identity is not AutoSchema.get_serializer_identity
+        ):
+            return False
+        if is_list_serializer(serializer):
+            serializer = serializer.child
+        return OpenApiSerializerExtension.get_match(serializer) is None
+
+    def _get_serializer_name_and_identity(self, serializer, direction, bypass_extensions):
+        """
+        Name and identity (None for the serializer itself) are memoized on the registry for
+        the duration of the generation, as the same serializers are encountered repeatedly.
+        """
+        def get_name_and_identity():
+            name = self._get_serializer_name(serializer, direction, bypass_extensions)
+            identity = self.get_serializer_identity(serializer, direction)
+            return name, None if identity is serializer else identity
+
+        signature = get_serializer_signature(serializer)
+        if signature is None or not self._is_serializer_naming_memoizable(serializer):
+            return get_name_and_identity()
+        return self.registry.memoize(
+            'serializer', (self.__class__, signature, direction, bypass_extensions), get_name_and_identity
+        )
+
     def resolve_serializer(
             self, serializer: _SerializerType, direction: Direction, bypass_extensions=False
     ) -> ResolvedComponent:
@@ -1629,16 +1730,22 @@ class AutoSchema(ViewInspector):
         serializer = force_instance(serializer)
 
         with add_trace_message(serializer.__class__):
+            name, identity = self._get_serializer_name_and_identity(serializer, direction, bypass_extensions)
             component = ResolvedComponent(
-                name=self._get_serializer_name(serializer, direction, bypass_extensions),
+                name=name,
                 type=ResolvedComponent.SCHEMA,
-                object=self.get_serializer_identity(serializer, direction),
+                object=serializer if identity is None else identity,
             )
             if component in self.registry:
                 return self.registry[component]  # return component with schema
 
             self.registry.register(component)
-            component.schema = self._map_serializer(serializer, direction, bypass_extensions)
+            serializer_name = f'{serializer.__class__.__module__}.{serializer.__class__.__qualname__}'
+            with DEPENDENCY_RECORDER.record_component(component.key, serializer):
+                with GENERATION_PROFILER.timer(
+                    'serializer', serializer_name, slowest=('serializer', f'{name} ({serializer_name})')
+                ):
+                    component.schema = self._map_serializer(serializer, direction, bypass_extensions)
 
             discard_component = (
                 # components with empty schemas serve no purpose
@@ -1,4 +1,6 @@
 import collections
+import contextlib
+import copy
 import functools
 import hashlib
 import inspect
@@ -13,7 +15,8 @@ from collections import OrderedDict, defaultdict
 from decimal import Decimal
 from enum import Enum
 from typing import (
-    Any, DefaultDict, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union,
+    Any, Callable, DefaultDict, Dict, Generic, Hashable, List, Optional, Sequence, Tuple, Type,
+    TypeVar, Union,
 )
 
 if sys.version_info >= (3, 10):
@@ -24,6 +27,8 @@ else:
 import inflection
 import uritemplate
 from django.apps import apps
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.fields.related_descriptors import (
     ForwardManyToOneDescriptor, ManyToManyDescriptor, ReverseManyToOneDescriptor,
@@ -31,15 +36,18 @@ from django.db.models.fields.related_descriptors import (
 )
 from django.db.models.fields.reverse_related import ForeignObjectRel
 from django.db.models.sql.query import Query
+from django.test.client import FakePayload
 from django.urls.converters import get_converters
 from django.urls.resolvers import (  # type: ignore[attr-defined]
     _PATH_PARAMETER_COMPONENT_RE, RegexPattern, Resolver404, RoutePattern, URLPattern, URLResolver,
-    get_resolver,
 )
+from django.utils import translation
 from django.utils.functional import Promise, cached_property
 from django.utils.module_loading import import_string
-from django.utils.translation import get_language
+from django.utils.translation import get_language, gettext
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext, trans_real
+from django.utils.translation.trans_real import CONTEXT_SEPARATOR
 from rest_framework import exceptions, fields, mixins, serializers, versioning
 from rest_framework.compat import unicode_http_header
 from rest_framework.fields import empty
@@ -50,7 +58,7 @@ from rest_framework.utils.mediatypes import _MediaType
 from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
 from uritemplate import URITemplate
 
-from drf_spectacular.drainage import cache, error, get_override, warn
+from drf_spectacular.drainage import DEPENDENCY_RECORDER, cache, error, get_override, warn
 from drf_spectacular.settings import spectacular_settings
 from drf_spectacular.types import (
     DJANGO_PATH_CONVERTER_MAPPING, OPENAPI_TYPE_MAPPING, PYTHON_TYPE_MAPPING, OpenApiTypes,
@@ -124,6 +132,37 @@ def force_instance(serializer_or_field):
         return serializer_or_field
 
 
+def get_serializer_signature(serializer, ignore_partial=False) -> Optional[Hashable]:
+    """
+    Hashable signature of a serializer consisting of its class, its relevant state and its
+    init kwargs. Request-scoped kwargs like context are ignored. None if no signature can
+    be built, e.g. because of unhashable kwargs or instance-level overrides.
+    """
+    if inspect.isclass(serializer):
+        return serializer
+    if '_spectacular_annotation' in getattr(serializer, '__dict__', {}):
+        return None
+    kwargs = []
+    for key, value in sorted(getattr(serializer, '_kwargs', {}).items()):
+        if key in ('context', 'data', 'instance') or (ignore_partial and key == 'partial'):
+            continue
+        if isinstance(value, (serializers.BaseSerializer, fields.Field)):
+            value = get_serializer_signature(value)
+            if value is None:
+                return None
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        kwargs.append((key, value))
+    return (
+        serializer.__class__,
+        None if ignore_partial else getattr(serializer, 'partial', None),
+        getattr(serializer, 'read_only', None),
+        tuple(kwargs),
+    )
+
+
 def is_serializer(obj, strict=False) -> TypeGuard[_SerializerType]:
 
     from drf_spectacular.extensions import OpenApiSerializerExtension
@@ -230,14 +269,19 @@ def get_view_model(view, emit_warnings=True):
             )
 
 
+def _post_cleanup_doc(doc: str) -> str:
+    # also clean up trailing whitespace for each line
+    return '\n'.join(line.rstrip() for line in doc.rstrip().split('\n'))
+
+
+def _clean_doc(doc: str) -> str:
+    return _post_cleanup_doc(inspect.cleandoc(doc))
+
+
 def get_doc(obj) -> str:
     """ get doc string with fallback on obj's base classes (ignoring DRF documentation). """
-    def post_cleanup(doc: str) -> str:
-        # also clean up trailing whitespace for each line
-        return '\n'.join(line.rstrip() for line in doc.rstrip().split('\n'))
-
     if not inspect.isclass(obj):
-        return post_cleanup(inspect.getdoc(obj) or '')
+        return _post_cleanup_doc(inspect.getdoc(obj) or '')
 
     def safe_index(lst, item):
         try:
@@ -250,7 +294,7 @@ def get_doc(obj) -> str:
     )
     for cls in obj.__mro__[:lib_barrier]:
         if cls.__doc__:
-            return post_cleanup(inspect.cleandoc(cls.__doc__))
+            return transform_translatable(_clean_doc, cls.__doc__)
     return ''
 
 
@@ -487,6 +531,7 @@ def build_bearer_security_scheme_object(header_name, token_prefix, bearer_format
 
 
 def build_root_object(paths, components, webhooks, version) -> _SchemaType:
+    # parts taken from settings are copied, so that the result does not alias the settings
     settings = spectacular_settings
     if settings.VERSION and version:
         version = f'{settings.VERSION} ({version})'
@@ -497,26 +542,26 @@ def build_root_object(paths, components, webhooks, version) -> _SchemaType:
         'info': {
             'title': settings.TITLE,
             'version': version,
-            **sanitize_specification_extensions(settings.EXTENSIONS_INFO),
+            **copy.deepcopy(sanitize_specification_extensions(settings.EXTENSIONS_INFO)),
         },
-        'paths': {**paths, **settings.APPEND_PATHS},
+        'paths': {**paths, **copy.deepcopy(settings.APPEND_PATHS)},
         'components': components,
-        **sanitize_specification_extensions(settings.EXTENSIONS_ROOT),
+        **copy.deepcopy(sanitize_specification_extensions(settings.EXTENSIONS_ROOT)),
     }
     if settings.DESCRIPTION:
         root['info']['description'] = settings.DESCRIPTION
     if settings.TOS:
         root['info']['termsOfService'] = settings.TOS
     if settings.CONTACT:
-        root['info']['contact'] = settings.CONTACT
+        root['info']['contact'] = copy.deepcopy(settings.CONTACT)
     if settings.LICENSE:
-        root['info']['license'] = settings.LICENSE
+        root['info']['license'] = copy.deepcopy(settings.LICENSE)
     if settings.SERVERS:
-        root['servers'] = settings.SERVERS
+        root['servers'] = copy.deepcopy(settings.SERVERS)
     if settings.TAGS:
-        root['tags'] = settings.TAGS
+        root['tags'] = copy.deepcopy(settings.TAGS)
     if settings.EXTERNAL_DOCS:
-        root['externalDocs'] = settings.EXTERNAL_DOCS
+        root['externalDocs'] = copy.deepcopy(settings.EXTERNAL_DOCS)
     if webhooks:
         root['webhooks'] = webhooks
     return root
@@ -740,9 +785,30 @@ class ComponentIdentity:
         return self.obj == other
 
 
+def get_component_identity(obj: Any) -> Any:
+    """ the object against which component collisions are checked """
+    if isinstance(obj, ComponentIdentity) or inspect.isclass(obj):
+        return obj
+    return obj.__class__
+
+
 class ComponentRegistry:
     def __init__(self) -> None:
         self._components: Dict[Tuple[str, str], ResolvedComponent] = {}
+        self._memo: Dict[Tuple[str, Hashable], Any] = {}
+        self.memo_hits: DefaultDict[str, int] = defaultdict(int)
+        self.memo_misses: DefaultDict[str, int] = defaultdict(int)
+
+    def memoize(self, namespace: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        """ generation-scoped memoization of information derived during generation """
+        try:
+            result = self._memo[namespace, key]
+        except KeyError:
+            self.memo_misses[namespace] += 1
+            result = self._memo[namespace, key] = func()
+        else:
+            self.memo_hits[namespace] += 1
+        return result
 
     def register(self, component: ResolvedComponent) -> None:
         if component in self:
@@ -752,27 +818,19 @@ class ComponentRegistry:
                 f'a incorrect schema. Look out for reused names'
             )
         self._components[component.key] = component
+        DEPENDENCY_RECORDER.add_component(component.key)
 
     def register_on_missing(self, component: ResolvedComponent) -> None:
         if component not in self:
             self._components[component.key] = component
+            DEPENDENCY_RECORDER.add_component(component.key)
 
     def __contains__(self, component):
         if component.key not in self._components:
             return False
 
-        query_obj = component.object
-        registry_obj = self._components[component.key].object
-
-        if isinstance(query_obj, ComponentIdentity) or inspect.isclass(query_obj):
-            query_id = query_obj
-        else:
-            query_id = query_obj.__class__
-
-        if isinstance(registry_obj, ComponentIdentity) or inspect.isclass(registry_obj):
-            registry_id = registry_obj
-        else:
-            registry_id = registry_obj.__class__
+        query_id = get_component_identity(component.object)
+        registry_id = get_component_identity(self._components[component.key].object)
 
         suppress_collision_warning = (
             get_override(registry_id, 'suppress_collision_warning', False)
@@ -784,6 +842,7 @@ class ComponentRegistry:
                 f'different identities {query_id} and {registry_id}. This will very '
                 f'likely result in an incorrect schema. Try renaming one.'
             )
+        DEPENDENCY_RECORDER.add_component(component.key)
         return True
 
     def __getitem__(self, key) -> ResolvedComponent:
@@ -801,10 +860,11 @@ class ComponentRegistry:
         # build tree from flat registry
         for component in self._components.values():
             output[component.type][component.name] = component.schema
-        # add/override extra components
+        # add/override extra components. those usually stem from settings and are copied,
+        # so that modifications of the result do not leak into the settings.
         for extra_type, extra_component_dict in extra_components.items():
             for component_name, component_schema in extra_component_dict.items():
-                output[extra_type][component_name] = component_schema
+                output[extra_type][component_name] = copy.deepcopy(component_schema)
         # sort by component type then by name
         return {
             type: {name: output[type][name] for name in sorted(output[type].keys())}
@@ -818,10 +878,13 @@ class OpenApiGeneratorExtension(Generic[T], metaclass=ABCMeta):
     match_subclasses = False
     priority = 0
     optional = False
+    # per extension type (keyed by registry): extensions by priority and matches by target class
+    _dispatch_index: Dict[int, Tuple[List[Any], Dict[type, Any]]] = {}
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         cls._registry.append(cls)
+        OpenApiGeneratorExtension._dispatch_index.pop(id(cls._registry), None)
 
     def __init__(self, target):
         self.target = target
@@ -863,12 +926,31 @@ class OpenApiGeneratorExtension(Generic[T], metaclass=ABCMeta):
         else:
             return get_class(target) == cls.target_class
 
+    @classmethod
+    def _get_dispatch_index(cls) -> Tuple[List[Type[T]], Dict[type, Optional[Type[T]]]]:
+        index = cls._dispatch_index.get(id(cls._registry))
+        if index is None:
+            # sorting is stable, so registration order is retained for equal priorities
+            index = (sorted(cls._registry, key=lambda e: e.priority, reverse=True), {})
+            cls._dispatch_index[id(cls._registry)] = index
+        return index
+
     @classmethod
     def get_match(cls, target) -> Optional[T]:
-        for extension in sorted(cls._registry, key=lambda e: e.priority, reverse=True):
-            if extension._matches(target):
-                return extension(target)
-        return None
+        extensions, matches = cls._get_dispatch_index()
+        # matching only depends on the class of target, which allows reusing previous results
+        target_class = get_class(target)
+        try:
+            match = matches[target_class]
+        except KeyError:
+            match = matches[target_class] = next((e for e in extensions if e._matches(target)), None)
+        except TypeError:  # pragma: no cover
+            match = next((e for e in extensions if e._matches(target)), None)
+
+        if match is None:
+            return None
+        DEPENDENCY_RECORDER.add_object(match)
+        return match(target)
 
 
 def deep_import_string(string: str) -> Any:
@@ -1058,16 +1140,12 @@ def modify_for_versioning(patterns, method, path, view, requested_version):
     if issubclass(view.versioning_class, versioning.URLPathVersioning):
         version_param = view.versioning_class.version_param
         # substitute version variable to emulate request
-        path = uritemplate.partial(path, var_dict={version_param: requested_version})
-        if isinstance(path, URITemplate):
-            path = path.uri
+        path = substitute_path_version(path, version_param, requested_version)
         # emulate router behaviour by injecting substituted variable into view
         view.kwargs[version_param] = requested_version
     elif issubclass(view.versioning_class, versioning.NamespaceVersioning):
         try:
-            view.request.resolver_match = get_resolver(
-                urlconf=detype_patterns(tuple(patterns)),
-            ).resolve(path)
+            view.request.resolver_match = get_route_index(patterns).resolve(path)
         except Resolver404:
             error(f"namespace versioning path resolution failed for {path}. Path will be ignored.")
     elif issubclass(view.versioning_class, versioning.AcceptHeaderVersioning):
@@ -1151,12 +1229,122 @@ def analyze_named_regex_pattern(path: str) -> Dict[str, str]:
     return result
 
 
-@cache
 def detype_patterns(patterns):
-    """Cache detyped patterns due to the expensive nature of rebuilding URLResolver."""
     return tuple(detype_pattern(pattern) for pattern in patterns)
 
 
+@functools.lru_cache(maxsize=4096)
+def substitute_path_version(path: str, version_param: str, version: str) -> str:
+    """ substitute the version variable in a path template, leaving other variables untouched """
+    path = uritemplate.partial(path, var_dict={version_param: version})
+    if isinstance(path, URITemplate):
+        path = path.uri
+    return path
+
+
+_PATTERN_LITERAL_PREFIX_RE = re.compile(r'[^.^$*+?{}\[\]\\|()<]*')
+
+
+def _has_top_level_alternation(regex: str) -> bool:
+    depth, escaped, in_class = 0, False, False
+    for char in regex:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def _get_literal_first_segment(pattern) -> Optional[str]:
+    """
+    the first path segment a pattern can match, if it is a literal. ``None`` signals that
+    the pattern may match arbitrary first segments.
+    """
+    if isinstance(pattern, RoutePattern):
+        route = pattern._route
+    elif isinstance(pattern, RegexPattern):
+        if _has_top_level_alternation(pattern._regex):
+            return None  # each alternative may start with a different segment
+        route = pattern._regex.lstrip('^')
+    else:
+        return None
+    prefix = _PATTERN_LITERAL_PREFIX_RE.match(route).group()  # type: ignore[union-attr]
+    if '/' not in prefix:
+        return None
+    return prefix.split('/', 1)[0]
+
+
+class RouteIndex:
+    """
+    Precompiled index for resolving schema paths against (detyped) urlpatterns. Top-level
+    patterns are grouped by their literal first path segment, so that a resolution only
+    visits patterns that can possibly match. Patterns without a literal first segment are
+    part of every group to retain Django's resolution order. Resolutions are memoized per
+    path, which is bounded by the number of routes.
+    """
+    def __init__(self, patterns):
+        detyped = detype_patterns(patterns)
+        groups: Dict[str, List[int]] = defaultdict(list)
+        wildcards: List[int] = []
+        for i, pattern in enumerate(detyped):
+            segment = _get_literal_first_segment(pattern.pattern)
+            if segment is None:
+                wildcards.append(i)
+            else:
+                groups[segment].append(i)
+
+        def build_resolver(indices):
+            # equivalent of django.urls.get_resolver() for the given subset of patterns
+            return URLResolver(RegexPattern(r'^/'), [detyped[i] for i in sorted(indices)])
+
+        self._resolvers = {
+            segment: build_resolver(indices + wildcards) for segment, indices in groups.items()
+        }
+        self._fallback_resolver = build_resolver(wildcards)
+        self._matches: Dict[str, Any] = {}
+
+    def resolve(self, path: str):
+        """ drop-in for ``URLResolver.resolve()``. raises ``Resolver404`` if nothing matches """
+        if path not in self._matches:
+            segment = path.lstrip('/').split('/', 1)[0]
+            resolver = self._resolvers.get(segment, self._fallback_resolver)
+            try:
+                self._matches[path] = resolver.resolve(path)
+            except Resolver404:
+                self._matches[path] = None
+        match = self._matches[path]
+        if match is None:
+            raise Resolver404({'path': path})
+        return match
+
+
+# route indexes per tuple of top-level urlpatterns, in order of last usage
+_ROUTE_INDEXES: Dict[Tuple[Any, ...], RouteIndex] = {}
+_ROUTE_INDEXES_SIZE = 16
+
+
+def get_route_index(patterns) -> RouteIndex:
+    """ return the (cached) route index for the given urlpatterns """
+    key = tuple(patterns)
+    route_index = _ROUTE_INDEXES.pop(key, None)
+    if route_index is None:
+        if len(_ROUTE_INDEXES) >= _ROUTE_INDEXES_SIZE:
+            del _ROUTE_INDEXES[next(iter(_ROUTE_INDEXES))]
+        route_index = RouteIndex(key)
+    _ROUTE_INDEXES[key] = route_index
+    return route_index
+
+
 def detype_pattern(pattern):
     """
     return an equivalent pattern that accepts arbitrary values for path parameters.
@@ -1201,20 +1389,282 @@ def detype_pattern(pattern):
         return pattern
 
 
-def normalize_result_object(result):
-    """ resolve non-serializable objects like lazy translation strings and OrderedDict """
-    if isinstance(result, dict) or isinstance(result, OrderedDict):
-        return {k: normalize_result_object(v) for k, v in result.items()}
-    if isinstance(result, list) or isinstance(result, tuple):
-        return [normalize_result_object(v) for v in result]
-    if isinstance(result, Promise):
-        return str(result)
-    for base_type in [bool, int, float, str]:
-        if isinstance(result, base_type):
-            return base_type(result)  # coerce basic sub types
+_TRANSLATION_MARKER = re.compile('\ue000([0-9]+)\ue001')
+# resolved value of a translation marker whose containing entry is omitted for the language
+_OMITTED_TRANSLATION = '\ue002'
+
+
+class DeferredTranslations:
+    """
+    (function, arguments) of the translations deferred within one defer_translations()
+    context. A marker is the index in this table. Tables are not shared between contexts,
+    so concurrent deferred generations do not interfere and tables are freed afterwards.
+    """
+    def __init__(self):
+        self._entries: List[Tuple[Callable[..., str], Tuple[Any, ...]]] = []
+        self._index: Dict[Tuple[Callable[..., str], Tuple[Any, ...]], int] = {}
+
+    def get_marker(self, func: Callable[..., str], *args: Any) -> str:
+        index = self._index.get((func, args))
+        if index is None:
+            index = self._index[func, args] = len(self._entries)
+            self._entries.append((func, args))
+        return f'\ue000{index}\ue001'
+
+    def resolve_markers(self, text: str, translations: Dict[str, str]) -> str:
+        def replace(match):
+            marker = match.group(0)
+            if marker not in translations:
+                func, args = self._entries[int(match.group(1))]
+                translations[marker] = func(self, *args)
+            return translations[marker]
+
+        return _TRANSLATION_MARKER.sub(replace, text)
+
+
+def _get_active_deferred_translations() -> Optional[DeferredTranslations]:
+    active = getattr(trans_real._active, 'value', None)
+    return active.table if isinstance(active, _DeferredTranslation) else None
+
+
+def _translate_message(table: DeferredTranslations, message: str) -> str:
+    result = gettext(message)
+    if CONTEXT_SEPARATOR in result:
+        result = result.split(CONTEXT_SEPARATOR, 1)[1]  # untranslated pgettext
     return result
 
 
+def _translate_plural(table: DeferredTranslations, singular: str, plural: str, number: int) -> str:
+    result = ngettext(singular, plural, number)
+    if CONTEXT_SEPARATOR in result:
+        result = result.split(CONTEXT_SEPARATOR, 1)[1]  # untranslated npgettext
+    return result
+
+
+def _transform_translation(table: DeferredTranslations, func: Callable[[str], str], marker: str) -> str:
+    return func(table.resolve_markers(marker, {}))
+
+
+def _resolve_translation_argument(table: DeferredTranslations, value: Any) -> Any:
+    return table.resolve_markers(value, {}) if isinstance(value, str) else value
+
+
+def _format_translation(
+    table: DeferredTranslations, marker: str, args: Tuple[Any, ...], kwargs: Tuple[Tuple[str, Any], ...]
+) -> str:
+    return table.resolve_markers(marker, {}).format(
+        *[_resolve_translation_argument(table, v) for v in args],
+        **{k: _resolve_translation_argument(table, v) for k, v in kwargs},
+    )
+
+
+def _interpolate_translation(table: DeferredTranslations, marker: str, args: Any, is_mapping: bool) -> str:
+    if is_mapping:
+        args = {k: _resolve_translation_argument(table, v) for k, v in args}
+    else:
+        args = tuple(_resolve_translation_argument(table, v) for v in args)
+    return table.resolve_markers(marker, {}) % args
+
+
+def _freeze_translation_arguments(args):
+    # text arguments may be lazy or contain markers themselves, which are resolved as well
+    frozen = tuple(str(v) if isinstance(v, (str, Promise)) else v for v in args)
+    hash(frozen)  # unhashable arguments cannot be deferred
+    return frozen
+
+
+class _TranslationMarker(str):
+    """ marker for a translation, which defers formatting until the translation is resolved """
+    def format(self, *args, **kwargs):
+        table = _get_active_deferred_translations()
+        try:
+            assert table is not None
+            return table.get_marker(
+                _format_translation,
+                str(self),
+                _freeze_translation_arguments(args),
+                tuple(zip(kwargs, _freeze_translation_arguments(kwargs.values()))),
+            )
+        except (AssertionError, TypeError):
+            return super().format(*args, **kwargs)
+
+    def __mod__(self, args):
+        table = _get_active_deferred_translations()
+        try:
+            assert table is not None
+            if isinstance(args, dict):
+                frozen = tuple(zip(args, _freeze_translation_arguments(args.values())))
+            else:
+                frozen = _freeze_translation_arguments(args if isinstance(args, tuple) else (args,))
+            return table.get_marker(_interpolate_translation, str(self), frozen, isinstance(args, dict))
+        except (AssertionError, TypeError):
+            return super().__mod__(args)
+
+
+class _DeferredTranslation:
+    """ translation object that translates messages to markers instead of text """
+    def __init__(self, table: DeferredTranslations):
+        self.table = table
+
+    def gettext(self, message):
+        return _TranslationMarker(self.table.get_marker(_translate_message, message))
+
+    def ngettext(self, singular, plural, number):
+        return _TranslationMarker(self.table.get_marker(_translate_plural, singular, plural, number))
+
+    def to_language(self):
+        return 'x-deferred'
+
+
+@contextlib.contextmanager
+def defer_translations():
+    """
+    Translate lazy strings to language-independent markers within this context. Yields the
+    table of deferred translations, with which markers are replaced for any language using
+    resolve_translations() afterwards. The context only affects the current thread.
+    Transformations of translated text other than concatenation, format() and "%"
+    interpolation need to go through transform_translatable().
+    """
+    table = DeferredTranslations()
+    if not settings.USE_I18N:
+        yield table  # all languages are the same anyway
+        return
+    previous = getattr(trans_real._active, 'value', None)
+    trans_real._active.value = _DeferredTranslation(table)
+    try:
+        yield table
+    finally:
+        if previous is None:
+            del trans_real._active.value
+        else:
+            trans_real._active.value = previous
+
+
+def transform_translatable(func: Callable[[str], str], text: Any) -> str:
+    """ apply func to (lazy) text. defers the transformation for translation markers. """
+    text = str(text)
+    table = _get_active_deferred_translations()
+    if table is not None and _TRANSLATION_MARKER.fullmatch(text):
+        return table.get_marker(_transform_translation, func, text)
+    return func(text)
+
+
+def _translate_title(table: DeferredTranslations, marker: str, name: str) -> str:
+    label = table.resolve_markers(marker, {})
+    return _OMITTED_TRANSLATION if is_trivial_string_variation(label, name) else label
+
+
+def build_title(label: Any, name: str) -> Optional[str]:
+    """
+    (lazy) label as title unless it is a trivial variation of name. Whether it is trivial
+    depends on the language, so for translation markers the check is deferred and
+    resolve_translations() omits the title where it is trivial.
+    """
+    label = str(label) if label else ''
+    table = _get_active_deferred_translations()
+    if table is not None and '\ue000' in label:
+        return table.get_marker(_translate_title, label, name)
+    return None if is_trivial_string_variation(label, name) else label
+
+
+def resolve_translations(result: Any, language: str, table: DeferredTranslations) -> Any:
+    """ copy of result with all translation markers of table replaced with text in given language """
+    translations: Dict[str, str] = {}
+
+    def resolve(obj):
+        if isinstance(obj, dict):
+            resolved = ((resolve(k), resolve(v)) for k, v in obj.items())
+            return {k: v for k, v in resolved if v != _OMITTED_TRANSLATION}
+        if isinstance(obj, list):
+            return [resolve(v) for v in obj]
+        if isinstance(obj, str) and '\ue000' in obj:
+            return table.resolve_markers(obj, translations)
+        return obj
+
+    with translation.override(language):
+        return resolve(result)
+
+
+def normalize_result_object(result):
+    """
+    resolve non-serializable objects like lazy translation strings and OrderedDict. nodes
+    that need no coercion are retained, i.e. only containers on the way to a coerced node
+    are copied. the input is not modified, as parts of it may be shared (e.g. settings).
+    """
+    normalizer = _get_normalizer(type(result))
+    return result if normalizer is None else normalizer(result)
+
+
+def _normalize_dict(obj):
+    changes = None
+    for key, value in obj.items():
+        normalizer = _get_normalizer(type(value))
+        if normalizer is None:
+            continue
+        normalized = normalizer(value)
+        if normalized is not value:
+            if changes is None:
+                changes = {}
+            changes[key] = normalized
+    return obj if changes is None else {**obj, **changes}
+
+
+def _normalize_list(obj):
+    changes = None
+    for index, value in enumerate(obj):
+        normalizer = _get_normalizer(type(value))
+        if normalizer is None:
+            continue
+        normalized = normalizer(value)
+        if normalized is not value:
+            if changes is None:
+                changes = list(obj)
+            changes[index] = normalized
+    return obj if changes is None else changes
+
+
+def _normalize_dict_subclass(obj):
+    normalized = _normalize_dict(obj)
+    return dict(normalized) if normalized is obj else normalized
+
+
+def _normalize_list_subclass(obj):
+    normalized = _normalize_list(obj)
+    return list(normalized) if normalized is obj else normalized
+
+
+# normalizer per type. None for types that need no normalization. extended on first
+# encounter of a type, so that subclass checks are only done once per type.
+_NORMALIZERS: Dict[type, Optional[Callable[[Any], Any]]] = {
+    dict: _normalize_dict,
+    list: _normalize_list,
+    str: None,
+    int: None,
+    float: None,
+    bool: None,
+    type(None): None,
+}
+
+
+def _get_normalizer(cls: type) -> Optional[Callable[[Any], Any]]:
+    try:
+        return _NORMALIZERS[cls]
+    except KeyError:
+        pass
+    normalizer: Optional[Callable[[Any], Any]]
+    if issubclass(cls, dict):
+        normalizer = _normalize_dict_subclass
+    elif issubclass(cls, (list, tuple)):
+        normalizer = _normalize_list_subclass
+    elif issubclass(cls, Promise):
+        normalizer = str
+    else:
+        # coerce basic sub types
+        normalizer = next((t for t in (bool, int, float, str) if issubclass(cls, t)), None)
+    _NORMALIZERS[cls] = normalizer
+    return normalizer
+
+
 def sanitize_result_object(result):
     # warn about and resolve operationId collisions with suffixes
     operations = defaultdict(list)
@@ -1259,22 +1709,51 @@ def camelize_operation(path, operation):
     return path, operation
 
 
+_MOCK_REQUEST_PROTOTYPES: Dict[str, Tuple[APIRequestFactory, Dict[str, Any]]] = {}
+
+
+def _get_mock_request_prototype(method, original_request):
+    """
+    META of a mocked request apart from its path, which is the same for all endpoints.
+    Built once per method and original request, as the request factory is rather slow.
+    """
+    if original_request:
+        prototypes = original_request.__dict__.setdefault('_spectacular_mock_request_prototypes', {})
+    else:
+        prototypes = _MOCK_REQUEST_PROTOTYPES
+
+    if method not in prototypes:
+        factory = APIRequestFactory()
+        meta = getattr(factory, method.lower())(path='/').META
+        if original_request:
+            # ignore headers related to authorization as it is handled in build_mock_request.
+            # also ignore ACCEPT as the MIME type refers to SpectacularAPIView and the
+            # version (if available) has already been processed by SpectacularAPIView.
+            meta.update({
+                name: value for name, value in original_request.META.items()
+                if name.startswith('HTTP_')
+                and name not in ['HTTP_ACCEPT', 'HTTP_COOKIE', 'HTTP_AUTHORIZATION']
+            })
+        prototypes[method] = (factory, meta)
+    return prototypes[method]
+
+
 def build_mock_request(method, path, view, original_request, **kwargs):
     """ build a mocked request and use original request as reference if available """
-    request = getattr(APIRequestFactory(), method.lower())(path=path)
+    factory, meta = _get_mock_request_prototype(method, original_request)
+    # equivalent to the request factory, but only the path-dependent parts are computed
+    parsed = urllib.parse.urlsplit(str(path))
+    request = WSGIRequest({
+        **meta,
+        'PATH_INFO': factory._get_path(parsed),
+        'QUERY_STRING': parsed.query.encode().decode('iso-8859-1'),
+        'wsgi.input': FakePayload(b''),
+    })
+    request._dont_enforce_csrf_checks = not factory.enforce_csrf_checks
     request = view.initialize_request(request)
     if original_request:
         request.user = original_request.user
         request.auth = original_request.auth
-        # ignore headers related to authorization as it has been handled above.
-        # also ignore ACCEPT as the MIME type refers to SpectacularAPIView and the
-        # version (if available) has already been processed by SpectacularAPIView.
-        for name, value in original_request.META.items():
-            if not name.startswith('HTTP_'):
-                continue
-            if name in ['HTTP_ACCEPT', 'HTTP_COOKIE', 'HTTP_AUTHORIZATION']:
-                continue
-            request.META[name] = value
     return request
 
 
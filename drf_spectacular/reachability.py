@@ -0,0 +1,133 @@
+"""
+Reachability of components within a generated schema. The ``$ref`` graph is indexed once
+and then answers which components are used by an operation, which ones are used by a set
+of operations and which ones are not used at all.
+"""
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# (component type, component name), e.g. ('schemas', 'User')
+ComponentKey = Tuple[str, str]
+# (path, method) as found in the schema, e.g. ('/users/', 'get')
+OperationKey = Tuple[str, str]
+
+_COMPONENTS_PREFIX = '#/components/'
+_OPERATION_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+
+def _parse_ref(ref: Any) -> Optional[ComponentKey]:
+    if not isinstance(ref, str) or not ref.startswith(_COMPONENTS_PREFIX):
+        return None
+    component_type, _, name = ref[len(_COMPONENTS_PREFIX):].partition('/')
+    return component_type, name.replace('~1', '/').replace('~0', '~')
+
+
+def _collect_references(obj: Any) -> Set[ComponentKey]:
+    """
+    Components directly referenced by obj. Besides ``$ref``, this includes discriminator
+    mappings and security requirements, which reference security schemes by name.
+    """
+    references = set()
+    pending = [obj]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == '$ref':
+                    references.add(_parse_ref(value))
+                elif key == 'example':
+                    continue  # literal data that may look like a reference
+                elif key == 'discriminator' and isinstance(value, dict):
+                    references.update(_parse_ref(v) for v in (value.get('mapping') or {}).values())
+                elif key == 'security' and isinstance(value, list):
+                    for requirement in value:
+                        references.update(('securitySchemes', name) for name in requirement or {})
+                elif isinstance(value, (dict, list, tuple)):
+                    pending.append(value)
+        elif isinstance(node, (list, tuple)):
+            pending.extend(node)
+    references.discard(None)  # type: ignore[arg-type]
+    return references
+
+
+class ReferenceIndex:
+    """
+    Index of the references between the components and operations of a schema. Dangling
+    references are ignored. The index reflects the schema at construction time and is not
+    updated on modification.
+    """
+    def __init__(self, result: Dict[str, Any]):
+        components = result.get('components') or {}
+        self.component_keys: List[ComponentKey] = [
+            (component_type, name) for component_type, objects in components.items() for name in objects
+        ]
+        known = set(self.component_keys)
+        self.component_references: Dict[ComponentKey, FrozenSet[ComponentKey]] = {
+            key: frozenset(_collect_references(components[key[0]][key[1]]) & known) for key in self.component_keys
+        }
+        self.operation_references: Dict[OperationKey, FrozenSet[ComponentKey]] = {}
+        for path, path_item in (result.get('paths') or {}).items():
+            # path level parameters and the like apply to all operations of the path
+            shared = _collect_references({k: v for k, v in path_item.items() if k not in _OPERATION_METHODS})
+            for method in _OPERATION_METHODS:
+                if method in path_item:
+                    references = shared | _collect_references(path_item[method])
+                    self.operation_references[path, method] = frozenset(references & known)
+        # references from everything else, e.g. webhooks or global security requirements
+        self.root_references: FrozenSet[ComponentKey] = frozenset(known & _collect_references(
+            {key: value for key, value in result.items() if key not in ('paths', 'components')}
+        ))
+        self._closures: Dict[ComponentKey, FrozenSet[ComponentKey]] = {}
+
+    def get_component_closure(self, key: ComponentKey) -> FrozenSet[ComponentKey]:
+        """ the component and all components it references, directly or indirectly """
+        if key not in self._closures:
+            closure = {key}
+            pending = [key]
+            while pending:
+                for reference in self.component_references[pending.pop()]:
+                    if reference in self._closures:
+                        closure |= self._closures[reference]
+                    elif reference not in closure:
+                        closure.add(reference)
+                        pending.append(reference)
+            self._closures[key] = frozenset(closure)
+        return self._closures[key]
+
+    def get_closure(self, keys: Iterable[ComponentKey]) -> Set[ComponentKey]:
+        closure: Set[ComponentKey] = set()
+        for key in keys:
+            if key not in closure:
+                closure |= self.get_component_closure(key)
+        return closure
+
+    def get_operation_components(self, path: str, method: str) -> Set[ComponentKey]:
+        """ components required by a single operation """
+        return self.get_closure(self.operation_references[path, method.lower()])
+
+    def get_reachable_components(self, operations: Optional[Iterable[OperationKey]] = None) -> Set[ComponentKey]:
+        """
+        Components required by the given operations (all operations by default) and by
+        the parts of the schema outside of paths and components.
+        """
+        if operations is None:
+            operations = self.operation_references
+        roots = set(self.root_references)
+        for path, method in operations:
+            roots |= self.operation_references[path, method.lower()]
+        return self.get_closure(roots)
+
+    def get_unreachable_components(self, operations: Optional[Iterable[OperationKey]] = None) -> List[ComponentKey]:
+        """ components not required by the given operations in order of the schema """
+        reachable = self.get_reachable_components(operations)
+        return [key for key in self.component_keys if key not in reachable]
+
+    def prune_components(
+        self, components: Dict[str, Dict[str, Any]], operations: Optional[Iterable[OperationKey]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """ copy of the schema's components without the unreachable ones """
+        reachable = self.get_reachable_components(operations)
+        pruned = {
+            component_type: {name: obj for name, obj in objects.items() if (component_type, name) in reachable}
+            for component_type, objects in components.items()
+        }
+        return {component_type: objects for component_type, objects in pruned.items() if objects}
@@ -1,3 +1,5 @@
+import functools
+import importlib
 from collections import OrderedDict
 from datetime import time, timedelta
 from decimal import Decimal
@@ -5,66 +7,147 @@ from uuid import UUID
 
 import yaml
 from django.utils.safestring import SafeString
+from rest_framework.compat import INDENT_SEPARATORS, LONG_SEPARATORS, SHORT_SEPARATORS
 from rest_framework.exceptions import ErrorDetail
 from rest_framework.renderers import BaseRenderer, JSONRenderer
 
+from drf_spectacular.settings import spectacular_settings
+
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+
+
+class OpenApiYamlDumper(_SafeDumper):  # type: ignore[valid-type,misc]
+    """ SafeDumper (libyaml-backed if available) with representers for common schema values """
+    # disable yaml advanced feature 'alias' for clean, portable, and readable output
+    def ignore_aliases(self, data):
+        return True
+
+
+def error_detail_representer(dumper, data):
+    return dumper.represent_dict({'string': str(data), 'code': data.code})
+
+
+def multiline_str_representer(dumper, data):
+    scalar = dumper.represent_str(data)
+    scalar.style = '|' if '\n' in data else None
+    return scalar
+
+
+def decimal_representer(dumper, data):
+    # prevent emitting "!! float" tags on fractionless decimals
+    value = f'{data:f}'
+    if '.' in value:
+        return dumper.represent_scalar('tag:yaml.org,2002:float', value)
+    else:
+        return dumper.represent_scalar('tag:yaml.org,2002:int', value)
+
+
+def timedelta_representer(dumper, data):
+    return dumper.represent_str(str(data.total_seconds()))
+
+
+def time_representer(dumper, data):
+    return dumper.represent_str(data.isoformat())
+
+
+def uuid_representer(dumper, data):
+    return dumper.represent_str(str(data))
+
+
+def safestring_representer(dumper, data):
+    # libyaml only accepts exact str instances. SafeString.__str__ returns itself.
+    return dumper.represent_str(str.__str__(data))
+
+
+def ordereddict_representer(dumper, data):
+    return dumper.represent_dict(dict(data))
+
+
+OpenApiYamlDumper.add_representer(ErrorDetail, error_detail_representer)
+OpenApiYamlDumper.add_representer(str, multiline_str_representer)
+OpenApiYamlDumper.add_representer(Decimal, decimal_representer)
+OpenApiYamlDumper.add_representer(timedelta, timedelta_representer)
+OpenApiYamlDumper.add_representer(time, time_representer)
+OpenApiYamlDumper.add_representer(UUID, uuid_representer)
+OpenApiYamlDumper.add_representer(SafeString, safestring_representer)
+OpenApiYamlDumper.add_representer(OrderedDict, ordereddict_representer)
+
+
+def _join_chunks(chunks, chunk_size):
+    """ group many small strings into utf-8 encoded chunks of at least chunk_size """
+    buffer, buffer_size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffer_size += len(chunk)
+        if buffer_size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, buffer_size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+@functools.lru_cache()
+def get_json_backend(name: str):
+    """ load the JSON library for OpenApiJsonRenderer. None for the standard library. """
+    for candidate in (['orjson', 'ujson'] if name == 'auto' else [name]):
+        if candidate == 'json':
+            return None
+        try:
+            return importlib.import_module(candidate)
+        except ImportError:
+            pass
+    return None
+
 
 class OpenApiYamlRenderer(BaseRenderer):
     media_type = 'application/vnd.oai.openapi'
     format = 'yaml'
+    dumper_class = OpenApiYamlDumper
+    chunk_size = 64 * 1024
+    # nesting depth up to which mappings are dumped entry by entry in render_stream(),
+    # e.g. paths > path or components > schemas > component.
+    stream_depth = 3
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
-        # disable yaml advanced feature 'alias' for clean, portable, and readable output
-        class Dumper(yaml.SafeDumper):
-            def ignore_aliases(self, data):
-                return True
-
-        def error_detail_representer(dumper, data):
-            return dumper.represent_dict({'string': str(data), 'code': data.code})
-        Dumper.add_representer(ErrorDetail, error_detail_representer)
-
-        def multiline_str_representer(dumper, data):
-            scalar = dumper.represent_str(data)
-            scalar.style = '|' if '\n' in data else None
-            return scalar
-        Dumper.add_representer(str, multiline_str_representer)
-
-        def decimal_representer(dumper, data):
-            # prevent emitting "!! float" tags on fractionless decimals
-            value = f'{data:f}'
-            if '.' in value:
-                return dumper.represent_scalar('tag:yaml.org,2002:float', value)
-            else:
-                return dumper.represent_scalar('tag:yaml.org,2002:int', value)
-        Dumper.add_representer(Decimal, decimal_representer)
-
-        def timedelta_representer(dumper, data):
-            return dumper.represent_str(str(data.total_seconds()))
-        Dumper.add_representer(timedelta, timedelta_representer)
-
-        def time_representer(dumper, data):
-            return dumper.represent_str(data.isoformat())
-        Dumper.add_representer(time, time_representer)
-
-        def uuid_representer(dumper, data):
-            return dumper.represent_str(str(data))
-        Dumper.add_representer(UUID, uuid_representer)
-
-        def safestring_representer(dumper, data):
-            return dumper.represent_str(data)
-        Dumper.add_representer(SafeString, safestring_representer)
-
-        def ordereddict_representer(dumper, data):
-            return dumper.represent_dict(dict(data))
-        Dumper.add_representer(OrderedDict, ordereddict_representer)
+        return self._dump(data).encode('utf-8')
 
+    def render_stream(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render the same document as render() as a sequence of byte chunks. Nested mappings
+        are dumped entry by entry, so that the whole document is never materialized.
+        """
+        return _join_chunks(self._iter_yaml([], data, self.stream_depth, 0), self.chunk_size)
+
+    def _dump(self, data):
         return yaml.dump(
             data,
             default_flow_style=False,
             sort_keys=False,
             allow_unicode=True,
-            Dumper=Dumper
-        ).encode('utf-8')
+            Dumper=self.dumper_class
+        )
+
+    def _iter_yaml(self, keys, value, depth, skip_lines):
+        """
+        Dump value nested under keys. The header lines of ancestors that were already
+        emitted with a previous sibling are skipped. Only non-empty mappings with simple
+        keys are split, as only those have a single header line in block style.
+        """
+        if depth and isinstance(value, dict) and value and all(self._is_simple_key(k) for k in value):
+            for i, (key, item) in enumerate(value.items()):
+                yield from self._iter_yaml(keys + [key], item, depth - 1, skip_lines if i == 0 else len(keys))
+        else:
+            for key in reversed(keys):
+                value = {key: value}
+            output = self._dump(value)
+            yield output.split('\n', skip_lines)[skip_lines] if skip_lines else output
+
+    def _is_simple_key(self, key):
+        # yaml emits keys longer than 128 chars as complex keys spanning multiple lines
+        return isinstance(key, str) and len(key) < 100 and '\n' not in key
 
 
 class OpenApiYamlRenderer2(OpenApiYamlRenderer):
@@ -73,9 +156,67 @@ class OpenApiYamlRenderer2(OpenApiYamlRenderer):
 
 class OpenApiJsonRenderer(JSONRenderer):
     media_type = 'application/vnd.oai.openapi+json'
+    chunk_size = 64 * 1024
 
     def get_indent(self, accepted_media_type, renderer_context):
-        return super().get_indent(accepted_media_type, renderer_context) or 4
+        indent = super().get_indent(accepted_media_type, renderer_context)
+        return spectacular_settings.JSON_RENDERER_INDENT if indent is None else indent
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        backend = get_json_backend(spectacular_settings.JSON_RENDERER_BACKEND)
+        if backend is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        # types not natively supported by the backend are handled like in the default encoder
+        default = self.encoder_class().default
+        if backend.__name__ == 'orjson':
+            ret = backend.dumps(
+                data,
+                default=default,
+                option=(
+                    backend.OPT_NON_STR_KEYS
+                    | backend.OPT_PASSTHROUGH_DATETIME
+                    | backend.OPT_PASSTHROUGH_DATACLASS
+                    | (backend.OPT_INDENT_2 if indent else 0)
+                ),
+            )
+        else:
+            ret = backend.dumps(
+                data,
+                default=default,
+                indent=indent or 0,
+                ensure_ascii=self.ensure_ascii,
+                escape_forward_slashes=False,
+            ).encode()
+        # escape like the default renderer to output JSON that is a strict javascript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+    def render_stream(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render the same document as render() as a sequence of byte chunks. Only the standard
+        library encoder is streamed. Other JSON_RENDERER_BACKEND libraries cannot encode
+        incrementally and render the document in a single chunk.
+        """
+        if get_json_backend(spectacular_settings.JSON_RENDERER_BACKEND) is not None:
+            return iter([self.render(data, accepted_media_type, renderer_context)])
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None:
+            separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        else:
+            separators = INDENT_SEPARATORS
+        encoder = self.encoder_class(
+            indent=indent,
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=separators,
+        )
+        chunks = (
+            chunk.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+            for chunk in encoder.iterencode(data)
+        )
+        return _join_chunks(chunks, self.chunk_size)
 
 
 class OpenApiJsonRenderer2(OpenApiJsonRenderer):
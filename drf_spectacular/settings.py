@@ -36,6 +36,16 @@ SPECTACULAR_DEFAULTS: Dict[str, Any] = {
     'COMPONENT_SPLIT_REQUEST': False,
     # Aid client generator targets that have trouble with read-only properties.
     'COMPONENT_NO_READ_ONLY_REQUIRED': False,
+    # Number of worker processes used to generate operations in parallel. Endpoints are
+    # processed in forked workers and merged in order, which yields the same schema as the
+    # serial generation. Requires the "fork" start method (not available on Windows) and
+    # falls back to serial generation if results cannot be transferred. None disables it.
+    'GENERATION_WORKERS': None,
+    # Cache the enumerated, preprocessed and sorted endpoints per enumerator class and urlpatterns
+    # object and reuse them for subsequent schema generations (e.g. requests to SpectacularAPIView or
+    # other API versions). Only enable this if urlpatterns are not modified at runtime and
+    # PREPROCESSING_HOOKS do not depend on anything but the endpoints.
+    'ENUMERATION_CACHE': False,
 
     # Adds "minLength: 1" to fields that do not allow blank strings. Deactivated
     # by default because serializers do not strictly enforce this on responses and
@@ -59,6 +69,48 @@ SPECTACULAR_DEFAULTS: Dict[str, Any] = {
     'SERVE_PERMISSIONS': ['rest_framework.permissions.AllowAny'],
     # None will default to DRF's AUTHENTICATION_CLASSES
     'SERVE_AUTHENTICATION': None,
+    # Cache the rendered schema of SpectacularAPIView in the Django cache with the given
+    # alias (e.g. 'default'). A shared backend (Redis, Memcached, ...) allows all workers to
+    # serve the same copy. Entries are keyed on urlconf, version, language, public/user scope,
+    # custom_settings and format. None disables caching.
+    'SERVE_CACHE': None,
+    # Timeout in seconds for cached schemas. None keeps entries until invalidated, either
+    # through drf_spectacular.caching.invalidate_schema_cache() or by changing the prefix.
+    'SERVE_CACHE_TIMEOUT': None,
+    # Prefix for all cache keys. Changing it (e.g. to a release identifier) invalidates
+    # all previously cached schemas.
+    'SERVE_CACHE_KEY_PREFIX': 'drf_spectacular',
+    # List of languages (e.g. ['en', 'de']) that are generated together when a schema in one
+    # of them is not cached yet. The introspection happens only once and only the translations
+    # are resolved per language, which is considerably faster than separate generations.
+    'SERVE_CACHE_LANGUAGES': None,
+    # Emit an ETag (and Last-Modified for cached and prebuilt schemas) from SpectacularAPIView and answer
+    # conditional requests (If-None-Match/If-Modified-Since) with "304 Not Modified".
+    'SERVE_CONDITIONAL_GET': True,
+    # Cache-Control header for SpectacularAPIView responses. Either a raw header string like
+    # 'no-cache' or a dict of directives, e.g. {'public': True, 'max_age': 3600}. None omits it.
+    'SERVE_CACHE_CONTROL': None,
+    # Serve a schema file generated at build time (e.g. via "./manage.py spectacular --file")
+    # instead of generating the schema on request. Either a path or a dict mapping a version,
+    # a (version, lang) tuple or None (fallback) to a path. If the negotiated format differs,
+    # a .json/.yaml/.yml sibling is preferred over conversion. Pre-compressed .br/.gz siblings
+    # are served to clients accepting those encodings. None disables this feature. Only views
+    # created with SpectacularAPIView.as_view(serve_prebuilt=True) serve the artifact, as it
+    # does not reflect a view's urlconf, custom settings or the requesting user.
+    'SERVE_PREBUILT_SCHEMA': None,
+    # Stream freshly generated schemas from SpectacularAPIView in chunks instead of rendering
+    # the whole document into memory first. Streamed responses carry no ETag and therefore
+    # do not participate in conditional requests.
+    'SERVE_STREAMING': False,
+    # JSON library used by OpenApiJsonRenderer. 'json' is DRF's standard library based
+    # encoder. 'orjson' and 'ujson' are considerably faster for large schemas, but need to be
+    # installed separately. 'auto' uses the fastest one available. Missing libraries fall back
+    # to 'json'. Note that orjson only supports an indentation of 2. Only 'json' renders JSON
+    # in chunks, e.g. for SERVE_STREAMING or the spectacular command.
+    'JSON_RENDERER_BACKEND': 'json',
+    # Indentation of OpenApiJsonRenderer output. None renders compact JSON. An "indent"
+    # parameter in the requested media type takes precedence.
+    'JSON_RENDERER_INDENT': 4,
 
     # Dictionary of general configuration to pass to the SwaggerUI({ ... })
     # https://swagger.io/docs/open-source-tools/swagger-ui/usage/configuration/
@@ -97,9 +149,17 @@ SPECTACULAR_DEFAULTS: Dict[str, Any] = {
 
     # Postprocessing functions that run at the end of schema generation.
     # must satisfy interface result = hook(generator, request, public, result)
+    # Consecutive hooks decorated with drf_spectacular.traversal.visitor_hook share
+    # their traversals of the schema, unless a hook declares post_walk=True.
     'POSTPROCESSING_HOOKS': [
         'drf_spectacular.hooks.postprocess_schema_enums'
     ],
+    # Inline schemas that occur at least DEDUPLICATION_MIN_COUNT times and consist of at least
+    # DEDUPLICATION_MIN_SIZE keys and items (nested ones included) are moved to a shared component.
+    # Only takes effect if 'drf_spectacular.hooks.postprocess_schema_deduplication' is added
+    # to POSTPROCESSING_HOOKS.
+    'DEDUPLICATION_MIN_COUNT': 2,
+    'DEDUPLICATION_MIN_SIZE': 8,
 
     # Preprocessing functions that run before schema generation.
     # must satisfy interface result = hook(endpoints=result) where result
@@ -0,0 +1,131 @@
+"""
+Single-pass traversal of generated schemas for postprocessing. Hooks register visitors,
+which are dispatched by the dict keys they are interested in. Consecutive visitor hooks
+share their traversals, so the schema is walked once per phase instead of once per hook.
+"""
+import contextlib
+import functools
+from collections import defaultdict
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from drf_spectacular.drainage import GENERATION_PROFILER
+
+_PathType = List[Union[str, int]]
+
+
+class SchemaVisitor:
+    """
+    ``visit(node, key, path)`` is called for every dict node that contains one of ``keys``
+    (once per contained key), before the node's children are traversed. ``path`` is the
+    list of keys and indices leading to the node and must not be retained. Visitors may
+    modify the visited node and its children in place, but not its ancestors.
+    """
+    keys: Tuple[str, ...] = ()
+
+    def __init__(self, *keys: str, visit: Optional[Callable[[dict, str, _PathType], None]] = None):
+        if keys:
+            self.keys = keys
+        if visit is not None:
+            self.visit = visit  # type: ignore
+
+    def visit(self, node: dict, key: str, path: _PathType) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+
+def walk_schema(schema: Any, visitors: Iterable[SchemaVisitor]) -> None:
+    """ traverse the schema once and dispatch dict nodes to the visitors by key """
+    dispatch = defaultdict(list)
+    for visitor in visitors:
+        for key in visitor.keys:
+            dispatch[key].append(visitor)
+    dispatch_items = list(dispatch.items())
+    path: _PathType = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, key_visitors in dispatch_items:
+                if key in node:
+                    for visitor in key_visitors:
+                        visitor.visit(node, key, path)
+            children = node.items()
+        else:
+            children = enumerate(node)
+        for key, child in children:
+            if isinstance(child, (dict, list, tuple)):
+                path.append(key)
+                walk(child)
+                path.pop()
+
+    if isinstance(schema, (dict, list, tuple)):
+        walk(schema)
+
+
+def visitor_hook(func=None, *, phases=1, post_walk=False):
+    """
+    Turn a generator function into a postprocessing hook. The generator function receives
+    the hook arguments and yields a list of visitors for each of its ``phases``, i.e. the
+    traversals it requires. Code between the yields runs after the previous traversal has
+    finished. The result must be modified in place. Called like any other hook, the
+    phases of the hook run on their own. Hooks that modify the result after their last
+    traversal must declare ``post_walk``, so following hooks are not traversed along.
+    """
+    if func is None:
+        return functools.partial(visitor_hook, phases=phases, post_walk=post_walk)
+
+    @functools.wraps(func)
+    def hook(result, generator=None, **kwargs):
+        return run_visitor_hooks([hook], result, generator=generator, **kwargs)
+
+    hook.iter_phases = func  # type: ignore[attr-defined]
+    hook.phases = phases  # type: ignore[attr-defined]
+    hook.post_walk = post_walk  # type: ignore[attr-defined]
+    return hook
+
+
+def is_visitor_hook(hook) -> bool:
+    return hasattr(hook, 'iter_phases')
+
+
+def run_visitor_hooks(hooks, result, hook_timer=None, **kwargs):
+    """
+    Run consecutive visitor hooks with shared traversals. The last phase of a hook is
+    traversed together with all following single phase hooks, so hooks still observe the
+    modifications of preceding hooks. Visitors of a shared traversal are dispatched in the
+    order of their hooks for each node. A hook declaring ``post_walk`` ends its batch, as
+    its modifications after the last traversal must be visible to the following hooks.
+    ``hook_timer`` optionally returns a context manager measuring a hook's own work.
+    """
+    hook_timer = hook_timer or (lambda hook: contextlib.nullcontext())
+
+    batches: List[list] = []
+    for hook in hooks:
+        if batches and hook.phases == 1 and not batches[-1][-1].post_walk:
+            batches[-1].append(hook)
+        else:
+            batches.append([hook])
+
+    for first_hook, *other_hooks in batches:
+        first_phases = first_hook.iter_phases(result=result, **kwargs)
+        for _ in range(first_hook.phases - 1):
+            with hook_timer(first_hook):
+                visitors = next(first_phases)
+            _timed_walk(result, visitors)
+
+        batch = [(first_hook, first_phases)]
+        batch += [(hook, hook.iter_phases(result=result, **kwargs)) for hook in other_hooks]
+        visitors = []
+        for hook, phases in batch:
+            with hook_timer(hook):
+                visitors.extend(next(phases))
+        _timed_walk(result, visitors)
+
+        for hook, phases in batch:
+            with hook_timer(hook):
+                surplus_phase = next(phases, None)
+            assert surplus_phase is None, f'visitor hook {hook} has more than {hook.phases} phases'
+    return result
+
+
+def _timed_walk(result, visitors):
+    with GENERATION_PROFILER.timer('phase', 'traversal'):
+        walk_schema(result, visitors)
@@ -1,13 +1,17 @@
+import functools
+import hashlib
 import json
 import os
 
 import jsonschema
+from jsonschema.exceptions import best_match
 
 
-def validate_schema(api_schema):
+@functools.lru_cache()
+def get_validator(oas_version):
     """
-    Validate generated API schema against OpenAPI 3.0.X json schema specification.
-    Note: On conflict, the written specification always wins over the json schema.
+    Return the validator for the OpenAPI 3.0.X or 3.1.X json schema specification. The
+    specification is loaded and checked against its metaschema only once per version.
 
     OpenApi3 schema specification taken from:
 
@@ -17,9 +21,9 @@ def validate_schema(api_schema):
     https://github.com/OAI/OpenAPI-Specification/blob/main/schemas/v3.1/schema.json
     https://github.com/OAI/OpenAPI-Specification/blob/9dff244e5708fbe16e768738f4f17cf3fddf4066/schemas/v3.1/schema.json
     """
-    if api_schema['openapi'].startswith("3.0"):
+    if oas_version.startswith("3.0"):
         schema_spec_path = os.path.join(os.path.dirname(__file__), 'openapi_3_0_schema.json')
-    elif api_schema['openapi'].startswith("3.1"):
+    elif oas_version.startswith("3.1"):
         schema_spec_path = os.path.join(os.path.dirname(__file__), 'openapi_3_1_schema.json')
     else:
         raise RuntimeError('No validation specification available')  # pragma: no cover
@@ -27,8 +31,136 @@ def validate_schema(api_schema):
     with open(schema_spec_path) as fh:
         openapi3_schema_spec = json.load(fh)
 
-    # coerce any remnants of objects to basic types
+    validator_class = jsonschema.validators.validator_for(openapi3_schema_spec)
+    validator_class.check_schema(openapi3_schema_spec)
+    return validator_class(openapi3_schema_spec)
+
+
+def normalize_schema(api_schema):
+    """
+    Coerce any remnants of objects (e.g. lazy strings, tuples, decimals) to the basic types
+    a JSON round-trip through OpenApiJsonRenderer would yield, without the round-trip.
+    """
     from drf_spectacular.renderers import OpenApiJsonRenderer
-    api_schema = json.loads(OpenApiJsonRenderer().render(api_schema))
+    return _normalize(api_schema, OpenApiJsonRenderer.encoder_class().default)
+
+
+def _normalize(obj, default):
+    if isinstance(obj, dict):
+        return {_normalize_key(key): _normalize(value, default) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_normalize(item, default) for item in obj]
+    elif obj is None or isinstance(obj, (str, int, float)):
+        return obj
+    else:
+        return _normalize(default(obj), default)
+
+
+def _normalize_key(key):
+    if isinstance(key, str):
+        return key
+    elif key is None or isinstance(key, bool):
+        return json.dumps(key)
+    return str(key)
+
+
+def iter_schema_errors(api_schema):
+    """
+    Lazily yield the validation errors of the generated API schema. The document without
+    paths is validated first, followed by each path on its own. This allows to stop at the
+    first invalid path and attributes errors to their path.
+    """
+    api_schema = normalize_schema(api_schema)
+    validator = get_validator(api_schema['openapi'])
+    paths = api_schema.get('paths') or {}
+
+    yield from validator.iter_errors({**api_schema, 'paths': {}})
+    for path, path_item in paths.items():
+        # minimal valid document, so that all errors stem from the path
+        yield from validator.iter_errors({
+            'openapi': api_schema['openapi'], 'info': {'title': '', 'version': ''}, 'paths': {path: path_item}
+        })
+
+
+def validate_schema(api_schema):
+    """
+    Validate generated API schema against OpenAPI 3.0.X json schema specification.
+    Note: On conflict, the written specification always wins over the json schema.
+    """
+    validator = get_validator(api_schema['openapi'])
+    error = best_match(validator.iter_errors(normalize_schema(api_schema)))
+    if error is not None:
+        raise error
+
+
+# hashes of document fragments that passed validation (see validate_schema_components)
+_VALID_FRAGMENTS = {}
+_VALID_FRAGMENTS_SIZE = 100000
+
+
+def _iter_fragments(api_schema, generator):
+    """
+    Split the document into minimal valid documents containing a single component or
+    operation. Yields (location, source object or None, fragment).
+    """
+    from drf_spectacular.plumbing import ComponentIdentity, get_class, is_field, is_serializer
+
+    openapi, info = api_schema['openapi'], {'title': '', 'version': ''}
+    registry = generator.registry._components if generator else {}
+    operation_views = generator.operation_views if generator else {}
+
+    yield 'document', None, {**api_schema, 'paths': {}, 'components': {}}
+
+    for component_type, components in (api_schema.get('components') or {}).items():
+        for name, component_schema in components.items():
+            component = registry.get((name, component_type))
+            source = component.object if component else None
+            if isinstance(source, ComponentIdentity):
+                source = source.obj
+            source = get_class(source) if is_serializer(source) or is_field(source) else None
+            yield f'{component_type} component "{name}"', source, {
+                'openapi': openapi, 'info': info, 'paths': {},
+                'components': {component_type: {name: component_schema}},
+            }
+
+    for path, path_item in (api_schema.get('paths') or {}).items():
+        for method, operation in path_item.items():
+            yield f'{method.upper()} {path}', operation_views.get((path, method)), {
+                'openapi': openapi, 'info': info, 'paths': {path: {method: operation}},
+            }
+
+
+def validate_schema_components(api_schema, generator=None):
+    """
+    Validate each component and operation of the generated API schema on its own. Fragments
+    that already passed validation are skipped based on their content hash. Errors are
+    emitted with the source location of the responsible serializer or view, if the
+    ``generator`` that produced the schema is given. Returns the list of validation errors.
+    """
+    from drf_spectacular.drainage import add_trace_message, error
+
+    api_schema = normalize_schema(api_schema)
+    validator = get_validator(api_schema['openapi'])
+    errors = []
 
-    jsonschema.validate(instance=api_schema, schema=openapi3_schema_spec)
+    for location, source, fragment in _iter_fragments(api_schema, generator):
+        fragment_hash = hashlib.sha256(json.dumps(fragment, sort_keys=True).encode()).hexdigest()
+        if fragment_hash in _VALID_FRAGMENTS:
+            continue
+        fragment_errors = list(validator.iter_errors(fragment))
+        if not fragment_errors:
+            if len(_VALID_FRAGMENTS) >= _VALID_FRAGMENTS_SIZE:
+                del _VALID_FRAGMENTS[next(iter(_VALID_FRAGMENTS))]
+            _VALID_FRAGMENTS[fragment_hash] = True
+            continue
+        # report the most relevant error per fragment, as errors of alternatives are verbose
+        e = best_match(fragment_errors)
+        pointer = '/'.join(str(part) for part in e.absolute_path)
+        msg = f'schema validation failed for {location} at "{pointer}": {e.message}'
+        if source is None:
+            error(msg)
+        else:
+            with add_trace_message(source):
+                error(msg)
+        errors.extend(fragment_errors)
+    return errors
@@ -1,20 +1,30 @@
+import hashlib
 import json
+import os
+import time
 from collections import namedtuple
 from importlib import import_module
 from typing import Any, Dict, List, Optional, Type
 
+import yaml
 from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.template.response import SimpleTemplateResponse
 from django.templatetags.static import static
 from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import RedirectView
+from rest_framework.exceptions import NotFound
 from rest_framework.renderers import TemplateHTMLRenderer
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.caching import build_schema_cache_key, get_schema_cache
+from drf_spectacular.generators import SLICE_BY_TAG, SchemaGenerator
 from drf_spectacular.plumbing import get_relative_url, set_query_parameters
 from drf_spectacular.renderers import (
     OpenApiJsonRenderer, OpenApiJsonRenderer2, OpenApiYamlRenderer, OpenApiYamlRenderer2,
@@ -41,6 +51,24 @@ else:
     AUTHENTICATION_CLASSES = api_settings.DEFAULT_AUTHENTICATION_CLASSES
 
 
+def _parse_accept_encoding(header):
+    """ mapping of the content codings in an Accept-Encoding header to their quality """
+    encodings = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            encodings[coding.lower()] = quality
+    return encodings
+
+
 class SpectacularAPIView(APIView):
     __doc__ = _("""
     OpenApi3 schema for this API. Format can be selected via content negotiation.
@@ -59,6 +87,7 @@ class SpectacularAPIView(APIView):
     api_version: Optional[str] = None
     custom_settings: Optional[Dict[str, Any]] = None
     patterns: Optional[List[Any]] = None
+    serve_prebuilt: bool = False
 
     @extend_schema(**SCHEMA_KWARGS)
     def get(self, request, *args, **kwargs):
@@ -87,12 +116,187 @@ class SpectacularAPIView(APIView):
         # version specified as parameter to the view always takes precedence. after
         # that we try to source version through the schema view's own versioning_class.
         version = self.api_version or request.version or self._get_version_parameter(request)
-        generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+        prebuilt_path = self._get_prebuilt_schema_path(version)
+        if prebuilt_path:
+            return self._get_prebuilt_schema_response(request, version, prebuilt_path)
+        schema_cache = get_schema_cache()
+        if schema_cache is not None:
+            return self._get_cached_schema_response(request, version, schema_cache)
+        if spectacular_settings.SERVE_STREAMING and hasattr(request.accepted_renderer, 'render_stream'):
+            return self._get_streaming_schema_response(request, version)
         return Response(
-            data=generator.get_schema(request=request, public=self.serve_public),
+            data=self._generate_schema(request, version),
             headers={"Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"'}
         )
 
+    def _get_generator(self, request, version):
+        return self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+
+    def _generate_schema(self, request, version):
+        generator = self._get_generator(request, version)
+        return generator.get_schema(request=request, public=self.serve_public)
+
+    def _get_schema_cache_key(self, request, version, schema_cache, lang, **parts):
+        return build_schema_cache_key(
+            schema_cache,
+            **parts,
+            view=self.__class__,
+            path=request.path,
+            urlconf=self.urlconf if isinstance(self.urlconf, str) else None,
+            version=version,
+            lang=lang,
+            public=self.serve_public,
+            user=None if self.serve_public else request.user.pk,
+            custom_settings=self.custom_settings,
+            media_type=request.accepted_media_type,
+        )
+
+    def _get_cached_schema_response(self, request, version, schema_cache):
+        renderer, media_type = request.accepted_renderer, request.accepted_media_type
+        lang = translation.get_language()
+        entry = schema_cache.get(self._get_schema_cache_key(request, version, schema_cache, lang))
+        if entry is None:
+            schemas = self._generate_cacheable_schemas(request, version, lang)
+            for schema_lang, schema in schemas.items():
+                content = renderer.render(schema, media_type, self.get_renderer_context())
+                schema_entry = {
+                    'content': content,
+                    'etag': self._get_etag(content),
+                    'last_modified': int(time.time()),
+                }
+                schema_cache.set(
+                    self._get_schema_cache_key(request, version, schema_cache, schema_lang),
+                    schema_entry,
+                    timeout=spectacular_settings.SERVE_CACHE_TIMEOUT,
+                )
+                if schema_lang == lang:
+                    entry = schema_entry
+
+        response = HttpResponse(content=entry['content'], content_type=self._get_content_type(renderer))
+        response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, version)}"'
+        if spectacular_settings.SERVE_CONDITIONAL_GET:
+            response['ETag'] = entry['etag']
+            response['Last-Modified'] = http_date(entry['last_modified'])
+        return response
+
+    def _generate_cacheable_schemas(self, request, version, lang):
+        """ schemas to populate the cache with on a miss, mapped by language """
+        languages = spectacular_settings.SERVE_CACHE_LANGUAGES
+        if settings.USE_I18N and languages and lang in languages:
+            # populate the cache for all languages with a single introspection pass
+            generator = self._get_generator(request, version)
+            return generator.get_translated_schemas(languages, request=request, public=self.serve_public)
+        return {lang: self._generate_schema(request, version)}
+
+    def _get_streaming_schema_response(self, request, version):
+        renderer, media_type = request.accepted_renderer, request.accepted_media_type
+        response = StreamingHttpResponse(
+            renderer.render_stream(
+                self._generate_schema(request, version), media_type, self.get_renderer_context()
+            ),
+            content_type=self._get_content_type(renderer),
+        )
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, version)}"'
+        return response
+
+    def _get_prebuilt_schema_path(self, version):
+        # the artifact cannot reflect per view urlconf, settings or users. views opt in explicitly.
+        prebuilt = spectacular_settings.SERVE_PREBUILT_SCHEMA if self.serve_prebuilt else None
+        if not prebuilt or isinstance(prebuilt, str):
+            return prebuilt
+        lang = translation.get_language()
+        for key in [(version, lang), version, None]:
+            if key in prebuilt:
+                return prebuilt[key]
+        return None
+
+    def _get_prebuilt_schema_response(self, request, version, path):
+        renderer, media_type = request.accepted_renderer, request.accepted_media_type
+        disposition = f'inline; filename="{self._get_filename(request, version)}"'
+        # prefer an artifact in the negotiated format, which may be a sibling of the given path
+        extensions = ['.json'] if renderer.format == 'json' else ['.yaml', '.yml']
+        candidates = [path] if os.path.splitext(path)[1] in extensions else []
+        candidates += [os.path.splitext(path)[0] + ext for ext in extensions]
+        artifact_path = next((c for c in candidates if os.path.isfile(c)), None)
+
+        if artifact_path is None:
+            # artifact only exists in the other format. convert instead of generating.
+            with open(path, 'rb') as fh:
+                data = yaml.load(fh, Loader=yaml.SafeLoader)
+            response = HttpResponse(
+                content=renderer.render(data, media_type, self.get_renderer_context()),
+                content_type=self._get_content_type(renderer),
+            )
+            response['Content-Disposition'] = disposition
+            return response
+
+        accepted_encodings = _parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding = None
+        for candidate_encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            quality = accepted_encodings.get(candidate_encoding, accepted_encodings.get('*', 0))
+            if quality > 0 and os.path.isfile(artifact_path + suffix):
+                artifact_path, encoding = artifact_path + suffix, candidate_encoding
+                break
+
+        stat = os.stat(artifact_path)
+        headers = {
+            'Content-Disposition': disposition,
+            **({'Content-Encoding': encoding} if encoding else {}),
+        }
+        if spectacular_settings.SERVE_CONDITIONAL_GET:
+            headers['ETag'] = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding or "identity"}')
+            headers['Last-Modified'] = http_date(stat.st_mtime)
+            # check preconditions before opening the file, as a 304 would discard it.
+            response = HttpResponse()
+            self._update_headers(response, headers)
+            conditional_response = get_conditional_response(
+                request, etag=headers['ETag'], last_modified=int(stat.st_mtime), response=response,
+            )
+            if conditional_response is not response:
+                return conditional_response
+
+        response = FileResponse(open(artifact_path, 'rb'), content_type=self._get_content_type(renderer))
+        self._update_headers(response, headers)
+        return response
+
+    def _update_headers(self, response, headers):
+        for name, value in headers.items():
+            response[name] = value
+        patch_vary_headers(response, ['Accept-Encoding'])
+
+    def _get_content_type(self, renderer):
+        # mimic what Response does with the renderer for pre-rendered content
+        if renderer.charset:
+            return f'{renderer.media_type}; charset={renderer.charset}'
+        return renderer.media_type
+
+    def _get_etag(self, content):
+        return quote_etag(hashlib.sha256(content).hexdigest())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304):
+            return response
+
+        cache_control = spectacular_settings.SERVE_CACHE_CONTROL
+        if isinstance(cache_control, dict):
+            patch_cache_control(response, **cache_control)
+        elif cache_control:
+            response['Cache-Control'] = cache_control
+
+        if not spectacular_settings.SERVE_CONDITIONAL_GET or response.status_code != 200:
+            return response
+        if not response.has_header('ETag') and not response.streaming:
+            if isinstance(response, SimpleTemplateResponse):
+                response.render()
+            response['ETag'] = self._get_etag(response.content)
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(response.get('Last-Modified')),
+            response=response,
+        )
+
     def _get_filename(self, request, version):
         return "{title}{version}.{suffix}".format(
             title=spectacular_settings.TITLE or 'schema',
@@ -115,6 +319,72 @@ class SpectacularJSONAPIView(SpectacularAPIView):
     renderer_classes = [OpenApiJsonRenderer, OpenApiJsonRenderer2]
 
 
+class SpectacularSlicedAPIView(SpectacularAPIView):
+    __doc__ = _("""
+    OpenApi3 schema for this API split into slices of operations. Without the "slice"
+    parameter, an index of all slices and their schema URLs is returned. A slice only
+    contains the components that are used by its operations.
+    """)  # type: ignore
+    # either "tag" or "path" (first path segment after the path prefix)
+    slice_by: str = SLICE_BY_TAG
+
+    def _get_schema_response(self, request):
+        if request.GET.get('slice') is None:
+            version = self.api_version or request.version or self._get_version_parameter(request)
+            schema_cache = get_schema_cache()
+            if schema_cache is not None:
+                return self._get_cached_schema_response(request, version, schema_cache)
+            return Response(data=self._get_slice_index(request, version))
+        return super()._get_schema_response(request)
+
+    def _generate_cacheable_schemas(self, request, version, lang):
+        if request.GET.get('slice') is None:
+            return {lang: self._get_slice_index(request, version)}
+        return super()._generate_cacheable_schemas(request, version, lang)
+
+    def _get_slice_index(self, request, version):
+        generator = self._get_generator(request, version)
+        return {
+            'urls': [
+                {
+                    'name': slice_name,
+                    'url': set_query_parameters(
+                        url=request.path,
+                        slice=slice_name,
+                        lang=request.GET.get('lang'),
+                        version=request.GET.get('version'),
+                    ),
+                }
+                for slice_name in generator.get_slices(request=request, public=self.serve_public)
+            ]
+        }
+
+    def _get_generator(self, request, version):
+        slice_name = request.GET.get('slice')
+        generator = self.generator_class(
+            urlconf=self.urlconf,
+            api_version=version,
+            patterns=self.patterns,
+            slice_by=self.slice_by,
+            slice_name=slice_name,
+        )
+        # only validated when generating, so cached slices are served without inspection.
+        # the endpoints inspected here are reused for the generation.
+        if slice_name is not None:
+            if slice_name not in generator.get_slices(request=request, public=self.serve_public):
+                raise NotFound(_('Unknown schema slice "{slice}".').format(slice=slice_name))
+        return generator
+
+    def _get_schema_cache_key(self, request, version, schema_cache, lang, **parts):
+        return super()._get_schema_cache_key(
+            request, version, schema_cache, lang, slice_by=self.slice_by, slice=request.GET.get('slice'), **parts
+        )
+
+    def _get_prebuilt_schema_path(self, version):
+        # prebuilt artifacts contain the whole schema
+        return None
+
+
 def _get_sidecar_url(filepath):
     return static(f'drf_spectacular_sidecar/{filepath}')
 
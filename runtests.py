@@ -12,7 +12,7 @@ PYTEST_ARGS = {
     'fast': ['tests', '-q'],
 }
 
-FLAKE8_ARGS = ['drf_spectacular', 'tests']
+FLAKE8_ARGS = ['drf_spectacular', 'tests', 'benchmarks']
 
 MYPY_ARGS = ['--config-file=tox.ini', 'drf_spectacular', 'tests']
 
@@ -1,3 +1,4 @@
+import json
 import tempfile
 from unittest import mock
 
@@ -7,6 +8,7 @@ from django.core import management
 from django.core.management import CommandError
 from django.core.management.base import SystemCheckError
 from django.urls import path
+from rest_framework import generics, serializers
 from rest_framework.decorators import api_view
 
 
@@ -19,6 +21,22 @@ def test_command_plain(capsys, clear_generator_settings):
     assert 'paths' in schema
 
 
+def test_command_json_renderer_backend(clear_generator_settings):
+    orjson = pytest.importorskip('orjson')
+
+    with tempfile.NamedTemporaryFile() as fh:
+        with mock.patch(
+            'drf_spectacular.settings.spectacular_settings.JSON_RENDERER_BACKEND', 'orjson'
+        ), mock.patch.object(orjson, 'dumps', side_effect=orjson.dumps) as dumps:
+            management.call_command('spectacular', '--format=openapi-json', '--file=' + fh.name)
+        output = fh.read()
+
+    assert dumps.call_count == 1
+    # orjson only supports an indentation of 2
+    assert output.startswith(b'{\n  "openapi"')
+    assert 'paths' in json.loads(output)
+
+
 def test_command_parameterized(clear_generator_settings):
     with tempfile.NamedTemporaryFile() as fh:
         management.call_command(
@@ -88,3 +106,69 @@ def test_command_check_fail(capsys):
     stdout = capsys.readouterr().err
     assert 'System check identified some issues' in stdout
     assert 'drf_spectacular.W002' in stdout
+
+
+class ProfileSerializer(serializers.Serializer):
+    field = serializers.CharField()
+
+
+class ProfileView(generics.RetrieveAPIView):
+    serializer_class = ProfileSerializer
+
+
+@mock.patch('tests.urls.urlpatterns', [path('profile/', ProfileView.as_view())])
+def test_command_profile(capsys, clear_generator_settings):
+    management.call_command('spectacular', '--profile')
+    stderr = capsys.readouterr().err
+    assert 'Time per phase:' in stderr
+    assert 'get_operation' in stderr
+    assert 'Slowest operations:' in stderr
+
+
+@mock.patch('tests.urls.urlpatterns', [path('profile/', ProfileView.as_view())])
+def test_command_profile_json(capsys, clear_generator_settings):
+    management.call_command('spectacular', '--profile=json', '--file=/dev/null')
+    report = json.loads(capsys.readouterr().err)
+    phases = {item['name']: item for item in report['timings']['phase']}
+    assert {'enumeration', 'create_view', 'mock_request', 'get_operation', 'registry_build'} <= set(phases)
+    assert report['timings']['view'][0]['name'] == 'tests.test_command.ProfileView'
+    assert report['timings']['hook'][0]['name'] == 'drf_spectacular.hooks.postprocess_schema_enums'
+    assert report['slowest']['operation'][0]['name'] == 'GET /profile/ (tests.test_command.ProfileView)'
+    assert report['slowest']['serializer'][0]['name'] == 'Profile (tests.test_command.ProfileSerializer)'
+
+
+@mock.patch('tests.urls.urlpatterns', [path('profile/', ProfileView.as_view())])
+def test_command_diff(capsys, clear_generator_settings, tmp_path):
+    management.call_command('spectacular', f'--file={tmp_path}/old.yml')
+    old_schema = yaml.load((tmp_path / 'old.yml').read_text(), Loader=yaml.SafeLoader)
+    old_schema['paths']['/profile/']['delete'] = old_schema['paths']['/profile/']['get']
+    old_schema['components']['schemas']['Profile']['properties']['removed'] = {'type': 'string'}
+    (tmp_path / 'old.json').write_text(json.dumps(old_schema))
+
+    management.call_command('spectacular', f'--diff={tmp_path}/old.json')
+    assert capsys.readouterr().out.splitlines() == [
+        'BREAKING: DELETE /profile/: operation removed',
+        'BREAKING: component "Profile" > removed: property removed',
+        '2 breaking and 0 non-breaking changes',
+    ]
+
+
+def test_command_diff_multiple_schemas(clear_generator_settings):
+    with pytest.raises(CommandError):
+        management.call_command('spectacular', '--diff=old.yml', '--all-versions', '--file=schema-{version}.yml')
+
+
+@mock.patch('tests.urls.urlpatterns', [path('profile/', ProfileView.as_view())])
+def test_command_validate_components(capsys, clear_generator_settings):
+    management.call_command('spectacular', '--validate=components', '--file=/dev/null')
+
+    def invalidate(result, **kwargs):
+        result['components']['schemas']['Profile']['type'] = 'invalid'
+        return result
+
+    with mock.patch('drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', [invalidate]):
+        with pytest.raises(CommandError):
+            management.call_command('spectacular', '--validate=components', '--file=/dev/null')
+    stderr = capsys.readouterr().err
+    assert 'tests/test_command.py:' in stderr
+    assert 'Error [ProfileSerializer]: schema validation failed for schemas component "Profile"' in stderr
@@ -0,0 +1,87 @@
+from rest_framework import generics, serializers
+
+from drf_spectacular.diff import BREAKING, NON_BREAKING, SchemaChange, diff_schemas
+from tests import generate_schema
+
+
+def test_diff_generated_schemas(no_warnings):
+    def build_old_schema():
+        class XSerializer(serializers.Serializer):
+            id = serializers.IntegerField(read_only=True)
+            kind = serializers.ChoiceField(choices=['a', 'b'])
+            comment = serializers.CharField(required=False)
+
+        class XView(generics.ListCreateAPIView):
+            serializer_class = XSerializer
+
+        return generate_schema('x', view=XView)
+
+    def build_new_schema():
+        class XSerializer(serializers.Serializer):
+            id = serializers.CharField(read_only=True)
+            kind = serializers.ChoiceField(choices=['a', 'c'])
+            size = serializers.IntegerField(required=False)
+
+        class XView(generics.ListCreateAPIView):
+            serializer_class = XSerializer
+
+        return generate_schema('x', view=XView)
+
+    old_schema, new_schema = build_old_schema(), build_new_schema()
+    assert list(diff_schemas(old_schema, old_schema)) == []
+    assert list(diff_schemas(old_schema, new_schema)) == [
+        SchemaChange(BREAKING, 'component "KindEnum"', "enum values removed: ['b']"),
+        SchemaChange(NON_BREAKING, 'component "KindEnum"', 'enum values added'),
+        SchemaChange(BREAKING, 'component "X" > id', 'type changed from "integer" to "string"'),
+        SchemaChange(BREAKING, 'component "X" > comment', 'property removed'),
+        SchemaChange(NON_BREAKING, 'component "X" > size', 'optional property added'),
+    ]
+
+
+def test_diff_operations_and_parameters():
+    def operation(parameters):
+        return {'operationId': 'x_list', 'parameters': parameters, 'responses': {'200': {}}}
+
+    page = {'in': 'query', 'name': 'page', 'schema': {'type': 'integer'}}
+    search = {'in': 'query', 'name': 'search', 'required': True, 'schema': {'type': 'string'}}
+    old_schema = {
+        'paths': {
+            '/x/': {'get': operation([page]), 'delete': operation([])},
+            '/y/': {'get': operation([])},
+        }
+    }
+    new_schema = {
+        'paths': {
+            '/x/': {'get': operation([{**page, 'required': True}, search]), 'put': operation([])},
+            '/z/': {'get': operation([])},
+        }
+    }
+    assert list(diff_schemas(old_schema, new_schema)) == [
+        SchemaChange(BREAKING, 'GET /x/ > query parameter "page"', 'parameter became required'),
+        SchemaChange(BREAKING, 'GET /x/ > query parameter "search"', 'required parameter added'),
+        SchemaChange(NON_BREAKING, 'PUT /x/', 'operation added'),
+        SchemaChange(BREAKING, 'DELETE /x/', 'operation removed'),
+        SchemaChange(BREAKING, '/y/', 'path removed'),
+        SchemaChange(NON_BREAKING, '/z/', 'path added'),
+    ]
+
+
+def test_diff_resolves_changed_references():
+    def schema_with_response(ref, components):
+        return {
+            'paths': {'/x/': {'get': {'responses': {'200': {'content': {'application/json': {
+                'schema': {'$ref': ref},
+            }}}}}}},
+            'components': {'schemas': components},
+        }
+
+    a = {'type': 'object', 'properties': {'a': {'type': 'string'}}}
+    b = {'type': 'object', 'properties': {'a': {'type': 'string', 'nullable': True}}}
+    old_schema = schema_with_response('#/components/schemas/A', {'A': a})
+    new_schema = schema_with_response('#/components/schemas/B', {'A': a, 'B': b})
+    assert list(diff_schemas(old_schema, new_schema)) == [
+        SchemaChange(
+            BREAKING, 'GET /x/ > response 200 > application/json > a', 'nullable changed from None to True'
+        ),
+        SchemaChange(NON_BREAKING, 'component "B"', 'component added'),
+    ]
@@ -390,3 +390,36 @@ def test_serializer_with_dynamic_fields(no_warnings):
     assert schema['components']['schemas']['CompactUser']['properties'] == {
         'id': {'type': 'integer', 'readOnly': True}
     }
+
+
+class DispatchField(fields.Field):
+    pass  # pragma: no cover
+
+
+class DispatchSubField(DispatchField):
+    pass  # pragma: no cover
+
+
+def test_extension_dispatch_index_is_invalidated_on_registration():
+    class DispatchFieldExtension(OpenApiSerializerFieldExtension):
+        target_class = DispatchField
+        match_subclasses = True
+
+        def map_serializer_field(self, auto_schema, direction):
+            pass  # pragma: no cover
+
+    match = OpenApiSerializerFieldExtension.get_match(DispatchSubField())
+    assert isinstance(match, DispatchFieldExtension)
+    assert isinstance(OpenApiSerializerFieldExtension.get_match(DispatchSubField), DispatchFieldExtension)
+    assert OpenApiSerializerFieldExtension.get_match(fields.CharField()) is None
+
+    class DispatchSubFieldExtension(OpenApiSerializerFieldExtension):
+        target_class = DispatchSubField
+        priority = 1
+
+        def map_serializer_field(self, auto_schema, direction):
+            pass  # pragma: no cover
+
+    match = OpenApiSerializerFieldExtension.get_match(DispatchSubField())
+    assert isinstance(match, DispatchSubFieldExtension)
+    assert isinstance(OpenApiSerializerFieldExtension.get_match(DispatchField()), DispatchFieldExtension)
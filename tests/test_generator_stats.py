@@ -2,7 +2,7 @@ import inspect
 
 import pytest
 
-from drf_spectacular.drainage import GENERATOR_STATS
+from drf_spectacular.drainage import GENERATOR_STATS, GenerationProfiler
 
 
 def test_known_attribute_access_succeeds():
@@ -16,3 +16,26 @@ def test_unknown_attribute_access_fails():
 
 def test_inspect_unwrap():
     assert inspect.unwrap(GENERATOR_STATS) is GENERATOR_STATS
+
+
+def test_generation_profiler():
+    profiler = GenerationProfiler(slowest=2)
+    with profiler.timer('phase', 'disabled'):
+        pass
+    assert not profiler.timings
+
+    profiler.enable()
+    for i in range(3):
+        with profiler.timer('view', 'View', slowest=('operation', f'GET /{i}')):
+            pass
+    profiler.merge({('view', 'View'): [1.0, 2]}, {'operation': [(1.0, 'GET /worker')]})
+
+    report = profiler.report()
+    assert report['timings']['view'][0]['count'] == 5
+    assert report['timings']['view'][0]['time'] >= 1.0
+    assert len(report['slowest']['operation']) == 2
+    assert report['slowest']['operation'][0]['name'] == 'GET /worker'
+    assert 'Slowest operations:' in profiler.format_report()
+
+    profiler.reset()
+    assert not profiler.report()['timings']
@@ -108,3 +108,119 @@ def test_lazily_translated_enum_overrides(no_warnings, clear_caches):
 
     assert 'SpecialLanguageEnum' in schema_de['components']['schemas']
     assert 'SpecialLanguageEnum' in schema_en['components']['schemas']
+
+
+@mock.patch(
+    'drf_spectacular.settings.spectacular_settings.DESCRIPTION',
+    _('Lazy translated description with missing translation')
+)
+@mock.patch('drf_spectacular.settings.spectacular_settings.ENUM_NAME_OVERRIDES', {
+    'SpecialLanguageEnum': TRANSPORT_CHOICES
+})
+def test_translated_schemas(no_warnings, clear_caches):
+    from rest_framework import generics
+
+    from drf_spectacular.generators import SchemaGenerator
+
+    class LabelSerializer(serializers.Serializer):
+        full_name = serializers.CharField(label=_('Full name'))
+        car = serializers.CharField(label=_('Car'))
+
+    class LabelAPIView(generics.RetrieveAPIView):
+        serializer_class = LabelSerializer
+
+    patterns = urlpatterns + [path('api/label/', LabelAPIView.as_view())]
+    schemas = SchemaGenerator(patterns=patterns).get_translated_schemas(['de', 'en'])
+
+    for language in ['de', 'en']:
+        with translation.override(language):
+            expected = SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+        assert schemas[language] == expected
+    assert 'Eine laengere Erklaerung' in schemas['de']['paths']['/api/x/']['post']['description']
+    assert 'More lengthy explanation' in schemas['en']['paths']['/api/x/']['post']['description']
+    # titles that are trivial variations of the field name are omitted per language
+    assert 'title' not in schemas['de']['components']['schemas']['Label']['properties']['full_name']
+    assert schemas['de']['components']['schemas']['Label']['properties']['car']['title'] == 'Auto'
+    assert 'title' not in schemas['en']['components']['schemas']['Label']['properties']['car']
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE', 'default')
+@mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE_LANGUAGES', ['en-us', 'de'])
+@pytest.mark.urls(__name__)
+def test_i18n_schema_cache_languages(no_warnings):
+    from drf_spectacular.caching import invalidate_schema_cache
+    from drf_spectacular.generators import SchemaGenerator
+
+    invalidate_schema_cache()
+    with mock.patch.object(SchemaGenerator, 'get_schema', autospec=True, side_effect=SchemaGenerator.get_schema) as m:
+        response_de = APIClient().get('/api/schema/?lang=de')
+        response_en = APIClient().get('/api/schema/')
+        assert m.call_count == 1
+
+    with mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE', None):
+        assert response_de.content == APIClient().get('/api/schema/?lang=de').content
+        assert response_en.content == APIClient().get('/api/schema/').content
+    assert b'Eine laengere Erklaerung' in response_de.content
+
+
+def test_i18n_command_languages(tmp_path, clear_generator_settings):
+    from django.core import management
+
+    management.call_command(
+        'spectacular', '--languages=de,en', '--urlconf=tests.test_i18n', f'--file={tmp_path}/schema-{{lang}}.yml'
+    )
+    schema_de = yaml.load((tmp_path / 'schema-de.yml').read_text(), Loader=yaml.SafeLoader)
+    schema_en = yaml.load((tmp_path / 'schema-en.yml').read_text(), Loader=yaml.SafeLoader)
+    assert 'Eine laengere Erklaerung' in schema_de['paths']['/api/x/']['post']['description']
+    assert 'More lengthy explanation' in schema_en['paths']['/api/x/']['post']['description']
+
+
+def test_deferred_translation_formatting():
+    from django.utils.translation import gettext_lazy, ngettext_lazy
+
+    from drf_spectacular.plumbing import defer_translations, resolve_translations
+
+    with defer_translations() as translations:
+        result = {
+            'format': gettext_lazy('Car').format(),
+            'interpolation': '%s: %s' % (gettext_lazy('Car'), 1),
+            'plural': ngettext_lazy('%(count)d car', '%(count)d cars', 'count') % {'count': 2},
+            'concatenation': 'a ' + str(gettext_lazy('Bicycle')),
+        }
+    assert '\ue000' in result['concatenation']
+    assert resolve_translations(result, 'de', translations) == {
+        'format': 'Auto',
+        'interpolation': 'Auto: 1',
+        'plural': '2 cars',
+        'concatenation': 'a Fahrrad',
+    }
+
+
+def test_deferred_translations_in_threads():
+    import threading
+
+    from django.utils.translation import gettext_lazy
+
+    from drf_spectacular.plumbing import defer_translations, resolve_translations
+
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def generate(name, words):
+        with defer_translations() as translations:
+            result = []
+            for word in words:
+                barrier.wait()  # interleave marker creation of both threads
+                result.append(str(gettext_lazy(word)) + ' ' + '%s' % gettext_lazy(word))
+        results[name] = resolve_translations(result, 'de', translations)
+
+    threads = [
+        threading.Thread(target=generate, args=('a', ['Car', 'Bicycle'])),
+        threading.Thread(target=generate, args=('b', ['Bicycle', 'Car'])),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {'a': ['Auto Auto', 'Fahrrad Fahrrad'], 'b': ['Fahrrad Fahrrad', 'Auto Auto']}
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from rest_framework import mixins, routers, serializers, viewsets
+
+from drf_spectacular.generators import SchemaGenerator
+from tests import assert_equal
+
+
+class XSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+
+
+class YSerializer(serializers.Serializer):
+    x = XSerializer()
+
+
+class ZSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=['active', 'inactive'])
+
+
+class XViewset(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = XSerializer
+
+
+class YViewset(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = YSerializer
+
+
+class ZViewset(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = ZSerializer
+
+
+router = routers.SimpleRouter()
+router.register('x', XViewset, basename='x')
+router.register('y', YViewset, basename='y')
+router.register('z', ZViewset, basename='z')
+
+
+def _regenerate(generator, changed):
+    with mock.patch.object(
+        SchemaGenerator, '_parse_endpoint', autospec=True, side_effect=SchemaGenerator._parse_endpoint
+    ) as parse_endpoint:
+        schema = generator.regenerate_schema(changed, public=True)
+    return schema, sorted(call.args[1] for call in parse_endpoint.call_args_list)
+
+
+def test_incremental_regeneration_without_changes():
+    generator = SchemaGenerator(patterns=router.urls, incremental=True)
+    schema = generator.get_schema(public=True)
+
+    regenerated, parsed_paths = _regenerate(generator, [])
+    assert parsed_paths == []
+    assert_equal(regenerated, schema)
+    # enum postprocessing must not be affected by the reuse of components
+    assert 'StatusEnum' in regenerated['components']['schemas']
+
+
+def test_incremental_regeneration_of_changed_serializer():
+    generator = SchemaGenerator(patterns=router.urls, incremental=True)
+    generator.get_schema(public=True)
+
+    XSerializer._declared_fields['name'] = serializers.CharField()
+    try:
+        regenerated, parsed_paths = _regenerate(generator, [XSerializer])
+        expected = SchemaGenerator(patterns=router.urls).get_schema(public=True)
+    finally:
+        del XSerializer._declared_fields['name']
+
+    # y depends on XSerializer through the nested serializer
+    assert parsed_paths == ['/x/', '/y/']
+    assert_equal(regenerated, expected)
+    assert 'name' in regenerated['components']['schemas']['X']['properties']
+
+
+def test_incremental_regeneration_of_changed_module():
+    generator = SchemaGenerator(patterns=router.urls, incremental=True)
+    schema = generator.get_schema(public=True)
+
+    regenerated, parsed_paths = _regenerate(generator, ['tests.test_incremental'])
+    assert parsed_paths == ['/x/', '/y/', '/z/']
+    assert_equal(regenerated, schema)
+
+    regenerated, parsed_paths = _regenerate(generator, ['tests.test_incremental.ZViewset'])
+    assert parsed_paths == ['/z/']
+    assert_equal(regenerated, schema)
@@ -6,10 +6,11 @@ from rest_framework import routers, viewsets
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework.versioning import AcceptHeaderVersioning
 
 from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.plumbing import build_mock_request
 from drf_spectacular.views import SpectacularAPIView
 from tests.models import SimpleModel, SimpleSerializer
 
@@ -102,3 +103,55 @@ def test_mock_request_symmetry_authentication(
         # offline generation as we have no request.
         assert len(schema_online['paths']) == 5
         assert len(schema_offline['paths']) == 3
+
+
+def build_mock_request_reference(method, path, view, original_request):
+    """ former implementation using the request factory for every request """
+    request = getattr(APIRequestFactory(), method.lower())(path=path)
+    request = view.initialize_request(request)
+    if original_request:
+        request.user = original_request.user
+        request.auth = original_request.auth
+        for name, value in original_request.META.items():
+            if not name.startswith('HTTP_'):
+                continue
+            if name in ['HTTP_ACCEPT', 'HTTP_COOKIE', 'HTTP_AUTHORIZATION']:
+                continue
+            request.META[name] = value
+    return request
+
+
+@pytest.mark.parametrize('method', ['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+@pytest.mark.parametrize('path', ['/api/x/', '/api/x/{id}/', '/api/x/?q=1', '/api/%C3%A4/'])
+@pytest.mark.parametrize('with_original', [True, False])
+def test_mock_request_parity(method, path, with_original):
+    view = XViewset(action_map={'get': 'list'})
+    original_request = None
+    if with_original:
+        original_request = view.initialize_request(APIRequestFactory().get(
+            '/api/schema/',
+            HTTP_X_SPECIAL_HEADER='1',
+            HTTP_ACCEPT='application/json; version=v2',
+            HTTP_AUTHORIZATION='Token abc',
+        ))
+        original_request.user = User(username='test')
+        original_request.auth = 'abc'
+
+    for _ in range(2):  # 2nd run uses the cached prototype
+        request = build_mock_request(method, path, view, original_request)
+        expected = build_mock_request_reference(method, path, view, original_request)
+
+        def comparable_meta(r):
+            return {k: v for k, v in r.META.items() if k not in ['wsgi.input', 'wsgi.errors']}
+
+        assert comparable_meta(request) == comparable_meta(expected)
+        assert request.method == expected.method
+        assert request.path == expected.path
+        assert request.get_full_path() == expected.get_full_path()
+        assert request.query_params == expected.query_params
+        assert request.headers == expected.headers
+        assert request.user == expected.user
+        assert request.auth == expected.auth
+        assert [p.__class__ for p in request.parsers] == [p.__class__ for p in expected.parsers]
+        assert request._request._dont_enforce_csrf_checks == expected._request._dont_enforce_csrf_checks
+        assert request.data == expected.data
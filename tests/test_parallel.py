@@ -0,0 +1,64 @@
+from unittest import mock
+
+from rest_framework import mixins, routers, serializers, viewsets
+
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiYamlRenderer
+from tests import assert_equal
+from tests.test_basic import AlbumModelViewset
+from tests.test_extend_schema_view import urlpatterns as extend_schema_view_urlpatterns
+from tests.test_fields import urlpatterns as fields_urlpatterns
+
+
+def _generate_yaml(patterns, workers):
+    with mock.patch('drf_spectacular.settings.spectacular_settings.GENERATION_WORKERS', workers):
+        schema = SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+    return OpenApiYamlRenderer().render(schema, renderer_context={}).decode()
+
+
+def test_parallel_generation_equals_serial(capsys):
+    router = routers.SimpleRouter()
+    router.register('albums', AlbumModelViewset, basename='albums')
+    patterns = router.urls + fields_urlpatterns + extend_schema_view_urlpatterns
+
+    serial = _generate_yaml(patterns, None)
+    serial_stderr = capsys.readouterr().err
+    with mock.patch.object(
+        SchemaGenerator, '_parse_endpoint', autospec=True, side_effect=SchemaGenerator._parse_endpoint
+    ) as parse_endpoint:
+        parallel = _generate_yaml(patterns, 3)
+        assert not parse_endpoint.called  # endpoints were exclusively processed by workers
+    parallel_stderr = capsys.readouterr().err
+
+    assert_equal(parallel, serial)
+    assert parallel_stderr == serial_stderr
+
+
+def test_parallel_generation_collision_warning(capsys):
+    def x1():
+        class XSerializer(serializers.Serializer):
+            uuid = serializers.UUIDField()
+
+        return XSerializer
+
+    def x2():
+        class XSerializer(serializers.Serializer):
+            integer = serializers.IntegerField()
+
+        return XSerializer
+
+    class X1Viewset(mixins.ListModelMixin, viewsets.GenericViewSet):
+        serializer_class = x1()
+
+    class X2Viewset(mixins.ListModelMixin, viewsets.GenericViewSet):
+        serializer_class = x2()
+
+    router = routers.SimpleRouter()
+    router.register('x1', X1Viewset, basename='x1')
+    router.register('x2', X2Viewset, basename='x2')
+
+    serial = _generate_yaml(router.urls, None)
+    assert 'Encountered 2 components with identical names "X"' in capsys.readouterr().err
+    parallel = _generate_yaml(router.urls, 2)
+    assert 'Encountered 2 components with identical names "X"' in capsys.readouterr().err
+    assert_equal(parallel, serial)
@@ -1,10 +1,13 @@
 import collections
+import contextlib
 import json
 import re
 import sys
 import typing
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
+from unittest import mock
 
 if sys.version_info >= (3, 8):
     from typing import TypedDict
@@ -15,14 +18,16 @@ import pytest
 from django import __version__ as DJANGO_VERSION
 from django.conf.urls import include
 from django.db import models
-from django.urls import re_path
+from django.urls import Resolver404, path, re_path
 from rest_framework import generics, serializers
 
+from drf_spectacular.generators import SchemaGenerator
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.plumbing import (
     analyze_named_regex_pattern, build_basic_type, build_choice_field, detype_pattern,
-    follow_field_source, force_instance, get_list_serializer, is_field, is_serializer,
-    resolve_type_hint, safe_ref,
+    follow_field_source, force_instance, get_list_serializer, get_route_index,
+    get_serializer_signature, is_field, is_serializer, normalize_result_object, resolve_type_hint,
+    safe_ref,
 )
 from drf_spectacular.validation import validate_schema
 from tests import generate_schema
@@ -98,6 +103,51 @@ def test_detype_patterns_with_module_includes(no_warnings):
     )
 
 
+def test_route_index_resolution_order(no_warnings):
+    def view_a(request):
+        pass  # pragma: no cover
+
+    def view_b(request):
+        pass  # pragma: no cover
+
+    patterns = [
+        path('v1/items/<int:pk>/', view_a),
+        re_path(r'^(?P<version>v[0-9])/items/(?P<pk>[0-9]+)/$', view_b),
+        path('v1/', include(([path('other/', view_b)], 'app'), namespace='v1')),
+        re_path(r'^v2/(?P<slug>[a-z]+)/$', view_a),
+    ]
+    route_index = get_route_index(patterns)
+    assert get_route_index(list(patterns)) is route_index
+
+    match = route_index.resolve('/v1/items/{pk}/')
+    assert match.func is view_a and match.kwargs == {'pk': '{pk}'}
+    assert route_index.resolve('/v1/items/{pk}/') is match
+    assert route_index.resolve('/v3/items/{pk}/').func is view_b
+    assert route_index.resolve('/v1/other/').namespace == 'v1'
+    assert route_index.resolve('/v2/{slug}/').kwargs == {'slug': '{slug}'}
+    with pytest.raises(Resolver404):
+        route_index.resolve('/v1/unknown/')
+    with pytest.raises(Resolver404):
+        route_index.resolve('/unknown/')
+
+
+def test_route_index_top_level_alternation(no_warnings):
+    def view_a(request):
+        pass  # pragma: no cover
+
+    def view_b(request):
+        pass  # pragma: no cover
+
+    patterns = [
+        re_path(r'^api/|^other/x/$', view_a),
+        re_path(r'^(?:api|misc)/y/$', view_b),
+    ]
+    route_index = get_route_index(patterns)
+    assert route_index.resolve('/other/x/').func is view_a
+    assert route_index.resolve('/api/').func is view_a
+    assert route_index.resolve('/misc/y/').func is view_b
+
+
 NamedTupleA = collections.namedtuple("NamedTupleA", "a, b")
 
 
@@ -413,3 +463,248 @@ def test_safe_ref():
     schema = safe_ref(schema)
     assert schema == {'$ref': '#/components/schemas/Foo'}
     assert safe_ref(schema) == safe_ref(schema)
+
+
+def test_get_serializer_signature():
+    class XSerializer(serializers.Serializer):
+        field = serializers.CharField()
+
+    signature = get_serializer_signature(XSerializer(context={'request': None}))
+    assert signature == get_serializer_signature(XSerializer())
+    assert signature != get_serializer_signature(XSerializer(partial=True))
+    assert signature != get_serializer_signature(XSerializer(many=True))
+    assert get_serializer_signature(XSerializer(many=True)) == get_serializer_signature(XSerializer(many=True))
+    assert get_serializer_signature(XSerializer(default=[])) is None  # unhashable kwarg
+
+
+def test_serializer_name_and_identity_memoization():
+    class XSerializer(serializers.Serializer):
+        field = serializers.CharField()
+
+    class YSerializer(serializers.Serializer):
+        x1 = XSerializer()
+        x2 = XSerializer()
+        x3 = XSerializer(many=True)
+
+    class XAPIView(generics.RetrieveUpdateAPIView):
+        serializer_class = YSerializer
+
+    urlpatterns = [re_path(f'^x{i}/$', XAPIView.as_view()) for i in range(3)]
+    generator = SchemaGenerator(patterns=urlpatterns)
+    schema = generator.get_schema(request=None, public=True)
+
+    assert set(schema['components']['schemas']) == {'X', 'Y', 'PatchedY'}
+    # X and Y for each direction and PatchedY. field schemas are not shared across directions.
+    assert generator.registry.memo_misses['serializer'] == 5
+    assert generator.registry.memo_hits['serializer'] > generator.registry.memo_misses['serializer']
+
+
+def test_serializer_name_memoization_skipped_for_custom_naming():
+    class XSerializer(serializers.Serializer):
+        field = serializers.CharField()
+
+    class ViewDependentAutoSchema(AutoSchema):
+        def get_serializer_name(self, serializer, direction):
+            return f'{self.view.__class__.__name__}{serializer.__class__.__name__}'
+
+    class AAPIView(generics.RetrieveAPIView):
+        serializer_class = XSerializer
+        schema = ViewDependentAutoSchema()
+
+    class BAPIView(AAPIView):
+        schema = ViewDependentAutoSchema()
+
+    generator = SchemaGenerator(patterns=[re_path('^a/$', AAPIView.as_view()), re_path('^b/$', BAPIView.as_view())])
+    schema = generator.get_schema(request=None, public=True)
+
+    assert set(schema['components']['schemas']) == {'AAPIViewX', 'BAPIViewX'}
+    assert generator.registry.memo_misses['serializer'] == 0
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.COMPONENT_SPLIT_REQUEST', True)
+def test_serializer_field_schema_memoization():
+    class XSerializer(serializers.Serializer):
+        id = serializers.IntegerField(read_only=True)
+        name = serializers.CharField(max_length=10)
+
+    class XAPIView(generics.RetrieveUpdateAPIView):
+        serializer_class = XSerializer
+
+    generator = SchemaGenerator(patterns=[re_path('^x/$', XAPIView.as_view())])
+    schema = generator.get_schema(request=None, public=True)
+
+    # PatchedXRequest reuses the fields of XRequest. X is mapped for the other direction.
+    assert set(schema['components']['schemas']) == {'X', 'XRequest', 'PatchedXRequest'}
+    assert generator.registry.memo_misses['field'] == 4
+    assert generator.registry.memo_hits['field'] == 2
+    assert schema['components']['schemas']['XRequest']['required'] == ['name']
+    assert 'required' not in schema['components']['schemas']['PatchedXRequest']
+    assert schema['components']['schemas']['PatchedXRequest']['properties'] == {
+        'name': {'type': 'string', 'minLength': 1, 'maxLength': 10}
+    }
+
+
+def test_serializer_field_schema_memoization_skipped_for_dynamic_fields():
+    class XSerializer(serializers.Serializer):
+        id = serializers.IntegerField(read_only=True)
+        name = serializers.CharField(max_length=10)
+
+        def get_fields(self):
+            fields = super().get_fields()
+            if self.partial:
+                fields['name'] = serializers.CharField(max_length=20)
+            return fields
+
+    class XAPIView(generics.RetrieveUpdateAPIView):
+        serializer_class = XSerializer
+
+    with mock.patch('drf_spectacular.settings.spectacular_settings.COMPONENT_SPLIT_REQUEST', True):
+        generator = SchemaGenerator(patterns=[re_path('^x/$', XAPIView.as_view())])
+        schema = generator.get_schema(request=None, public=True)
+
+    assert generator.registry.memo_misses['field'] == 0
+    assert schema['components']['schemas']['XRequest']['properties']['name']['maxLength'] == 10
+    assert schema['components']['schemas']['PatchedXRequest']['properties']['name']['maxLength'] == 20
+
+
+def test_serializer_field_schema_memoization_per_direction():
+    from drf_spectacular.extensions import OpenApiSerializerFieldExtension
+
+    class DirectionalField(serializers.CharField):
+        pass
+
+    class DirectionalFieldExtension(OpenApiSerializerFieldExtension):
+        target_class = DirectionalField
+
+        def map_serializer_field(self, auto_schema, direction):
+            return {'type': 'string', 'format': direction}
+
+    class XSerializer(serializers.Serializer):
+        field = DirectionalField()
+
+    class XAPIView(generics.RetrieveUpdateAPIView):
+        serializer_class = XSerializer
+
+    generator = SchemaGenerator(patterns=[re_path('^x/$', XAPIView.as_view())])
+    schema = generator.get_schema(request=None, public=True)
+
+    # without component splitting, X is mapped for responses while PatchedX is only used in requests
+    assert schema['components']['schemas']['X']['properties']['field']['format'] == 'response'
+    assert schema['components']['schemas']['PatchedX']['properties']['field']['format'] == 'request'
+
+
+def test_serializer_field_schema_memoization_skipped_for_view_dependent_schemas():
+    from drf_spectacular.extensions import OpenApiSerializerFieldExtension
+
+    class ViewField(serializers.CharField):
+        pass
+
+    class ViewFieldExtension(OpenApiSerializerFieldExtension):
+        target_class = ViewField
+
+        def map_serializer_field(self, auto_schema, direction):
+            return {'type': 'string', 'format': auto_schema.view.__class__.__name__}
+
+    class XSerializer(serializers.Serializer):
+        field = serializers.CharField()
+
+    class YSerializer(serializers.Serializer):
+        x = XSerializer()
+        v = ViewField()
+
+    class ViewDependentAutoSchema(AutoSchema):
+        def get_serializer_name(self, serializer, direction):
+            return f'{self.view.__class__.__name__}{serializer.__class__.__name__}'
+
+    class AAPIView(generics.RetrieveAPIView):
+        serializer_class = YSerializer
+        schema = ViewDependentAutoSchema()
+
+    class BAPIView(AAPIView):
+        schema = ViewDependentAutoSchema()
+
+    class CAPIView(generics.RetrieveAPIView):
+        serializer_class = YSerializer
+
+    class DAPIView(CAPIView):
+        pass
+
+    generator = SchemaGenerator(patterns=[
+        re_path(f'^{name}/$', view.as_view()) for name, view in [
+            ('a', AAPIView), ('b', BAPIView), ('c', CAPIView), ('d', DAPIView)
+        ]
+    ])
+    schema = generator.get_schema(request=None, public=True)
+    schemas = schema['components']['schemas']
+
+    assert schemas['AAPIViewY']['properties']['x']['$ref'] == '#/components/schemas/AAPIViewX'
+    assert schemas['BAPIViewY']['properties']['x']['$ref'] == '#/components/schemas/BAPIViewX'
+    # Y is only mapped once with the default naming, but its field extension is never memoized
+    assert schemas['Y']['properties']['v']['format'] == 'CAPIView'
+    assert generator.registry.memo_misses['field'] == 2
+
+
+def test_normalize_result_object():
+    from collections import OrderedDict
+
+    from django.utils.translation import gettext_lazy
+
+    class IntEnum(int, Enum):
+        ONE = 1
+
+    unchanged = {'type': 'object', 'properties': {'a': {'type': 'string', 'enum': ['x', None, True, 1.5]}}}
+    settings_tags = [{'name': 'tag', 'description': gettext_lazy('lazy')}]
+    result = OrderedDict([
+        ('components', unchanged),
+        ('tags', settings_tags),
+        ('paths', {'/x/': {'get': {'tags': ('a', 'b'), 'x-int': IntEnum.ONE, 'x-decimal': Decimal('1.5')}}}),
+    ])
+
+    normalized = normalize_result_object(result)
+    assert normalized == {
+        'components': unchanged,
+        'tags': [{'name': 'tag', 'description': 'lazy'}],
+        'paths': {'/x/': {'get': {'tags': ['a', 'b'], 'x-int': 1, 'x-decimal': Decimal('1.5')}}},
+    }
+    assert type(normalized) is dict
+    assert type(normalized['tags'][0]['description']) is str
+    assert type(normalized['paths']['/x/']['get']['x-int']) is int
+    # untouched nodes are retained and the input is not modified
+    assert normalized['components'] is unchanged
+    assert not isinstance(settings_tags[0]['description'], str)
+
+    # generated schemas do not alias the settings they are built from
+    class XSerializer(serializers.Serializer):
+        field = serializers.CharField()
+
+    class XAPIView(generics.RetrieveAPIView):
+        serializer_class = XSerializer
+
+    patched_settings = {
+        'SERVERS': [{'url': 'https://example.com'}],
+        'TAGS': [{'name': 'x'}],
+        'CONTACT': {'name': 'contact'},
+        'EXTERNAL_DOCS': {'url': 'https://example.com/docs'},
+        'APPEND_COMPONENTS': {'schemas': {'Extra': {'type': 'object'}}},
+        'APPEND_PATHS': {'/extra/': {'get': {'operationId': 'extra', 'responses': {}}}},
+    }
+    with contextlib.ExitStack() as stack:
+        for name, value in patched_settings.items():
+            stack.enter_context(mock.patch(f'drf_spectacular.settings.spectacular_settings.{name}', value))
+        schema = SchemaGenerator(patterns=[re_path('^x/$', XAPIView.as_view())]).get_schema(public=True)
+
+    schema['servers'].append({'url': 'https://other.example.com'})
+    schema['tags'][0]['description'] = 'changed'
+    schema['info']['contact']['name'] = 'changed'
+    schema['externalDocs']['url'] = 'changed'
+    schema['components']['schemas']['Extra']['type'] = 'string'
+    schema['paths']['/extra/']['get']['operationId'] = 'changed'
+
+    assert patched_settings == {
+        'SERVERS': [{'url': 'https://example.com'}],
+        'TAGS': [{'name': 'x'}],
+        'CONTACT': {'name': 'contact'},
+        'EXTERNAL_DOCS': {'url': 'https://example.com/docs'},
+        'APPEND_COMPONENTS': {'schemas': {'Extra': {'type': 'object'}}},
+        'APPEND_PATHS': {'/extra/': {'get': {'operationId': 'extra', 'responses': {}}}},
+    }
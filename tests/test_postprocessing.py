@@ -18,6 +18,7 @@ except ImportError:
 from drf_spectacular.plumbing import _load_enum_name_overrides, list_hash, load_enum_name_overrides
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from tests import assert_schema, generate_schema
+from tests.models import SimpleModel
 
 language_choices = (
     ('en', 'en'),
@@ -408,3 +409,160 @@ def test_enum_suffix(no_warnings, clear_caches):
             # vote choices is overridden, so should not have the suffix added
             assert f'Vote{variation}' not in schema['components']['schemas']
             assert 'VoteChoices' in schema['components']['schemas']
+
+
+def test_visitor_hooks_share_traversals(no_warnings):
+    from drf_spectacular.hooks import postprocess_schema_enum_id_removal, postprocess_schema_enums
+    from drf_spectacular.traversal import SchemaVisitor, visitor_hook, walk_schema
+
+    visited = []
+    enum_ids = []
+
+    @visitor_hook
+    def collect_properties(result, generator, **kwargs):
+        yield [
+            SchemaVisitor('properties', visit=lambda node, key, path: visited.append(tuple(path))),
+            SchemaVisitor('x-spec-enum-id', visit=lambda node, key, path: enum_ids.append(tuple(path))),
+        ]
+
+    hooks = [postprocess_schema_enums, collect_properties, postprocess_schema_enum_id_removal]
+    with mock.patch('drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', hooks):
+        with mock.patch('drf_spectacular.traversal.walk_schema', side_effect=walk_schema) as walk_mock:
+            schema = generate_schema('a', AViewset)
+
+    # two phases of the enum hook. the other hooks share a single traversal, which happens
+    # after the enum hook has finished its modifications.
+    assert walk_mock.call_count == 3
+    assert ('components', 'schemas', 'A') in visited
+    assert not enum_ids
+    assert schema == generate_schema('a', AViewset)
+
+
+def test_visitor_hook_called_directly(no_warnings):
+    from drf_spectacular.hooks import postprocess_schema_enum_id_removal
+
+    result = {'a': [{'x-spec-enum-id': 1, 'b': ({'x-spec-enum-id': 2},)}]}
+    assert postprocess_schema_enum_id_removal(result, generator=None) == {'a': [{'b': ({},)}]}
+
+
+def test_visitor_hook_called_positionally(no_warnings):
+    from rest_framework import routers
+
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.hooks import postprocess_schema_enum_id_removal, postprocess_schema_enums
+
+    router = routers.SimpleRouter()
+    router.register('a', AViewset, basename='a')
+    generator = SchemaGenerator(patterns=router.urls)
+    with mock.patch('drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', []):
+        result = generator.get_schema(request=None, public=True)
+
+    # chaining the builtin hooks from a custom hook
+    result = postprocess_schema_enums(result, generator)
+    result = postprocess_schema_enum_id_removal(result, generator)
+    assert result == generate_schema('a', AViewset)
+
+
+def test_deduplication_of_inline_schemas(no_warnings):
+    from drf_spectacular.hooks import postprocess_schema_deduplication
+    from drf_spectacular.validation import validate_schema
+
+    error_schema = {
+        'type': 'object',
+        'properties': {
+            'detail': {'type': 'string'},
+            'code': {'type': 'string', 'enum': ['invalid', 'not_found']},
+        },
+        'required': ['detail'],
+    }
+
+    class XSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+
+    class XViewset(viewsets.ReadOnlyModelViewSet):
+        serializer_class = XSerializer
+        queryset = SimpleModel.objects.none()
+
+        @extend_schema(responses={200: XSerializer, 400: error_schema, 404: error_schema})
+        def retrieve(self, request, *args, **kwargs):
+            pass  # pragma: no cover
+
+        @extend_schema(responses={200: XSerializer(many=True), 400: dict(error_schema)})
+        def list(self, request, *args, **kwargs):
+            pass  # pragma: no cover
+
+    hooks = [postprocess_schema_deduplication]
+    with mock.patch('drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', hooks):
+        schema = generate_schema('x', XViewset)
+        assert schema == generate_schema('x', XViewset)
+
+    validate_schema(schema)
+    assert list(schema['components']['schemas']) == ['Inline47e337', 'X']
+    assert schema['components']['schemas']['Inline47e337'] == error_schema
+    reference = {'$ref': '#/components/schemas/Inline47e337'}
+    for path, status in [('/x/', '400'), ('/x/{id}/', '400'), ('/x/{id}/', '404')]:
+        response = schema['paths'][path]['get']['responses'][status]
+        assert response['content']['application/json']['schema'] == reference
+    # small schemas stay inline
+    assert schema['paths']['/x/']['get']['responses']['200']['content']['application/json']['schema']['type'] == 'array'
+
+
+def test_deduplication_does_not_modify_settings(no_warnings):
+    import copy
+
+    from drf_spectacular.hooks import postprocess_schema_deduplication
+
+    error_schema = {
+        'type': 'object',
+        'properties': {'detail': {'type': 'string'}, 'code': {'type': 'string'}},
+        'required': ['detail'],
+    }
+    append_components = {
+        'responses': {
+            'Error': {'description': '', 'content': {'application/json': {'schema': error_schema}}},
+            'OtherError': {'description': '', 'content': {'application/json': {'schema': dict(error_schema)}}},
+        }
+    }
+    expected_settings = copy.deepcopy(append_components)
+
+    class XSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+
+    class XViewset(viewsets.ReadOnlyModelViewSet):
+        serializer_class = XSerializer
+        queryset = SimpleModel.objects.none()
+
+    with mock.patch('drf_spectacular.settings.spectacular_settings.APPEND_COMPONENTS', append_components):
+        with mock.patch(
+            'drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', [postprocess_schema_deduplication]
+        ):
+            schema = generate_schema('x', XViewset)
+
+    assert append_components == expected_settings
+    responses = schema['components']['responses']
+    assert responses['Error']['content']['application/json']['schema'] == {'$ref': '#/components/schemas/Inline2f6082'}
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.DEDUPLICATION_MIN_SIZE', 1)
+def test_deduplication_of_single_key_subschemas(no_warnings):
+    from drf_spectacular.hooks import postprocess_schema_deduplication
+
+    items = {'oneOf': [{'type': 'integer'}, {'type': 'string'}]}
+
+    class XAPIView(APIView):
+        @extend_schema(responses={
+            200: {'type': 'array', 'items': items},
+            400: {'type': 'array', 'items': items, 'maxItems': 3},
+        })
+        def get(self, request):
+            pass  # pragma: no cover
+
+    hooks = [postprocess_schema_deduplication]
+    with mock.patch('drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', hooks):
+        schema = generate_schema('x', view=XAPIView)
+
+    responses = schema['paths']['/x']['get']['responses']
+    reference = responses['200']['content']['application/json']['schema']['items']
+    assert set(reference) == {'$ref'}
+    assert responses['400']['content']['application/json']['schema']['items'] == reference
+    assert schema['components']['schemas'][reference['$ref'].split('/')[-1]] == items
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from rest_framework import generics, serializers
+
+from drf_spectacular.reachability import ReferenceIndex
+from tests import generate_schema
+
+
+def ref(name, component_type='schemas'):
+    return {'$ref': f'#/components/{component_type}/{name}'}
+
+
+SCHEMA = {
+    'openapi': '3.0.3',
+    'paths': {
+        '/a/{id}/': {
+            'parameters': [ref('Id', 'parameters')],
+            'get': {'responses': {'200': {'content': {'application/json': {'schema': ref('A')}}}}},
+            'delete': {'security': [{'tokenAuth': []}], 'responses': {'204': {'description': ''}}},
+        },
+        '/c/': {
+            'post': {'responses': {'200': {'content': {'application/json': {'schema': {
+                'oneOf': [ref('C1')],
+                'discriminator': {'propertyName': 't', 'mapping': {'c2': '#/components/schemas/C2'}},
+            }}}}}},
+        },
+    },
+    'webhooks': {'hook': {'post': {'requestBody': {'content': {'application/json': {'schema': ref('W')}}}}}},
+    'components': {
+        'schemas': {
+            'A': {'properties': {'b': ref('B'), 'loop': ref('A')}},
+            'B': {'items': ref('Missing')},
+            'C1': {'type': 'object'},
+            'C2': {'type': 'object'},
+            'W': {'type': 'object'},
+            'Unused': {'properties': {'b': ref('B')}, 'example': ref('C1')},
+        },
+        'parameters': {'Id': {'name': 'id', 'in': 'path', 'schema': {'type': 'integer'}}},
+        'securitySchemes': {'tokenAuth': {'type': 'http', 'scheme': 'bearer'}, 'basicAuth': {'type': 'http'}},
+    },
+}
+
+
+def test_reference_index_operation_components():
+    index = ReferenceIndex(SCHEMA)
+    assert index.get_operation_components('/a/{id}/', 'GET') == {
+        ('parameters', 'Id'), ('schemas', 'A'), ('schemas', 'B')
+    }
+    assert index.get_operation_components('/a/{id}/', 'delete') == {
+        ('parameters', 'Id'), ('securitySchemes', 'tokenAuth')
+    }
+    assert index.get_operation_components('/c/', 'post') == {('schemas', 'C1'), ('schemas', 'C2')}
+
+
+def test_reference_index_unreachable_components():
+    index = ReferenceIndex(SCHEMA)
+    assert index.get_unreachable_components() == [('schemas', 'Unused'), ('securitySchemes', 'basicAuth')]
+    assert index.get_unreachable_components(operations=[('/c/', 'post')]) == [
+        ('schemas', 'A'), ('schemas', 'B'), ('schemas', 'Unused'),
+        ('parameters', 'Id'), ('securitySchemes', 'tokenAuth'), ('securitySchemes', 'basicAuth'),
+    ]
+    pruned = index.prune_components(SCHEMA['components'], operations=[('/c/', 'post')])
+    assert pruned == {'schemas': {name: SCHEMA['components']['schemas'][name] for name in ['C1', 'C2', 'W']}}
+
+
+class YSerializer(serializers.Serializer):
+    field = serializers.IntegerField()
+
+
+class XSerializer(serializers.Serializer):
+    y = YSerializer()
+
+
+class XView(generics.RetrieveAPIView):
+    serializer_class = XSerializer
+
+
+def test_prune_components_hook(capsys):
+    from drf_spectacular.hooks import postprocess_schema_prune_components
+
+    def remove_paths(result, generator, **kwargs):
+        result['paths'] = {}
+        return result
+
+    hooks = [remove_paths, postprocess_schema_prune_components]
+    with mock.patch('drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', hooks):
+        schema = generate_schema('x', view=XView)
+
+    assert not schema['components']
+    stderr = capsys.readouterr().err
+    assert 'schemas component "X" is not used by any operation and was removed.' in stderr
+    assert 'schemas component "Y" is not used by any operation and was removed.' in stderr
+
+
+def test_prune_components_hook_keeps_used_components(no_warnings):
+    from drf_spectacular.hooks import postprocess_schema_prune_components
+
+    expected = generate_schema('x', view=XView)
+    with mock.patch(
+        'drf_spectacular.settings.spectacular_settings.POSTPROCESSING_HOOKS', [postprocess_schema_prune_components]
+    ):
+        assert generate_schema('x', view=XView) == expected
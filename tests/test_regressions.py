@@ -2976,6 +2976,58 @@ def test_safestring_serialization(no_warnings):
     assert b"<h1>Woah!</h1>" in OpenApiYamlRenderer().render(schema)
 
 
+@pytest.mark.parametrize('renderer', [OpenApiYamlRenderer(), OpenApiJsonRenderer()])
+def test_streaming_renderer_equals_render(renderer):
+    from tests.test_basic import AlbumModelViewset
+
+    schema = generate_schema('albums', AlbumModelViewset)
+    schema['paths']['/' + 'x' * 200 + '/'] = {'get': {'description': 'multi\nline\u2028'}}
+    schema['components']['schemas']['Empty'] = {}
+    schema['x-empty'] = {}
+    renderer.chunk_size = 64
+
+    chunks = list(renderer.render_stream(schema, renderer_context={}))
+    assert len(chunks) > 1
+    assert b''.join(chunks) == renderer.render(schema, renderer_context={})
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'ujson'])
+@pytest.mark.parametrize('indent', [4, None])
+def test_json_renderer_backend(backend, indent):
+    import json
+
+    from django.utils.safestring import mark_safe
+    from django.utils.translation import gettext_lazy
+    from rest_framework.exceptions import ErrorDetail
+
+    from tests.test_basic import AlbumModelViewset
+
+    pytest.importorskip(backend)
+    schema = generate_schema('albums', AlbumModelViewset)
+    schema['x-types'] = {
+        'decimal': Decimal('1.50'),
+        'timedelta': datetime.timedelta(seconds=90),
+        'time': datetime.time(12, 30),
+        'uuid': uuid.UUID('a6e05fb5-1f2c-4a8a-8b4f-65d7d9e2a4c9'),
+        'safe': mark_safe('<b>bold</b>'),
+        'error': ErrorDetail('invalid', code='invalid'),
+        'lazy': gettext_lazy('lazy string'),
+        'separators': 'line\u2028paragraph\u2029',
+    }
+
+    with mock.patch('drf_spectacular.settings.spectacular_settings.JSON_RENDERER_INDENT', indent):
+        default_output = OpenApiJsonRenderer().render(schema)
+        with mock.patch('drf_spectacular.settings.spectacular_settings.JSON_RENDERER_BACKEND', backend):
+            backend_output = OpenApiJsonRenderer().render(schema)
+
+    assert b'\\u2028' in backend_output
+    assert json.loads(backend_output) == json.loads(default_output)
+    if indent is None:
+        assert backend_output == default_output
+    else:
+        assert backend_output.startswith(b'{\n ')
+
+
 def test_many_parameter_item_enum(no_warnings):
     @extend_schema(
         parameters=[OpenApiParameter(
@@ -3444,3 +3496,48 @@ def test_self_referential_serializer_method_field(no_warnings):
             'readOnly': True
         }
     }
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.ENUMERATION_CACHE', True)
+def test_enumeration_cache(no_warnings):
+    from drf_spectacular.generators import EndpointEnumerator, SchemaGenerator
+
+    class XViewset(viewsets.ReadOnlyModelViewSet):
+        serializer_class = SimpleSerializer
+        queryset = SimpleModel.objects.none()
+
+    router = routers.SimpleRouter()
+    router.register('x', XViewset)
+    patterns = router.urls
+
+    EndpointEnumerator.clear_endpoint_cache()
+    with mock.patch.object(
+        EndpointEnumerator, '_get_api_endpoints', autospec=True, side_effect=EndpointEnumerator._get_api_endpoints
+    ) as enumerate_mock:
+        schema = SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+        assert SchemaGenerator(patterns=patterns).get_schema(request=None, public=True) == schema
+        assert enumerate_mock.call_count == 1
+        # changed preprocessing configuration and different patterns are enumerated again
+        with mock.patch(
+            'drf_spectacular.settings.spectacular_settings.PREPROCESSING_HOOKS', [preprocess_exclude_path_format]
+        ):
+            SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+        assert enumerate_mock.call_count == 2
+        SchemaGenerator(patterns=list(patterns)).get_schema(request=None, public=True)
+        assert enumerate_mock.call_count == 3
+        with mock.patch('drf_spectacular.settings.spectacular_settings.ENUMERATION_CACHE', False):
+            SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+        assert enumerate_mock.call_count == 4
+
+    # custom enumerators do not share cached endpoints with the default one
+    class ListOnlyEndpointEnumerator(EndpointEnumerator):
+        def should_include_endpoint(self, path, callback):
+            return '{' not in path and super().should_include_endpoint(path, callback)
+
+    class ListOnlySchemaGenerator(SchemaGenerator):
+        endpoint_inspector_cls = ListOnlyEndpointEnumerator
+
+    list_only_schema = ListOnlySchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+    assert list(list_only_schema['paths']) == ['/x/']
+    assert SchemaGenerator(patterns=patterns).get_schema(request=None, public=True) == schema
+    EndpointEnumerator.clear_endpoint_cache()
@@ -0,0 +1,82 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.urls import path
+from django.utils.translation import gettext_lazy as _
+from jsonschema import ValidationError
+from rest_framework import generics, serializers
+
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.validation import (
+    get_validator, iter_schema_errors, normalize_schema, validate_schema,
+    validate_schema_components,
+)
+from tests import generate_schema
+
+
+class XSerializer(serializers.Serializer):
+    field = serializers.DecimalField(max_digits=4, decimal_places=2, help_text=_('lazy'))
+
+
+class XView(generics.RetrieveAPIView):
+    serializer_class = XSerializer
+
+
+def test_normalize_schema_equals_json_round_trip(no_warnings):
+    schema = generate_schema('/x', view=XView)
+    schema['components']['schemas']['X']['properties']['field']['maximum'] = Decimal('99.99')
+    schema['components']['schemas']['X']['required'] = ('field',)
+    schema['components']['schemas']['X']['x-extension'] = {1: None}
+
+    assert normalize_schema(schema) == json.loads(OpenApiJsonRenderer().render(schema))
+    validate_schema(schema)
+
+
+def test_validator_is_cached_per_version():
+    assert get_validator('3.0.3') is get_validator('3.0.3')
+    assert get_validator('3.0.3') is not get_validator('3.1.0')
+
+
+def test_iter_schema_errors_per_path(no_warnings):
+    schema = generate_schema('/x', view=XView)
+    schema['paths']['/x']['get']['responses'] = {'200': {'description': 42}}
+    schema['paths']['/y'] = {'get': {'operationId': 'y', 'responses': {'200': {'description': ''}}}}
+    schema['paths']['/z'] = {'get': {'responses': 'invalid'}}
+
+    errors = iter_schema_errors(schema)
+    assert list(next(errors).absolute_path)[:2] == ['paths', '/x']
+    assert {tuple(e.absolute_path)[:2] for e in errors} == {('paths', '/z')}
+
+    with pytest.raises(ValidationError):
+        validate_schema(schema)
+
+
+def test_validate_schema_components(capsys):
+    from drf_spectacular.generators import SchemaGenerator
+
+    generator = SchemaGenerator(patterns=[path('x/', XView.as_view())])
+    schema = generator.get_schema(request=None, public=True)
+    assert validate_schema_components(schema, generator) == []
+
+    schema['components']['schemas']['X']['properties']['field']['type'] = 'decimal'
+    schema['paths']['/x/']['get']['responses'] = []
+    errors = validate_schema_components(schema, generator)
+    assert [list(e.absolute_path)[:3] for e in errors] == [['components', 'schemas', 'X'], ['paths', '/x/', 'get']]
+
+    stderr = capsys.readouterr().err
+    assert 'tests/test_validation.py: Error [XSerializer]: schema validation failed for schemas component "X"' in stderr
+    assert 'tests/test_validation.py: Error [XView]: schema validation failed for GET /x/' in stderr
+
+
+def test_validate_schema_components_skips_valid_fragments(no_warnings):
+    schema = generate_schema('/x', view=XView)
+    validate_schema_components(schema)
+
+    with mock.patch('drf_spectacular.validation.get_validator') as get_validator_mock:
+        validator = get_validator_mock.return_value
+        validator.iter_errors.return_value = []
+        schema['components']['schemas']['X']['description'] = 'changed'
+        validate_schema_components(schema)
+        assert validator.iter_errors.call_count == 1
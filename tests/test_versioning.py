@@ -262,3 +262,78 @@ def test_spectacular_versioning_info_object_variations(no_warnings):
         assert b'version: v2\n' in response.content
         response = APIClient().get('/api/schema/')
         assert b"version: ''\n" in response.content
+
+
+@pytest.mark.parametrize('viewset_cls', [
+    PathVersioningViewset, PathVersioningViewset2,
+    NamespaceVersioningViewset, NamespaceVersioningViewset2,
+    AcceptHeaderVersioningViewset, AcceptHeaderVersioningViewset2,
+])
+def test_multi_version_generation(no_warnings, viewset_cls):
+    router = routers.SimpleRouter()
+    router.register('x', viewset_cls, basename='x')
+    if issubclass(viewset_cls.versioning_class, NamespaceVersioning):
+        patterns = [path('v1/', include((router.urls, 'v1'))), path('v2/', include((router.urls, 'v2')))]
+    elif issubclass(viewset_cls.versioning_class, URLPathVersioning):
+        patterns = [re_path(r'^(?P<version>[v1|v2]+)/', include((router.urls, 'x')))]
+    else:
+        patterns = [path('', include((router.urls, 'x')))]
+
+    generator = SchemaGenerator(patterns=patterns)
+    with mock.patch.object(SchemaGenerator, 'create_view', side_effect=generator.create_view) as create_view:
+        schemas = generator.get_schemas(versions=['v1', 'v2'])
+    assert create_view.call_count == len(generator.endpoints)
+    assert generator.api_version is None
+
+    for version in ['v1', 'v2']:
+        expected = SchemaGenerator(patterns=patterns, api_version=version).get_schema(request=None, public=True)
+        assert schemas[version] == expected
+
+
+@mock.patch.object(URLPathVersioning, 'allowed_versions', ['v1', 'v2'])
+@mock.patch.object(URLPathVersioning, 'default_version', 'v2')
+def test_multi_version_generation_allowed_versions(no_warnings):
+    router = routers.SimpleRouter()
+    router.register('x', PathVersioningViewset2, basename='x')
+    generator = SchemaGenerator(patterns=[re_path(r'^(?P<version>[v1|v2]+)/', include((router.urls, 'x')))])
+    schemas = generator.get_schemas()
+    assert list(schemas) == ['v2', 'v1']
+    assert '/v1/x/' in schemas['v1']['paths']
+    assert '/v2/x/' in schemas['v2']['paths']
+
+
+@mock.patch.object(URLPathVersioning, 'allowed_versions', ['v1', 'v2'])
+@mock.patch('tests.urls.urlpatterns', [re_path(r'^api/pv/(?P<version>[v1|v2]+)/', include(urlpatterns_path))])
+def test_multi_version_command(tmp_path, clear_generator_settings):
+    from django.core import management
+
+    management.call_command('spectacular', '--all-versions', '--validate', f'--file={tmp_path}/schema-{{version}}.yml')
+    for version in ['v1', 'v2']:
+        schema = yaml.load((tmp_path / f'schema-{version}.yml').read_text(), Loader=yaml.SafeLoader)
+        assert f'/api/pv/{version}/x/' in schema['paths']
+        assert schema['info']['version'] == f'0.0.0 ({version})'
+
+
+class VersionDependentErrorView(generics.RetrieveAPIView):
+    versioning_class = URLPathVersioning
+
+    def get_serializer_class(self):
+        if self.request.version == 'v1':
+            raise Exception('not available in v1')
+        return Xv2Serializer
+
+
+@mock.patch.object(URLPathVersioning, 'allowed_versions', ['v1', 'v2'])
+@mock.patch('tests.urls.urlpatterns', [re_path(r'^(?P<version>[v1|v2]+)/x/', VersionDependentErrorView.as_view())])
+def test_multi_version_command_fail_on_warn(capsys, tmp_path, clear_generator_settings):
+    from django.core import management
+    from django.core.management import CommandError
+
+    # the error only occurs for the first of the versions
+    with pytest.raises(CommandError):
+        management.call_command(
+            'spectacular', '--all-versions', '--fail-on-warn', f'--file={tmp_path}/schema-{{version}}.yml'
+        )
+    stderr = capsys.readouterr().err
+    assert 'not available in v1' in stderr
+    assert 'Schema generation summary:' in stderr
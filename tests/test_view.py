@@ -5,6 +5,7 @@ import yaml
 from django import __version__ as DJANGO_VERSION
 from django.http import HttpResponseRedirect
 from django.urls import path
+from rest_framework import serializers
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.test import APIClient
@@ -13,8 +14,8 @@ from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from drf_spectacular.validation import validate_schema
 from drf_spectacular.views import (
-    SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerOauthRedirectView,
-    SpectacularSwaggerSplitView, SpectacularSwaggerView,
+    SpectacularAPIView, SpectacularRedocView, SpectacularSlicedAPIView,
+    SpectacularSwaggerOauthRedirectView, SpectacularSwaggerSplitView, SpectacularSwaggerView,
 )
 
 
@@ -50,7 +51,42 @@ urlpatterns_str_import = [
     path('api/schema-err2/', SpectacularAPIView.as_view(urlconf='tests.error'), name='schema_err2'),
 ]
 
-urlpatterns = urlpatterns_v1 + urlpatterns_v2 + urlpatterns_str_import
+
+class PointSerializer(serializers.Serializer):
+    x = serializers.FloatField()
+
+
+class ShapeSerializer(serializers.Serializer):
+    points = PointSerializer(many=True)
+
+
+@extend_schema(responses=ShapeSerializer, tags=['shapes'])
+@api_view(http_method_names=['GET'])
+def shape(request):
+    pass  # pragma: no cover
+
+
+@extend_schema(responses=PointSerializer, tags=['points'])
+@api_view(http_method_names=['GET'])
+def point(request):
+    pass  # pragma: no cover
+
+
+urlpatterns_sliced = [
+    path('api/sliced/shape/', shape),
+    path('api/sliced/point/', point),
+    path('api/sliced/pi/', pi),
+]
+urlpatterns_sliced += [
+    path('api/sliced/schema/', SpectacularSlicedAPIView.as_view(urlconf=urlpatterns_sliced)),
+    path('api/sliced/schema-path/', SpectacularSlicedAPIView.as_view(urlconf=urlpatterns_sliced, slice_by='path')),
+]
+
+urlpatterns_prebuilt = [
+    path('api/v1/schema-prebuilt/', SpectacularAPIView.as_view(urlconf=urlpatterns_v1, serve_prebuilt=True))
+]
+
+urlpatterns = urlpatterns_v1 + urlpatterns_v2 + urlpatterns_str_import + urlpatterns_sliced + urlpatterns_prebuilt
 
 
 @pytest.mark.urls(__name__)
@@ -194,3 +230,242 @@ def test_swagger_oauth_redirect_view(get_params):
     else:
         assert response.headers['Location'] ==\
                '/static/drf_spectacular_sidecar/swagger-ui-dist/oauth2-redirect.html?' + get_params
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE', 'default')
+@pytest.mark.urls(__name__)
+def test_spectacular_view_cache(no_warnings):
+    from drf_spectacular.caching import invalidate_schema_cache
+    from drf_spectacular.generators import SchemaGenerator
+
+    invalidate_schema_cache()
+    with mock.patch.object(SchemaGenerator, 'get_schema', autospec=True, side_effect=SchemaGenerator.get_schema) as m:
+        response = APIClient().get('/api/v1/schema/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/vnd.oai.openapi; charset=utf-8'
+        assert response['Content-Disposition'] == 'inline; filename="schema.yaml"'
+        assert response.content.startswith(b'openapi: 3.0.3\n')
+        assert APIClient().get('/api/v1/schema/').content == response.content
+        assert m.call_count == 1
+        # different format and language are cached separately
+        response_json = APIClient().get('/api/v1/schema/', HTTP_ACCEPT='application/json')
+        assert response_json.content.startswith(b'{\n    "openapi": "3.0.3"')
+        assert response_json['Content-Type'] == 'application/json'
+        APIClient().get('/api/v1/schema/?lang=de')
+        assert m.call_count == 3
+        # explicit invalidation forces regeneration
+        invalidate_schema_cache()
+        assert APIClient().get('/api/v1/schema/').content == response.content
+        assert m.call_count == 4
+
+
+@pytest.mark.urls(__name__)
+def test_spectacular_view_conditional_get(no_warnings):
+    response = APIClient().get('/api/v1/schema/')
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert etag.startswith('"') and etag.endswith('"')
+    assert APIClient().get('/api/v1/schema/')['ETag'] == etag
+    # format has its own representation and therefore its own ETag
+    assert APIClient().get('/api/v1/schema/', HTTP_ACCEPT='application/json')['ETag'] != etag
+
+    response = APIClient().get('/api/v1/schema/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert not response.content
+    response = APIClient().get('/api/v1/schema/', HTTP_IF_NONE_MATCH='"outdated"')
+    assert response.status_code == 200
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE', 'default')
+@pytest.mark.urls(__name__)
+def test_spectacular_view_conditional_get_cached(no_warnings):
+    from drf_spectacular.caching import invalidate_schema_cache
+
+    invalidate_schema_cache()
+    response = APIClient().get('/api/v1/schema/')
+    assert response.status_code == 200
+    assert 'Last-Modified' in response
+    response = APIClient().get('/api/v1/schema/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == 304
+    assert 'ETag' in response
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CONDITIONAL_GET', False)
+@pytest.mark.urls(__name__)
+def test_spectacular_view_conditional_get_disabled(no_warnings, tmp_path):
+    from drf_spectacular.caching import invalidate_schema_cache
+
+    response = APIClient().get('/api/v1/schema/', HTTP_IF_NONE_MATCH='*')
+    assert response.status_code == 200
+    assert 'ETag' not in response
+
+    invalidate_schema_cache()
+    with mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE', 'default'):
+        for _ in range(2):
+            response = APIClient().get('/api/v1/schema/', HTTP_IF_NONE_MATCH='*')
+            assert response.status_code == 200
+            assert 'ETag' not in response
+            assert 'Last-Modified' not in response
+
+    schema_path = tmp_path / 'schema.yml'
+    schema_path.write_bytes(b'openapi: 3.0.3\ninfo:\n  title: prebuilt\n')
+    with mock.patch(
+        'drf_spectacular.settings.spectacular_settings.SERVE_PREBUILT_SCHEMA', str(schema_path)
+    ):
+        response = APIClient().get('/api/v1/schema-prebuilt/', HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == 200
+        assert 'ETag' not in response
+        assert 'Last-Modified' not in response
+
+
+@pytest.mark.parametrize(['cache_control', 'expected'], [
+    ('no-cache', 'no-cache'),
+    ({'public': True, 'max_age': 60}, 'public, max-age=60'),
+])
+@pytest.mark.urls(__name__)
+def test_spectacular_view_cache_control(no_warnings, cache_control, expected):
+    with mock.patch(
+        'drf_spectacular.settings.spectacular_settings.SERVE_CACHE_CONTROL', cache_control
+    ):
+        response = APIClient().get('/api/v1/schema/')
+        assert response['Cache-Control'] == expected
+        response = APIClient().get('/api/v1/schema/', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304
+        assert response['Cache-Control'] == expected
+
+
+@pytest.mark.urls(__name__)
+def test_spectacular_view_prebuilt_schema(no_warnings, tmp_path):
+    import gzip
+
+    from drf_spectacular.generators import SchemaGenerator
+
+    schema_path = tmp_path / 'schema.yml'
+    schema_path.write_bytes(b'openapi: 3.0.3\ninfo:\n  title: prebuilt\n')
+
+    with mock.patch(
+        'drf_spectacular.settings.spectacular_settings.SERVE_PREBUILT_SCHEMA', str(schema_path)
+    ), mock.patch.object(SchemaGenerator, 'get_schema') as get_schema:
+        response = APIClient().get('/api/v1/schema-prebuilt/')
+        assert response.status_code == 200
+        assert response.getvalue() == schema_path.read_bytes()
+        assert response['Content-Type'] == 'application/vnd.oai.openapi; charset=utf-8'
+        assert response['Content-Disposition'] == 'inline; filename="schema.yaml"'
+        assert APIClient().get(
+            '/api/v1/schema-prebuilt/', HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == 304
+        # no json artifact available, so yaml artifact gets converted
+        response = APIClient().get('/api/v1/schema-prebuilt/', HTTP_ACCEPT='application/json')
+        assert response.content.startswith(b'{\n    "openapi": "3.0.3"')
+        # json sibling takes precedence over conversion
+        (tmp_path / 'schema.json').write_bytes(b'{"openapi": "3.0.3"}')
+        response = APIClient().get('/api/v1/schema-prebuilt/', HTTP_ACCEPT='application/json')
+        assert response.getvalue() == b'{"openapi": "3.0.3"}'
+        # pre-compressed sibling
+        (tmp_path / 'schema.yml.gz').write_bytes(gzip.compress(schema_path.read_bytes()))
+        response = APIClient().get('/api/v1/schema-prebuilt/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.getvalue()) == schema_path.read_bytes()
+        assert 'Accept-Encoding' in response['Vary']
+        assert 'Content-Encoding' not in APIClient().get('/api/v1/schema-prebuilt/')
+        response = APIClient().get('/api/v1/schema-prebuilt/', HTTP_ACCEPT_ENCODING='gzip;q=0, br;q=0')
+        assert 'Content-Encoding' not in response
+        response = APIClient().get('/api/v1/schema-prebuilt/', HTTP_ACCEPT_ENCODING='*;q=0.5')
+        assert response['Content-Encoding'] == 'gzip'
+        assert not get_schema.called
+
+    # views without opt-in generate the schema
+    with mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_PREBUILT_SCHEMA', str(schema_path)):
+        assert APIClient().get('/api/v1/schema/').getvalue() != schema_path.read_bytes()
+
+
+@pytest.mark.urls(__name__)
+def test_spectacular_view_prebuilt_schema_mapping(no_warnings, tmp_path):
+    (tmp_path / 'v1.yml').write_bytes(b'openapi: 3.0.3\n# v1\n')
+    (tmp_path / 'default.yml').write_bytes(b'openapi: 3.0.3\n# default\n')
+    prebuilt = {'v1': str(tmp_path / 'v1.yml'), None: str(tmp_path / 'default.yml')}
+
+    with mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_PREBUILT_SCHEMA', prebuilt):
+        assert APIClient().get('/api/v1/schema-prebuilt/?version=v1').getvalue().endswith(b'# v1\n')
+        assert APIClient().get('/api/v1/schema-prebuilt/').getvalue().endswith(b'# default\n')
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.parametrize('accept', ['application/vnd.oai.openapi', 'application/vnd.oai.openapi+json'])
+def test_spectacular_view_streaming(no_warnings, accept):
+    response = APIClient().get('/api/v1/schema/', HTTP_ACCEPT=accept)
+    with mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_STREAMING', True):
+        streaming_response = APIClient().get('/api/v1/schema/', HTTP_ACCEPT=accept)
+
+    assert streaming_response.status_code == 200
+    assert streaming_response.streaming
+    assert streaming_response['Content-Type'] == response['Content-Type']
+    assert streaming_response['Content-Disposition'] == response['Content-Disposition']
+    assert b''.join(streaming_response.streaming_content) == response.content
+
+
+@pytest.mark.urls(__name__)
+def test_spectacular_sliced_view_index(no_warnings):
+    response = APIClient().get('/api/sliced/schema/?lang=de', HTTP_ACCEPT='application/json')
+    assert response.status_code == 200
+    urls = response.json()['urls']
+    # untagged views are tagged with their first path segment
+    assert [s['name'] for s in urls] == ['pi', 'points', 'schema', 'schema-path', 'shapes']
+    assert urls[1] == {'name': 'points', 'url': '/api/sliced/schema/?slice=points&lang=de'}
+
+    response = APIClient().get('/api/sliced/schema-path/', HTTP_ACCEPT='application/json')
+    assert [s['name'] for s in response.json()['urls']] == ['pi', 'point', 'schema', 'schema-path', 'shape']
+
+
+@pytest.mark.urls(__name__)
+def test_spectacular_sliced_view(no_warnings):
+    response = APIClient().get('/api/sliced/schema/?slice=shapes')
+    assert response.status_code == 200
+    schema = yaml.load(response.content, Loader=yaml.SafeLoader)
+    validate_schema(schema)
+    assert list(schema['paths']) == ['/api/sliced/shape/']
+    assert list(schema['components']['schemas']) == ['Point', 'Shape']
+
+    schema = yaml.load(APIClient().get('/api/sliced/schema/?slice=points').content, Loader=yaml.SafeLoader)
+    assert list(schema['paths']) == ['/api/sliced/point/']
+    assert list(schema['components']['schemas']) == ['Point']
+
+    schema = yaml.load(APIClient().get('/api/sliced/schema-path/?slice=pi').content, Loader=yaml.SafeLoader)
+    assert list(schema['paths']) == ['/api/sliced/pi/']
+    assert 'components' not in schema or not schema['components'].get('schemas')
+
+    # unknown slices do not result in an empty schema
+    assert APIClient().get('/api/sliced/schema/?slice=unknown').status_code == 404
+    assert APIClient().get('/api/sliced/schema-path/?slice=shapes').status_code == 404
+
+
+@mock.patch('drf_spectacular.settings.spectacular_settings.SERVE_CACHE', 'default')
+@pytest.mark.urls(__name__)
+def test_spectacular_sliced_view_cache(no_warnings):
+    from drf_spectacular.caching import invalidate_schema_cache
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.openapi import AutoSchema
+
+    invalidate_schema_cache()
+    with mock.patch.object(
+        AutoSchema, 'get_operation', autospec=True, side_effect=AutoSchema.get_operation
+    ) as m, mock.patch.object(
+        SchemaGenerator, 'create_view', autospec=True, side_effect=SchemaGenerator.create_view
+    ) as create_view:
+        shapes = APIClient().get('/api/sliced/schema/?slice=shapes').content
+        # only the operations of the slice are generated
+        assert m.call_count == 1
+        # views are created once for validating the slice and generating it
+        view_count = create_view.call_count
+        assert view_count == len(urlpatterns_sliced)
+        # cache hits neither generate nor inspect the endpoints
+        assert APIClient().get('/api/sliced/schema/?slice=shapes').content == shapes
+        assert m.call_count == 1
+        assert create_view.call_count == view_count
+        assert APIClient().get('/api/sliced/schema/?slice=points').content != shapes
+        assert m.call_count == 2
+
+        index = APIClient().get('/api/sliced/schema/').content
+        view_count = create_view.call_count
+        assert APIClient().get('/api/sliced/schema/').content == index
+        assert create_view.call_count == view_count